@@ -0,0 +1,182 @@
+"""
+Booking Aggregates - Mergeable partial aggregates for out-of-core analysis
+Each chunk (or partition) of bookings is reduced to counts, sums and
+cancellation numerators per dimension in one booking_engine pass. Partials
+merge by addition, so the streamlined report can be produced at bounded
+memory from files larger than RAM. Medians and percentiles come from
+mergeable quantile sketches (see booking_sketches) and customer/property
+counts from cardinality sketches (see booking_cardinality), and the bars of
+distribution charts from mergeable histograms (see booking_histogram). Exact
+per-customer tables are kept only when exact_customers is set. Property and
+city scorecards (see booking_scorecards) are folded in the same way.
+"""
+
+import pandas as pd
+
+from booking_cardinality import CardinalitySketches, exact_customer_summary
+from booking_engine import Aggregate, aggregate, available_requests
+from booking_histogram import Histogram
+from booking_metrics import cancellation_flags
+from booking_scorecards import SCORECARD_KEYS, ScorecardTable
+from booking_sketches import DEFAULT_SEED, QuantileSketch
+
+# Dimensions reported by count, cancellation rate and revenue
+DIMENSIONS = ['booking_channel', 'star_rating', 'room_type', 'booking_month']
+
+# Measures reported by mean and median (sum, non-missing count and a quantile sketch are kept)
+MEASURES = ['selling_price', 'profit_margin', 'stay_duration', 'booking_lead_time']
+
+# Measures with a pre-binned histogram for distribution charts
+HISTOGRAMS = ['profit_margin']
+
+
+def plain_index(series):
+    """Drop a categorical index so partials from different chunks align by value"""
+    if series is not None and isinstance(series.index, pd.CategoricalIndex):
+        series = series.copy()
+        series.index = series.index.astype(series.index.categories.dtype)
+    return series
+
+
+def add_series(left, right):
+    """Add two keyed partial results, treating missing keys as zero"""
+    left, right = plain_index(left), plain_index(right)
+    if left is None:
+        return right
+    if right is None:
+        return left
+    total = left.add(right, fill_value=0)
+    # Alignment introduces NaN before filling, so restore integer counts
+    if pd.api.types.is_integer_dtype(left) and pd.api.types.is_integer_dtype(right):
+        total = total.astype('int64')
+    return total
+
+
+class BookingAggregates:
+    """Mergeable partial aggregates behind the streamlined report"""
+
+    def __init__(self, exact_customers=False, seed=DEFAULT_SEED):
+        self.exact_customers = exact_customers
+        # Seeds the quantile sketches so reports are reproducible
+        self.seed = seed
+        self.rows = 0
+        self.cancelled_total = 0
+        self.counts = {}
+        self.cancelled = {}
+        self.revenue = {}
+        self.sums = {}
+        self.non_null = {}
+        self.sketches = {}
+        self.histograms = {}
+        self.cardinality = CardinalitySketches()
+        self.scorecards = {}
+        self.customer_bookings = None
+        self.customer_spend = None
+
+    def update(self, chunk):
+        """Fold one chunk of bookings (with derived features) into the aggregates"""
+        self.rows += len(chunk)
+
+        if 'booking_status' in chunk.columns:
+            self.cancelled_total += int(cancellation_flags(chunk['booking_status']).sum())
+
+        requests = []
+        for dim in DIMENSIONS:
+            requests += [Aggregate(dim, 'count'), Aggregate(dim, 'cancelled'),
+                         Aggregate(dim, 'sum', 'selling_price')]
+        results = aggregate(chunk, available_requests(requests, chunk.columns))
+
+        targets = {'count': self.counts, 'cancelled': self.cancelled, 'sum': self.revenue}
+        for request, part in results.items():
+            target = targets[request.statistic]
+            target[request.dimension] = add_series(target.get(request.dimension), part)
+
+        for measure in MEASURES:
+            if measure in chunk.columns:
+                values = chunk[measure]
+                self.sums[measure] = self.sums.get(measure, 0) + float(values.sum())
+                self.non_null[measure] = self.non_null.get(measure, 0) + int(values.count())
+
+        for col in MEASURES:
+            if col in chunk.columns:
+                self.sketches.setdefault(col, QuantileSketch(seed=self.seed)).update(chunk[col].to_numpy(dtype='float64'))
+
+        for col in HISTOGRAMS:
+            if col in chunk.columns:
+                self.histograms.setdefault(col, Histogram()).update(chunk[col].to_numpy(dtype='float64'))
+
+        for key in SCORECARD_KEYS:
+            if key in chunk.columns:
+                self.scorecards.setdefault(key, ScorecardTable(key)).update(chunk)
+
+        self.cardinality.update(chunk)
+        if self.exact_customers and 'customer_id' in chunk.columns:
+            requests = available_requests([Aggregate('customer_id', 'count'),
+                                           Aggregate('customer_id', 'sum', 'selling_price')], chunk.columns)
+            results = aggregate(chunk, requests)
+            self.customer_bookings = add_series(self.customer_bookings, results[requests[0]])
+            if len(requests) > 1:
+                self.customer_spend = add_series(self.customer_spend, results[requests[1]])
+
+        return self
+
+    def merge(self, other):
+        """Combine another partial (from a chunk, partition or worker) into this one"""
+        self.rows += other.rows
+        self.cancelled_total += other.cancelled_total
+
+        for name in ('counts', 'cancelled', 'revenue'):
+            mine, theirs = getattr(self, name), getattr(other, name)
+            for dim, part in theirs.items():
+                mine[dim] = add_series(mine.get(dim), part)
+
+        for measure in other.sums:
+            self.sums[measure] = self.sums.get(measure, 0) + other.sums[measure]
+            self.non_null[measure] = self.non_null.get(measure, 0) + other.non_null[measure]
+
+        for col, sketch in other.sketches.items():
+            if col in self.sketches:
+                self.sketches[col].merge(sketch)
+            else:
+                self.sketches[col] = sketch
+
+        for col, histogram in other.histograms.items():
+            if col in self.histograms:
+                self.histograms[col].merge(histogram)
+            else:
+                self.histograms[col] = histogram
+
+        for key, table in other.scorecards.items():
+            if key in self.scorecards:
+                self.scorecards[key].merge(table)
+            else:
+                self.scorecards[key] = table
+
+        self.cardinality.merge(other.cardinality)
+        self.customer_bookings = add_series(self.customer_bookings, other.customer_bookings)
+        self.customer_spend = add_series(self.customer_spend, other.customer_spend)
+        return self
+
+    def mean(self, measure):
+        """Mean of a measure over its non-missing values"""
+        count = self.non_null.get(measure, 0)
+        return self.sums[measure] / count if count else float('nan')
+
+    def quantile(self, col, q):
+        """Approximate quantile(s) of a sketched column"""
+        return self.sketches[col].quantile(q)
+
+    def customer_summary(self):
+        """Unique/repeat customer metrics, exact when per-customer tables are kept"""
+        if self.customer_bookings is not None:
+            return exact_customer_summary(self.customer_bookings, self.customer_spend)
+        return self.cardinality.customer_summary()
+
+    def cancellation_rate(self, dim):
+        """Cancellation rate (%) per value of a dimension"""
+        return (self.cancelled[dim] / self.counts[dim] * 100).dropna()
+
+    def revenue_summary(self, dim):
+        """Revenue sum and mean per value of a dimension"""
+        summary = pd.DataFrame({'sum': self.revenue[dim], 'mean': self.revenue[dim] / self.counts[dim]})
+        return summary.dropna()
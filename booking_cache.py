@@ -0,0 +1,246 @@
+"""
+Booking Data Cache - Persistent columnar cache of the cleaned booking frame
+The cleaned frame is written once as a bundle of NumPy .npy files (one per
+column, categoricals stored as codes and dates as int32 day ordinals) and
+memory-mapped on every later run, together with the fitted imputer and the
+packed missingness bitsets recorded before filling. Derived features are computed the first
+time a caller asks for them and appended to the bundle, so each is paid for
+at most once. The cache is rebuilt whenever the source CSV or the code that
+produces the frame changes.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+import booking_cleaning
+import booking_dates
+import booking_features
+import booking_imputer
+import booking_loader
+from booking_cleaning import DERIVED_FEATURES
+from booking_dates import datetime_to_ordinals, ordinals_to_datetime
+from booking_features import FeatureStore, derivable, source_inputs
+from booking_imputer import BookingImputer, MissingMasks
+from booking_loader import DATA_PATH, load_bookings
+
+CACHE_DIR = '.booking_cache'
+IMPUTER_FILE = 'imputer.json'
+MISSING_FILE = 'missing.npy'
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def file_digest(path):
+    """Content hash of a file, read in 1 MB blocks"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def code_version():
+    """Hash of the loader and cleaning source, so code edits invalidate the cache"""
+    digest = hashlib.blake2b(digest_size=8)
+    for module in (booking_loader, booking_dates, booking_cleaning, booking_features, booking_imputer):
+        with open(module.__file__, 'rb') as handle:
+            digest.update(handle.read())
+    return digest.hexdigest()
+
+
+def source_fingerprint(path, content_hash=True):
+    """Size, mtime and (optionally) content hash of the source CSV"""
+    stat = os.stat(path)
+    fingerprint = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    if content_hash:
+        fingerprint['digest'] = file_digest(path)
+    return fingerprint
+
+
+def cache_path(path, cache_dir=CACHE_DIR):
+    """Cache directory for one source file"""
+    source = os.path.abspath(path)
+    name = hashlib.blake2b(source.encode(), digest_size=8).hexdigest()
+    stem = os.path.splitext(os.path.basename(source))[0]
+    return os.path.join(cache_dir, f"{stem}-{name}")
+
+
+def read_meta(directory):
+    """Cache metadata, or None when the cache is missing or unreadable"""
+    try:
+        with open(os.path.join(directory, 'meta.json')) as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+def is_fresh(meta, path, directory):
+    """Check a cache entry against the current source file and code version"""
+    if meta is None or meta.get('code_version') != code_version():
+        return False
+
+    cached = meta['source']
+    current = source_fingerprint(path, content_hash=False)
+    if current['size'] != cached['size']:
+        return False
+    if current['mtime_ns'] == cached['mtime_ns']:
+        return True
+
+    # Touched or copied but possibly unchanged - fall back to the content hash
+    if file_digest(path) != cached['digest']:
+        return False
+
+    cached['mtime_ns'] = current['mtime_ns']
+    write_meta(directory, meta)
+    return True
+
+
+def write_column(directory, series, file_name):
+    """Save one column as an .npy file and return its metadata entry"""
+    if series.dtype == object or pd.api.types.is_string_dtype(series):
+        series = series.astype('category')
+
+    entry = {'name': series.name, 'file': file_name}
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        entry['categories'] = series.cat.categories.tolist()
+        values = series.cat.codes.to_numpy()
+    elif pd.api.types.is_datetime64_any_dtype(series):
+        entry['kind'] = 'date'
+        values = datetime_to_ordinals(series)
+    else:
+        values = series.to_numpy()
+    np.save(os.path.join(directory, file_name), values, allow_pickle=False)
+    return entry
+
+
+def write_meta(directory, meta):
+    """Replace meta.json atomically"""
+    target = os.path.join(directory, 'meta.json')
+    with open(target + '.tmp', 'w') as handle:
+        json.dump(meta, handle, indent=2)
+    os.replace(target + '.tmp', target)
+
+
+def write_cache(df, directory, meta, imputer=None, masks=None):
+    """Write each column as an .npy file plus a JSON description of the frame"""
+    staging = directory + '.tmp'
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    columns = [write_column(staging, df[col], f"{i:03d}.npy") for i, col in enumerate(df.columns)]
+    if imputer is not None:
+        imputer.save(os.path.join(staging, IMPUTER_FILE))
+    if masks is not None:
+        np.save(os.path.join(staging, MISSING_FILE), masks.bits, allow_pickle=False)
+        meta = dict(meta, missing_columns=masks.columns)
+
+    meta = dict(meta, columns=columns, rows=len(df))
+    write_meta(staging, meta)
+
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(staging, directory)
+    return meta
+
+
+def load_columns(directory, meta, names):
+    """Memory-map the named cached columns, in cache order"""
+    data = {}
+    for entry in meta['columns']:
+        if entry['name'] not in names:
+            continue
+        values = np.load(os.path.join(directory, entry['file']), mmap_mode='r')
+        if 'categories' in entry:
+            values = pd.Categorical.from_codes(values, entry['categories'])
+        elif entry.get('kind') == 'date':
+            values = ordinals_to_datetime(values)
+        data[entry['name']] = values
+    return data
+
+
+def add_features(directory, meta, names):
+    """Compute features missing from the cache entry and append them to it"""
+    stored = {entry['name'] for entry in meta['columns']}
+    names = [name for name in names if name not in stored and derivable(name, stored)]
+    if not names:
+        return meta
+
+    inputs = {col for name in names for col in source_inputs(name)}
+    store = FeatureStore(pd.DataFrame(load_columns(directory, meta, inputs), copy=False))
+
+    columns = list(meta['columns'])
+    for name in names:
+        columns.append(write_column(directory, store.get(name), f"{len(columns):03d}.npy"))
+
+    meta = dict(meta, columns=columns)
+    write_meta(directory, meta)
+    return meta
+
+
+def read_cache(directory, meta, columns=None):
+    """Memory-map the cached columns back into a DataFrame.
+
+    Without `columns`, the source columns plus DERIVED_FEATURES are returned.
+    """
+    if columns is None:
+        columns = meta['source_columns'] + DERIVED_FEATURES
+    meta = add_features(directory, meta, columns)
+
+    data = load_columns(directory, meta, set(columns))
+    df = pd.DataFrame(data, copy=False)
+    df.attrs['missing_counts'] = meta['missing_counts']
+    df.attrs['source_columns'] = [col for col in meta['source_columns'] if col in data]
+    return df
+
+
+def build_clean_bookings(path, directory):
+    """Load the source CSV, fit the imputer and fill missing values, then write the cache entry"""
+    fingerprint = source_fingerprint(path)
+    df = load_bookings(path)
+    masks = MissingMasks.from_frame(df)
+    missing = masks.counts()
+    meta = {
+        'code_version': code_version(),
+        'source': fingerprint,
+        'source_columns': list(df.columns),
+        'missing_counts': {col: missing.get(col, 0) for col in df.columns},
+    }
+    imputer = BookingImputer().fit(df)
+    imputer.transform(df)
+    return write_cache(df, directory, meta, imputer, masks)
+
+
+def fresh_cache_entry(path, cache_dir=CACHE_DIR):
+    """Cache directory and metadata for a source file, building the entry if stale"""
+    directory = cache_path(path, cache_dir)
+    meta = read_meta(directory)
+    if not is_fresh(meta, path, directory):
+        meta = build_clean_bookings(path, directory)
+    return directory, meta
+
+
+def load_imputer(path=DATA_PATH, cache_dir=CACHE_DIR):
+    """Imputer fitted on the source file, for filling new batches the same way"""
+    directory, _ = fresh_cache_entry(path, cache_dir)
+    return BookingImputer.load(os.path.join(directory, IMPUTER_FILE))
+
+
+def load_missing_masks(path=DATA_PATH, cache_dir=CACHE_DIR):
+    """Missingness bitsets recorded before filling (memory-mapped)"""
+    directory, meta = fresh_cache_entry(path, cache_dir)
+    bits = np.load(os.path.join(directory, MISSING_FILE), mmap_mode='r')
+    return MissingMasks(meta['rows'], meta['missing_columns'], bits)
+
+
+def load_clean_bookings(path=DATA_PATH, columns=None, cache_dir=CACHE_DIR, refresh=False):
+    """Return the cleaned booking frame, memory-mapped from the cache when fresh"""
+    directory = cache_path(path, cache_dir)
+    meta = None if refresh else read_meta(directory)
+
+    if not is_fresh(meta, path, directory):
+        meta = build_clean_bookings(path, directory)
+
+    return read_cache(directory, meta, columns)
@@ -0,0 +1,220 @@
+"""
+Booking Charts - Declarative chart specs rendered from small precomputed payloads
+A chart spec is a plain dict: a title, a subplot grid and a list of panels.
+Each panel names its input - an Aggregate such as ('booking_channel',
+'cancellation_rate'), a named source such as 'monthly_bookings', or a
+column to histogram - plus its styling. build_payload() reduces the
+bookings to every input the specs need in one engine pass; the result is a
+few KB of JSON; histogram panels are pre-binned by mergeable histograms
+(see booking_histogram), which also supply their mean and median. render_chart() draws a spec from that payload alone, so
+charts can be re-styled or re-rendered at another size without the
+bookings data, and specs plus payloads pickle cheaply to render workers.
+"""
+
+import json
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from booking_engine import CHART_AGGREGATES, Aggregate, aggregate, available_requests
+from booking_histogram import column_histogram
+from booking_metrics import cancellation_flags
+from booking_timeseries import DailySeries
+
+DEFAULT_BINS = 30
+
+
+def monthly_bookings(df, results):
+    series = DailySeries.from_frame(df).rollup('M')['bookings']
+    return pd.Series(series.to_numpy(), index=series.index.strftime('%b %Y'))
+
+
+def booking_status_split(df, results):
+    cancelled = int(cancellation_flags(df['booking_status']).sum())
+    return pd.Series([len(df) - cancelled, cancelled], index=['Confirmed', 'Cancelled'])
+
+
+def customer_frequency(df, results):
+    return results[Aggregate('customer_id', 'count')].value_counts().sort_index()
+
+
+def headline_metrics(df, results):
+    cancelled = int(cancellation_flags(df['booking_status']).sum())
+    return pd.Series([df['selling_price'].sum() / 1000000, df['selling_price'].mean(),
+                      cancelled / len(df) * 100, df['customer_id'].nunique()],
+                     index=['Total Revenue\n($M)', 'Avg Booking\n($)', 'Cancel Rate\n(%)', 'Customers'])
+
+
+def revenue_metrics(df, results):
+    return pd.Series([df['selling_price'].sum() / 1000000, df['selling_price'].mean() / 1000],
+                     index=['Total Revenue\n($M)', 'Average Booking\n($K)'])
+
+
+# Named panel inputs that are not a single Aggregate: source(df, results) -> Series
+SOURCES = {
+    'monthly_bookings': monthly_bookings,
+    'booking_status_split': booking_status_split,
+    'customer_frequency': customer_frequency,
+    'headline_metrics': headline_metrics,
+    'revenue_metrics': revenue_metrics,
+}
+
+
+def panel_request(panel):
+    """The Aggregate behind a panel, or None for named sources and columns"""
+    data = panel['data']
+    return None if isinstance(data, str) else Aggregate(*data)
+
+
+def panel_key(panel):
+    """Payload key of a panel's input, e.g. 'booking_channel.count' or 'profit_margin:hist30'"""
+    data = panel['data']
+    key = data if isinstance(data, str) else '.'.join(str(part) for part in data)
+    if panel['kind'] == 'hist':
+        key = f"{key}:hist{panel.get('bins', DEFAULT_BINS)}"
+    return key
+
+
+def build_payload(df, specs):
+    """Every input the specs' panels need, as JSON-ready lists, from one engine pass"""
+    panels = [panel for spec in specs for panel in spec['panels']]
+    requests = [panel_request(panel) for panel in panels if panel_request(panel) is not None]
+    results = aggregate(df, available_requests(list(dict.fromkeys(CHART_AGGREGATES + requests)), df.columns))
+
+    payload = {}
+    for panel in panels:
+        key = panel_key(panel)
+        if key in payload:
+            continue
+        data = panel['data']
+        if panel_request(panel) is not None:
+            series = results[panel_request(panel)]
+        elif data in SOURCES:
+            series = SOURCES[data](df, results)
+        else:
+            series = df[data]
+        if panel['kind'] == 'hist':
+            histogram = column_histogram(series.to_numpy(dtype='float64', na_value=np.nan), panel.get('edges'))
+            payload[key] = histogram.payload(panel.get('bins', DEFAULT_BINS))
+        else:
+            payload[key] = {'index': series.index.tolist(), 'values': series.to_numpy(dtype='float64').tolist()}
+    return payload
+
+
+def save_payload(payload, path):
+    """Write a payload as JSON"""
+    with open(path, 'w') as handle:
+        json.dump(payload, handle)
+
+
+def load_payload(path):
+    """Read a payload written by save_payload()"""
+    with open(path) as handle:
+        return json.load(handle)
+
+
+def panel_series(panel, entry):
+    """A panel's input as a Series, sorted, truncated and scaled as the panel asks"""
+    series = pd.Series(entry['values'], index=entry['index'])
+    if panel.get('sort'):
+        series = series.sort_values(ascending=False)
+    if panel.get('limit'):
+        series = series.iloc[:panel['limit']]
+    return series / panel.get('scale', 1)
+
+
+def draw_pie(ax, panel, entry):
+    series = panel_series(panel, entry)
+    style = dict(panel.get('style', {}))
+    if 'colors' in style:
+        style['colors'] = style['colors'][:len(series)]
+    drawn = tuple(ax.pie(series.values, labels=series.index, **style))
+    # Percentage labels only exist when the style sets autopct
+    for autotext in drawn[2] if len(drawn) == 3 else []:
+        autotext.set(**panel.get('autotext_style', {}))
+
+
+def draw_bars(ax, panel, entry):
+    series = panel_series(panel, entry)
+    horizontal = panel['kind'] == 'barh'
+    numeric = pd.api.types.is_numeric_dtype(series.index)
+    positions = series.index if numeric else np.arange(len(series))
+    bars = (ax.barh if horizontal else ax.bar)(positions, series.values, **panel.get('style', {}))
+    if not numeric:
+        if horizontal:
+            ax.set_yticks(positions)
+            ax.set_yticklabels(series.index, **panel.get('tick_style', {}))
+        else:
+            ax.set_xticks(positions)
+            ax.set_xticklabels(series.index, **panel.get('tick_style', {}))
+
+    top = series.max()
+    if panel.get('headroom'):
+        (ax.set_xlim if horizontal else ax.set_ylim)(0, top * panel['headroom'])
+    formats = panel.get('value_labels')
+    if not formats:
+        return
+    if isinstance(formats, str):
+        formats = [formats] * len(series)
+    offset = top * panel.get('label_offset', 0.01)
+    for bar, value_format in zip(bars, formats):
+        if horizontal:
+            width = bar.get_width()
+            ax.text(width + offset, bar.get_y() + bar.get_height() / 2., value_format.format(width),
+                    ha='left', va='center', **panel.get('label_style', {}))
+        else:
+            height = bar.get_height()
+            ax.text(bar.get_x() + bar.get_width() / 2., height + offset, value_format.format(height),
+                    ha='center', va='bottom', **panel.get('label_style', {}))
+
+
+def draw_line(ax, panel, entry):
+    series = panel_series(panel, entry)
+    positions = np.arange(len(series))
+    ax.plot(positions, series.values, **panel.get('style', {}))
+    ax.set_xticks(positions)
+    ax.set_xticklabels(series.index, **panel.get('tick_style', {}))
+    if panel.get('value_range'):
+        low, high = panel['value_range']
+        ax.set_ylim(series.min() * low, series.max() * high)
+
+
+def draw_hist(ax, panel, entry):
+    scale = panel.get('scale', 1)
+    edges = np.asarray(entry['edges']) / scale
+    # Pre-binned counts drawn as histogram bars, so styling matches ax.hist
+    ax.hist(edges[:-1], bins=edges, weights=entry['counts'], **panel.get('style', {}))
+    markers = [('mean', {'color': 'red', 'linestyle': '--', 'linewidth': 2}),
+               ('median', {'color': 'darkorange', 'linestyle': ':', 'linewidth': 2})]
+    for stat, default in markers:
+        if panel.get(f'{stat}_label'):
+            value = entry[stat] / scale
+            marker = dict(default, **panel.get('marker_style', {}), **panel.get(f'{stat}_style', {}))
+            ax.axvline(value, label=panel[f'{stat}_label'].format(value), **marker)
+    if panel.get('mean_label') or panel.get('median_label'):
+        ax.legend(**panel.get('legend_style', {}))
+
+
+DRAWERS = {'pie': draw_pie, 'bar': draw_bars, 'barh': draw_bars, 'line': draw_line, 'hist': draw_hist}
+
+
+def render_chart(spec, payload, figsize=None):
+    """Draw a chart spec from its payload alone; returns the figure"""
+    fig = plt.figure(figsize=figsize or spec['figsize'])
+    fig.suptitle(spec['title'], **spec.get('title_style', {}))
+    rows, cols = spec['grid']
+    for position, panel in enumerate(spec['panels'], 1):
+        ax = fig.add_subplot(rows, cols, position)
+        DRAWERS[panel['kind']](ax, panel, payload[panel_key(panel)])
+        ax.set_title(panel.get('title', ''), **dict(spec.get('panel_title_style', {}), **panel.get('title_style', {})))
+        if panel.get('xlabel'):
+            ax.set_xlabel(panel['xlabel'], **spec.get('axis_label_style', {}))
+        if panel.get('ylabel'):
+            ax.set_ylabel(panel['ylabel'], **spec.get('axis_label_style', {}))
+        if panel.get('grid'):
+            ax.grid(True, alpha=0.3)
+    fig.tight_layout(rect=spec.get('layout_rect'))
+    if spec.get('spacing'):
+        fig.subplots_adjust(**spec['spacing'])
+    return fig
@@ -0,0 +1,35 @@
+"""
+Booking Data Cleaning - Missing value handling and derived features
+Single implementation of the cleaning steps previously copied into every
+analysis script, so the cleaned frame can be built once and cached. The
+derived columns themselves are registered in booking_features and fill values
+are learned by booking_imputer.
+"""
+
+from booking_features import derive_features
+from booking_imputer import BookingImputer
+
+DERIVED_FEATURES = ['booking_lead_time', 'stay_duration', 'profit_margin',
+                    'booking_month', 'booking_season']
+
+
+def fill_missing_values(df, imputer=None):
+    """Fill numeric gaps with the median and categorical/date gaps with the mode.
+
+    A fitted BookingImputer is reused as is; otherwise one is fitted on df.
+    """
+    if imputer is None:
+        imputer = BookingImputer().fit(df)
+    return imputer.transform(df)
+
+
+def add_derived_features(df):
+    """Add the lead time, stay duration, profit margin, month and season columns"""
+    return derive_features(df, DERIVED_FEATURES)
+
+
+def clean_bookings(df):
+    """Run the full cleaning pipeline on a frame from load_bookings"""
+    fill_missing_values(df)
+    add_derived_features(df)
+    return df
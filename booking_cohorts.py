@@ -0,0 +1,97 @@
+"""
+Booking Cohorts - Vectorised customer retention by first-booking period
+Bookings are sorted by customer once; each customer's first booking month
+(or week) comes from np.minimum.reduceat over its run, and every booking's
+offset from that first period is a subtraction. Distinct (customer, offset)
+pairs are counted into the cohort x offset matrix with a single bincount
+over flat cell indices, so the cost is one sort plus linear passes - no
+per-customer loops.
+"""
+
+import numpy as np
+import pandas as pd
+
+from booking_dates import MONDAY_ORDINAL, NAT_ORDINAL, datetime_to_ordinals, ordinals_to_datetime
+
+FREQUENCIES = ('M', 'W')
+
+
+def period_numbers(ordinals, freq):
+    """Months or weeks since the epoch for int day ordinals"""
+    if freq == 'M':
+        return ordinals.astype('datetime64[D]').astype('datetime64[M]').astype('int64')
+    if freq == 'W':
+        return (ordinals - MONDAY_ORDINAL) // 7
+    raise ValueError(f"Unknown frequency {freq!r}; expected one of {FREQUENCIES}")
+
+
+def period_labels(periods, freq):
+    """Start date of each period number"""
+    if freq == 'M':
+        days = periods.astype('datetime64[M]').astype('datetime64[D]').astype('int64')
+    else:
+        days = periods * 7 + MONDAY_ORDINAL
+    return pd.DatetimeIndex(ordinals_to_datetime(days.astype('int32')), name='cohort')
+
+
+def cohort_counts(df, freq='M', max_offset=None, date_col='booking_date'):
+    """Customers per first-booking cohort (rows) active in each later period (columns).
+
+    Column 0 is the cohort size; column k counts the cohort's customers who
+    booked again k months (or weeks) after their first booking.
+    """
+    ids = df['customer_id'].to_numpy()
+    days = datetime_to_ordinals(df[date_col]).astype('int64')
+    known = ~pd.isna(ids) & (days != NAT_ORDINAL)
+    ids, periods = ids[known], period_numbers(days[known], freq)
+    if len(ids) == 0:
+        return pd.DataFrame(index=period_labels(np.zeros(0, dtype='int64'), freq))
+
+    # Sorting groups each customer's bookings into one run
+    order = np.argsort(ids)
+    ids, periods = ids[order], periods[order]
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+    first = np.minimum.reduceat(periods, starts)
+    customer = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(ids)]))
+    offsets = periods - first[customer]
+
+    width = int(offsets.max()) + 1
+    if max_offset is not None:
+        width = min(width, max_offset + 1)
+        keep = offsets < width
+        customer, offsets = customer[keep], offsets[keep]
+
+    # A customer counts once per period however many bookings it made
+    active = np.unique(customer * width + offsets)
+    customer, offsets = active // width, active % width
+
+    cohorts, cohort_codes = np.unique(first, return_inverse=True)
+    cells = cohort_codes[customer] * width + offsets
+    counts = np.bincount(cells, minlength=len(cohorts) * width).reshape(len(cohorts), width)
+    counts = pd.DataFrame(counts, index=period_labels(cohorts, freq), columns=pd.RangeIndex(width, name='offset'))
+    # Latest offset each cohort could have reached within the data
+    counts.attrs['horizon'] = (periods.max() - cohorts).tolist()
+    return counts
+
+
+def cohort_retention(df, freq='M', max_offset=None, date_col='booking_date'):
+    """Share (%) of each cohort booking again in each later period, plus the cohort sizes"""
+    counts = cohort_counts(df, freq, max_offset, date_col)
+    if counts.empty:
+        return counts, pd.Series(dtype='int64', name='customers')
+    sizes = counts[0].rename('customers')
+    retention = counts.div(sizes, axis=0) * 100
+    # Offsets past the end of the data are unknown, not zero
+    unseen = counts.columns.to_numpy()[None, :] > np.array(counts.attrs['horizon'])[:, None]
+    return retention.mask(unseen), sizes
+
+
+def pooled_retention(counts):
+    """Share (%) of all customers booking again k periods after their first, over cohorts that reached k"""
+    if counts.empty:
+        return pd.Series(dtype='float64', name='retention')
+    reached = counts.columns.to_numpy()[None, :] <= np.array(counts.attrs['horizon'])[:, None]
+    active = counts.where(reached, 0).sum()
+    eligible = (reached * counts[0].to_numpy()[:, None]).sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (active / eligible * 100).rename('retention')
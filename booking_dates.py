@@ -0,0 +1,79 @@
+"""
+Booking Dates - Fast date parsing with format detection and unique-value memoisation
+Booking dates repeat heavily (30k rows cover about 365 distinct days), so each
+column is parsed through its categories: the format is detected once from a
+sample of distinct strings, only the distinct strings are parsed, and the
+result is mapped back through the category codes. Dates are held as compact
+int32 day ordinals; datetime views are produced on demand.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Candidate formats, tried in order (day-first before month-first)
+DATE_FORMATS = ['%Y-%m-%d', '%Y/%m/%d', '%d-%m-%Y', '%d/%m/%Y', '%m/%d/%Y',
+                '%Y-%m-%d %H:%M:%S', '%d-%m-%Y %H:%M', '%d/%m/%Y %H:%M']
+FORMAT_SAMPLE_SIZE = 1000
+
+EPOCH = np.datetime64('1970-01-01', 'D')
+NAT_ORDINAL = np.iinfo(np.int32).min
+SECONDS_PER_DAY = 86400
+# 1970-01-05, the first Monday after the epoch; weeks start on Mondays
+MONDAY_ORDINAL = 4
+
+
+def detect_date_format(strings, sample_size=FORMAT_SAMPLE_SIZE):
+    """First candidate format that parses every sampled string, or None"""
+    sample = pd.Index(strings).dropna()[:sample_size]
+    if len(sample) == 0:
+        return DATE_FORMATS[0]
+
+    for date_format in DATE_FORMATS:
+        if pd.to_datetime(sample, format=date_format, errors='coerce').notna().all():
+            return date_format
+    return None
+
+
+def datetime_to_ordinals(values):
+    """Encode datetimes as int32 days since 1970-01-01 (NaT -> NAT_ORDINAL)"""
+    if not pd.api.types.is_datetime64_dtype(values):
+        values = pd.to_datetime(values)
+    days = np.asarray(values).astype('datetime64[D]')
+    ordinals = (days - EPOCH).astype('int64')
+    ordinals[np.isnat(days)] = NAT_ORDINAL
+    return ordinals.astype('int32')
+
+
+def ordinals_to_datetime(ordinals):
+    """datetime64[s] view of int32 day ordinals"""
+    ordinals = np.asarray(ordinals)
+    seconds = ordinals.astype('int64') * SECONDS_PER_DAY
+    seconds[ordinals == NAT_ORDINAL] = np.iinfo(np.int64).min
+    return seconds.view('datetime64[s]')
+
+
+def parse_date_ordinals(values, date_format=None):
+    """Parse a column of date strings to int32 day ordinals, each distinct string once"""
+    if not isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype('category')
+    categories = values.cat.categories
+    codes = values.cat.codes.to_numpy()
+
+    if date_format is None:
+        date_format = detect_date_format(categories)
+
+    if date_format is not None:
+        parsed = pd.to_datetime(categories, format=date_format, errors='coerce')
+    else:
+        # No candidate matched - let pandas infer each distinct string
+        parsed = pd.to_datetime(categories, errors='coerce')
+
+    # Code -1 (missing) indexes the trailing NaT slot
+    lookup = np.append(datetime_to_ordinals(parsed), np.int32(NAT_ORDINAL))
+    return lookup[codes]
+
+
+def parse_date_column(values, date_format=None):
+    """Parse a date column to a datetime Series via its day ordinals"""
+    ordinals = parse_date_ordinals(values, date_format)
+    return pd.Series(ordinals_to_datetime(ordinals), index=values.index, name=values.name)
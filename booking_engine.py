@@ -0,0 +1,122 @@
+"""
+Booking Aggregation Engine - Single-pass multi-dimension aggregation
+Callers declare the (dimension, statistic, measure) results they need. Each
+dimension is encoded to integer codes once and every statistic over it is
+accumulated with np.bincount, instead of a separate value_counts/groupby
+scan per result. The text reports and the charts read from these results.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from booking_metrics import cancellation_flags
+
+# One requested result, e.g. Aggregate('booking_channel', 'sum', 'selling_price')
+Aggregate = namedtuple('Aggregate', ['dimension', 'statistic', 'measure'], defaults=[None])
+
+STATISTICS = ('count', 'sum', 'mean', 'cancelled', 'cancellation_rate')
+
+# Per-dimension results behind the streamlined text report
+REPORT_AGGREGATES = [
+    Aggregate('booking_channel', 'count'),
+    Aggregate('booking_channel', 'cancellation_rate'),
+    Aggregate('booking_channel', 'sum', 'selling_price'),
+    Aggregate('booking_channel', 'mean', 'selling_price'),
+    Aggregate('star_rating', 'count'),
+    Aggregate('star_rating', 'cancellation_rate'),
+    Aggregate('room_type', 'count'),
+    Aggregate('booking_month', 'count'),
+]
+
+# Per-dimension results behind the charts (scripts request the subset their columns allow)
+CHART_AGGREGATES = [
+    Aggregate('booking_channel', 'count'),
+    Aggregate('booking_channel', 'cancellation_rate'),
+    Aggregate('booking_channel', 'sum', 'selling_price'),
+    Aggregate('star_rating', 'count'),
+    Aggregate('star_rating', 'cancellation_rate'),
+    Aggregate('star_rating', 'mean', 'selling_price'),
+    Aggregate('room_type', 'count'),
+    Aggregate('booking_status', 'count'),
+    Aggregate('booking_season', 'count'),
+    Aggregate('booking_month', 'count'),
+    Aggregate('booking_month', 'sum', 'selling_price'),
+    Aggregate('customer_id', 'count'),
+    Aggregate('customer_id', 'sum', 'selling_price'),
+]
+
+
+def encode_dimension(values):
+    """Integer codes (-1 when missing) and the sorted labels they index"""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(), values.cat.categories
+    codes, labels = pd.factorize(values, sort=True)
+    return codes, labels
+
+
+def available_requests(requests, columns):
+    """Requests whose dimension, measure and (if needed) booking_status are all present"""
+    columns = set(columns)
+    kept = []
+    for request in requests:
+        needed = {request.dimension, request.measure} - {None}
+        if request.statistic in ('cancelled', 'cancellation_rate'):
+            needed.add('booking_status')
+        if needed <= columns:
+            kept.append(request)
+    return kept
+
+
+def aggregate(df, requests):
+    """Compute every requested Aggregate, encoding each dimension only once.
+
+    Returns a dict mapping each request to a Series indexed by the observed
+    dimension values (sorted), like groupby(observed=True).
+    """
+    by_dimension = {}
+    for request in requests:
+        if request.statistic not in STATISTICS:
+            raise ValueError(f"Unknown statistic {request.statistic!r}")
+        by_dimension.setdefault(request.dimension, []).append(request)
+
+    flags = None
+    results = {}
+    for dim, dim_requests in by_dimension.items():
+        codes, labels = encode_dimension(df[dim])
+        valid = codes >= 0
+        if not valid.all():
+            codes = codes[valid]
+
+        size = len(labels)
+        counts = np.bincount(codes, minlength=size)
+        observed = counts > 0
+        measures = {}
+
+        for request in dim_requests:
+            if request.statistic == 'count':
+                values = counts
+            elif request.statistic in ('cancelled', 'cancellation_rate'):
+                if flags is None:
+                    flags = cancellation_flags(df['booking_status'])
+                cancelled = np.bincount(codes, weights=flags[valid], minlength=size)
+                values = cancelled if request.statistic == 'cancelled' else cancelled / np.maximum(counts, 1) * 100
+            else:
+                if request.measure not in measures:
+                    measure = df[request.measure].to_numpy(dtype='float64')[valid]
+                    present = ~np.isnan(measure)
+                    sums = np.bincount(codes, weights=np.where(present, measure, 0), minlength=size)
+                    non_null = np.bincount(codes, weights=present, minlength=size)
+                    measures[request.measure] = (sums, non_null)
+                sums, non_null = measures[request.measure]
+                if request.statistic == 'sum':
+                    values = sums
+                else:
+                    with np.errstate(invalid='ignore', divide='ignore'):
+                        values = sums / non_null
+
+            results[request] = pd.Series(values[observed], index=pd.Index(labels[observed], name=dim),
+                                         name=request.statistic)
+
+    return results
@@ -0,0 +1,132 @@
+"""
+Booking Features - Registry of derived columns with lazy, memoised evaluation
+Each derived column declares the columns it is computed from. A FeatureStore
+computes a feature only when it is first asked for, memoises it for every
+later consumer, and recomputes it only after one of its inputs has been
+replaced, so analyses that never touch a feature never pay for it.
+"""
+
+from collections import namedtuple
+
+import pandas as pd
+
+SEASONS = {
+    12: 'Winter', 1: 'Winter', 2: 'Winter',
+    3: 'Spring', 4: 'Spring', 5: 'Spring',
+    6: 'Summer', 7: 'Summer', 8: 'Summer',
+    9: 'Autumn', 10: 'Autumn', 11: 'Autumn'
+}
+
+LEAD_TIME_BINS = [-1, 7, 30, 90, float('inf')]
+LEAD_TIME_LABELS = ['0-7 days', '8-30 days', '31-90 days', '90+ days']
+
+Feature = namedtuple('Feature', ['name', 'inputs', 'compute'])
+
+# Registered derived columns by name
+FEATURES = {}
+
+
+def feature(name, *inputs):
+    """Register the decorated function as the derivation of `name` from `inputs`"""
+    def register(compute):
+        FEATURES[name] = Feature(name, inputs, compute)
+        return compute
+    return register
+
+
+@feature('booking_lead_time', 'booking_date', 'check_in_date')
+def booking_lead_time(booking_date, check_in_date):
+    return (check_in_date - booking_date).dt.days
+
+
+@feature('stay_duration', 'check_in_date', 'check_out_date')
+def stay_duration(check_in_date, check_out_date):
+    return (check_out_date - check_in_date).dt.days
+
+
+@feature('profit_margin', 'selling_price', 'costprice')
+def profit_margin(selling_price, costprice):
+    return ((selling_price - costprice) / selling_price) * 100
+
+
+@feature('booking_month', 'booking_date')
+def booking_month(booking_date):
+    return booking_date.dt.month
+
+
+@feature('booking_season', 'booking_month')
+def booking_season(booking_month):
+    return booking_month.map(SEASONS).astype('category')
+
+
+@feature('lead_time_bin', 'booking_lead_time')
+def lead_time_bin(booking_lead_time):
+    return pd.cut(booking_lead_time, bins=LEAD_TIME_BINS, labels=LEAD_TIME_LABELS)
+
+
+def source_inputs(name):
+    """Base (non-derived) columns a column is ultimately computed from"""
+    if name not in FEATURES:
+        return [name]
+    inputs = []
+    for dep in FEATURES[name].inputs:
+        inputs += [col for col in source_inputs(dep) if col not in inputs]
+    return inputs
+
+
+def derivable(name, columns):
+    """True when a registered feature can be computed from the given columns"""
+    return name in FEATURES and set(source_inputs(name)) <= set(columns)
+
+
+class FeatureStore:
+    """Lazily derived, memoised feature columns over one base frame"""
+
+    def __init__(self, df):
+        self.df = df
+        self.memo = {}
+        self.versions = {}
+
+    def version(self, name):
+        return self.versions.get(name, 0)
+
+    def replace(self, name, values):
+        """Replace a base column; features built from it are recomputed on next access"""
+        self.df[name] = values
+        self.versions[name] = self.version(name) + 1
+
+    def get(self, name):
+        """A base column, or a feature computed on first access and memoised"""
+        if name not in FEATURES:
+            return self.df[name]
+
+        feature = FEATURES[name]
+        inputs = [self.get(dep) for dep in feature.inputs]
+        stamp = tuple(self.version(dep) for dep in feature.inputs)
+
+        cached = self.memo.get(name)
+        if cached is not None and cached[1] == stamp:
+            return cached[0]
+
+        if cached is None and name in self.df.columns and not any(stamp):
+            # Already materialised in the frame (e.g. memory-mapped from the cache)
+            values = self.df[name]
+        else:
+            values = feature.compute(*inputs).rename(name)
+            if cached is not None:
+                self.versions[name] = self.version(name) + 1
+
+        self.memo[name] = (values, stamp)
+        return values
+
+    def __getitem__(self, name):
+        return self.get(name)
+
+
+def derive_features(df, names):
+    """Add the given features (those whose inputs are present) to the frame"""
+    store = FeatureStore(df)
+    for name in names:
+        if name not in df.columns and derivable(name, df.columns):
+            df[name] = store.get(name)
+    return df
@@ -0,0 +1,195 @@
+"""
+Booking Histograms - Mergeable pre-binned histograms for distribution charts
+A histogram folds chunks of a column into bin counts, so profit margin and
+customer spend distributions never need the whole column in memory and
+matplotlib never re-bins raw values. Counts, sums and min/max come from one
+pass, giving the mean exactly and the median (or any quantile) by
+interpolating the cumulative counts within a bin.
+
+Bins are either fixed edges (np.histogram per chunk; values outside the
+edges are counted separately) or adaptive: a grid of power-of-two-wide
+bins anchored at zero, indexed with np.floor and counted with np.bincount.
+When the data outgrow `resolution` bins the grid is coarsened by merging
+neighbouring pairs, which maps aligned bins onto aligned bins exactly, so
+partials from chunks, partitions or workers merge by coarsening to the
+wider grid and adding. The final grid is the finest that fits the whole
+range, whatever the chunking. Quantiles are within one fine bin (the range
+over `resolution`) of the exact value; display bars merge fine bins into
+about the requested number of bars.
+"""
+
+import math
+
+import numpy as np
+
+DEFAULT_RESOLUTION = 4096
+# Narrowest adaptive bin (2 ** MIN_EXPONENT), so constant chunks get a definite grid
+MIN_EXPONENT = -10
+CHUNK_ROWS = 1_000_000
+
+
+class Histogram:
+    """Bin counts over a stream of numeric values (NaN and infinite values are ignored)"""
+
+    def __init__(self, edges=None, resolution=DEFAULT_RESOLUTION):
+        self.edges = None if edges is None else np.asarray(edges, dtype='float64')
+        self.resolution = resolution
+        self.count = 0
+        self.total = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        # Fixed edges: counts per bin plus values below/above the edges
+        # Adaptive: counts for bins offset, offset + 1, ... of width self.width
+        self.counts = np.zeros(0 if edges is None else len(self.edges) - 1, dtype='int64')
+        self.below = 0
+        self.above = 0
+        self.width = None
+        self.offset = 0
+
+    def span(self, width):
+        """Adaptive bins needed to cover the values seen so far at a given width"""
+        return math.floor(self.max / width) - math.floor(self.min / width) + 1
+
+    def coarsen(self, width):
+        """Merge adaptive bins up to a wider power-of-two width"""
+        factor = int(round(width / self.width))
+        if factor > 1:
+            groups = (self.offset + np.arange(len(self.counts))) // factor
+            offset = int(groups[0]) if len(groups) else self.offset // factor
+            self.counts = np.bincount(groups - offset, weights=self.counts).astype('int64')
+            self.offset = offset
+        self.width = width
+
+    def fit(self):
+        """Coarsen until the adaptive grid fits the range within `resolution` bins"""
+        exponent = MIN_EXPONENT
+        if self.max > self.min:
+            exponent = max(exponent, math.ceil(math.log2((self.max - self.min) / self.resolution)))
+        width = max(2.0 ** exponent, self.width or 0)
+        while self.span(width) > self.resolution:
+            width *= 2
+        if self.width is None:
+            self.width, self.offset = width, math.floor(self.min / width)
+        self.coarsen(width)
+
+    def align(self, offset, length):
+        """Pad the adaptive counts so they cover bins offset .. offset + length - 1"""
+        if not len(self.counts):
+            self.counts = np.zeros(length, dtype='int64')
+            self.offset = offset
+            return
+        start = min(offset, self.offset)
+        end = max(offset + length, self.offset + len(self.counts))
+        counts = np.zeros(end - start, dtype='int64')
+        counts[self.offset - start:self.offset - start + len(self.counts)] = self.counts
+        self.counts, self.offset = counts, start
+
+    def update(self, values):
+        """Add a batch of values"""
+        values = np.asarray(values, dtype='float64').ravel()
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return self
+
+        self.count += len(values)
+        self.total += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        if self.edges is not None:
+            self.counts += np.histogram(values, bins=self.edges)[0]
+            self.below += int((values < self.edges[0]).sum())
+            self.above += int((values > self.edges[-1]).sum())
+            return self
+
+        self.fit()
+        bins = np.floor(values / self.width).astype('int64')
+        low = int(bins.min())
+        self.align(low, int(bins.max()) - low + 1)
+        self.counts[low - self.offset:low - self.offset + int(bins.max()) - low + 1] += np.bincount(bins - low)
+        return self
+
+    def merge(self, other):
+        """Fold another histogram (from a chunk, partition or worker) into this one"""
+        if (self.edges is None) != (other.edges is None) or (
+                self.edges is not None and not np.array_equal(self.edges, other.edges)):
+            raise ValueError("Histograms with different bin edges cannot be merged")
+        if other.count == 0:
+            return self
+
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        if self.edges is not None:
+            self.counts += other.counts
+            self.below += other.below
+            self.above += other.above
+            return self
+
+        other = other.copy()
+        if self.width is None:
+            self.width, self.offset = other.width, other.offset
+        elif other.width > self.width:
+            self.coarsen(other.width)
+        self.fit()
+        other.coarsen(self.width)
+        self.align(other.offset, len(other.counts))
+        self.counts[other.offset - self.offset:other.offset - self.offset + len(other.counts)] += other.counts
+        return self
+
+    def copy(self):
+        clone = Histogram(self.edges, self.resolution)
+        clone.__dict__.update(self.__dict__, counts=self.counts.copy())
+        return clone
+
+    def bin_edges(self):
+        """Edges of the stored bins"""
+        if self.edges is not None:
+            return self.edges
+        return (self.offset + np.arange(len(self.counts) + 1)) * self.width
+
+    def mean(self):
+        return self.total / self.count if self.count else float('nan')
+
+    def quantile(self, q):
+        """Approximate q-quantile for q in [0, 1], interpolated within its bin; NaN when empty"""
+        if self.count == 0:
+            return float('nan')
+        edges = self.bin_edges()
+        rank = q * self.count - self.below
+        cumulative = np.cumsum(self.counts)
+        if rank <= 0:
+            return self.min
+        if rank >= cumulative[-1]:
+            return self.max
+        position = int(np.searchsorted(cumulative, rank, side='left'))
+        before = cumulative[position - 1] if position else 0
+        fraction = (rank - before) / self.counts[position]
+        value = edges[position] + fraction * (edges[position + 1] - edges[position])
+        return float(min(max(value, self.min), self.max))
+
+    def median(self):
+        return self.quantile(0.5)
+
+    def bars(self, bins=None):
+        """Counts and edges for plotting, adaptive bins merged into at most `bins` bars"""
+        if self.edges is not None or not bins or len(self.counts) <= bins:
+            return self.counts, self.bin_edges()
+        group = math.ceil(len(self.counts) / bins)
+        counts = np.add.reduceat(self.counts, np.arange(0, len(self.counts), group))
+        edges = (self.offset + group * np.arange(len(counts) + 1)) * self.width
+        return counts, edges
+
+    def payload(self, bins=None):
+        """JSON-ready bars with the mean and median markers, as booking_charts draws them"""
+        counts, edges = self.bars(bins)
+        return {'edges': edges.tolist(), 'counts': counts.tolist(), 'mean': self.mean(), 'median': self.median()}
+
+
+def column_histogram(values, edges=None, chunk_rows=CHUNK_ROWS, resolution=DEFAULT_RESOLUTION):
+    """Histogram of a column (Series or array) folded in slices to bound temporary arrays"""
+    values = np.asarray(values, dtype='float64')
+    histogram = Histogram(edges, resolution)
+    for start in range(0, len(values), chunk_rows):
+        histogram.update(values[start:start + chunk_rows])
+    return histogram
@@ -0,0 +1,139 @@
+"""
+Booking Imputer - Fitted, persistable missing-value imputation with missingness bitsets
+Fill values (median for numeric columns, mode for categorical, text and date
+columns) are learned in one vectorised pass per column: medians with
+np.nanmedian, modes with a bincount over category codes or day ordinals.
+A fitted imputer is saved as JSON and applied to later batches without
+recomputing statistics. Which cells were missing is recorded as packed
+bitsets (one bit per row), so imputed rows can still be told apart.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from booking_dates import NAT_ORDINAL, datetime_to_ordinals
+
+
+class MissingMasks:
+    """Per-column missingness as packed bitsets (rows / 8 bytes per column)"""
+
+    def __init__(self, rows, columns, bits):
+        self.rows = rows
+        self.columns = list(columns)
+        self.bits = bits
+
+    @classmethod
+    def from_frame(cls, df, columns=None):
+        """Pack the missing cells of every column that has any"""
+        if columns is None:
+            columns = df.columns
+        masks = {col: df[col].isna().to_numpy() for col in columns}
+        masks = {col: mask for col, mask in masks.items() if mask.any()}
+        bits = np.zeros((len(masks), (len(df) + 7) // 8), dtype='uint8')
+        for i, mask in enumerate(masks.values()):
+            bits[i] = np.packbits(mask)
+        return cls(len(df), masks, bits)
+
+    def __contains__(self, col):
+        return col in self.columns
+
+    def packed(self, col):
+        """Packed bitset for one column (all zero when it had no missing values)"""
+        if col not in self.columns:
+            return np.zeros(self.bits.shape[1], dtype='uint8')
+        return self.bits[self.columns.index(col)]
+
+    def mask(self, *columns):
+        """Boolean row mask: missing in any of the given columns"""
+        packed = np.zeros(self.bits.shape[1], dtype='uint8')
+        for col in columns:
+            packed = packed | self.packed(col)
+        return np.unpackbits(packed, count=self.rows).astype(bool)
+
+    def count(self, *columns):
+        """Rows missing in any of the given columns"""
+        return int(self.mask(*columns).sum())
+
+    def counts(self):
+        """Missing count per recorded column"""
+        return {col: self.count(col) for col in self.columns}
+
+
+class BookingImputer:
+    """Median/mode imputation learned once and reapplied to new batches"""
+
+    def __init__(self, fill_values=None):
+        self.fill_values = fill_values or {}
+
+    def fit(self, df):
+        """Learn a fill value for every column"""
+        self.fill_values = {}
+        for col in df.columns:
+            entry = learn_fill_value(df[col])
+            if entry is not None:
+                self.fill_values[col] = entry
+        return self
+
+    def transform(self, df):
+        """Fill missing values in place with the learned values"""
+        for col, entry in self.fill_values.items():
+            if col not in df.columns or not df[col].hasnans:
+                continue
+            value = entry['value']
+            if entry['kind'] == 'date':
+                value = pd.Timestamp(value)
+            elif entry['kind'] == 'category' and value not in df[col].cat.categories:
+                df[col] = df[col].cat.add_categories([value])
+            df[col] = df[col].fillna(value)
+        return df
+
+    def fit_transform(self, df):
+        return self.fit(df).transform(df)
+
+    def save(self, path):
+        """Write the fill values as JSON"""
+        with open(path, 'w') as handle:
+            json.dump({'fill_values': self.fill_values}, handle, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        """Read an imputer saved with save()"""
+        with open(path) as handle:
+            return cls(json.load(handle)['fill_values'])
+
+
+def plain_value(value):
+    """Python scalar for a NumPy scalar, so fill values serialise to JSON"""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def learn_fill_value(series):
+    """Median (numeric) or mode (categorical, text, day of a date) of a column, JSON-serialisable"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        counts = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+        if not counts.any():
+            return None
+        return {'kind': 'category', 'value': plain_value(series.cat.categories[counts.argmax()])}
+
+    if pd.api.types.is_datetime64_any_dtype(series):
+        ordinals = datetime_to_ordinals(series)
+        ordinals = ordinals[ordinals != NAT_ORDINAL]
+        if len(ordinals) == 0:
+            return None
+        first = ordinals.min()
+        day = first + np.bincount(ordinals - first).argmax()
+        return {'kind': 'date', 'value': str(np.datetime64(int(day), 'D'))}
+
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        values = series.to_numpy(dtype='float64')
+        if np.isnan(values).all():
+            return None
+        return {'kind': 'numeric', 'value': float(np.nanmedian(values))}
+
+    modes = series.mode()
+    if len(modes) == 0:
+        return None
+    return {'kind': 'object', 'value': plain_value(modes.iloc[0])}
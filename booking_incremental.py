@@ -0,0 +1,176 @@
+"""
+Booking Incremental Ingestion - Fold only newly appended bookings into saved aggregates
+A checkpoint stores the mergeable BookingAggregates together with a
+high-water mark (byte offset and row count into the CSV, plus the latest
+booking_date seen). A refresh parses only the bytes appended after the
+mark, streaming them in chunks, so its cost is proportional to the delta
+rather than the history and memory stays bounded by the chunk size. If the
+file was rewritten instead of appended, or the code that builds the
+aggregates changed since the checkpoint was saved, it is rebuilt.
+"""
+
+import csv
+import hashlib
+import io
+import os
+import pickle
+
+import pandas as pd
+
+import booking_aggregates
+import booking_cardinality
+import booking_engine
+import booking_histogram
+import booking_metrics
+import booking_scorecards
+import booking_sketches
+from booking_aggregates import BookingAggregates
+from booking_cache import CACHE_DIR, cache_path, code_version
+from booking_cleaning import add_derived_features
+from booking_loader import DATA_PATH, apply_schema, read_options
+from booking_sketches import DEFAULT_SEED
+
+PREFIX_BYTES = 1024 * 1024
+TAIL_BLOCK = 64 * 1024
+
+
+def checkpoint_version():
+    """Hash of the ingestion code and the aggregate classes a checkpoint pickles"""
+    digest = hashlib.blake2b(code_version().encode(), digest_size=8)
+    for module in (booking_aggregates, booking_cardinality, booking_engine, booking_histogram,
+                   booking_metrics, booking_scorecards, booking_sketches):
+        with open(module.__file__, 'rb') as handle:
+            digest.update(handle.read())
+    with open(__file__, 'rb') as handle:
+        digest.update(handle.read())
+    return digest.hexdigest()
+
+
+class Checkpoint:
+    """Saved aggregates plus the high-water mark they cover"""
+
+    def __init__(self, columns, header_end, exact_customers=False, seed=DEFAULT_SEED):
+        self.aggregates = BookingAggregates(exact_customers, seed)
+        self.columns = columns
+        self.offset = header_end
+        self.rows = 0
+        self.last_booking_date = None
+        self.prefix_digest = None
+        self.version = checkpoint_version()
+
+
+def checkpoint_path(path, cache_dir=CACHE_DIR):
+    """Checkpoint file for one source CSV"""
+    return cache_path(path, cache_dir) + '.checkpoint.pkl'
+
+
+def prefix_digest(path, length):
+    """Hash of the first `length` bytes (up to 1 MB) used to detect rewritten files"""
+    with open(path, 'rb') as handle:
+        return hashlib.blake2b(handle.read(min(length, PREFIX_BYTES)), digest_size=16).hexdigest()
+
+
+def read_header(path):
+    """Column names and the byte offset where the data rows start"""
+    with open(path, 'rb') as handle:
+        line = handle.readline()
+    columns = next(csv.reader([line.decode('utf-8-sig')]))
+    return columns, len(line)
+
+
+def load_checkpoint(path, cache_dir=CACHE_DIR):
+    """Saved checkpoint if it still describes a prefix of the source file"""
+    try:
+        with open(checkpoint_path(path, cache_dir), 'rb') as handle:
+            checkpoint = pickle.load(handle)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        return None
+
+    if os.path.getsize(path) < checkpoint.offset:
+        return None
+    if prefix_digest(path, checkpoint.offset) != checkpoint.prefix_digest:
+        return None
+    return checkpoint
+
+
+def save_checkpoint(checkpoint, path, cache_dir=CACHE_DIR):
+    """Write the checkpoint atomically"""
+    target = checkpoint_path(path, cache_dir)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target + '.tmp', 'wb') as handle:
+        pickle.dump(checkpoint, handle)
+    os.replace(target + '.tmp', target)
+
+
+def complete_end(path, offset):
+    """Offset just past the last complete line after `offset` (a partially written line is left out)"""
+    with open(path, 'rb') as handle:
+        end = handle.seek(0, os.SEEK_END)
+        while end > offset:
+            start = max(offset, end - TAIL_BLOCK)
+            handle.seek(start)
+            newline = handle.read(end - start).rfind(b'\n')
+            if newline >= 0:
+                return start + newline + 1
+            end = start
+    return offset
+
+
+class AppendedBytes(io.RawIOBase):
+    """Readable view of bytes offset .. end of an open file, so read_csv stops at the last complete line"""
+
+    def __init__(self, handle, offset, end):
+        handle.seek(offset)
+        self.handle = handle
+        self.remaining = end - offset
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.handle.read(min(len(buffer), self.remaining))
+        buffer[:len(data)] = data
+        self.remaining -= len(data)
+        return len(data)
+
+
+def refresh_aggregates(path=DATA_PATH, cache_dir=CACHE_DIR, chunksize=500_000, exact_customers=False,
+                       seed=DEFAULT_SEED):
+    """Fold rows appended since the last checkpoint into the saved aggregates.
+
+    Returns the checkpoint and the number of new rows ingested. A checkpoint
+    saved with the other customer-counting mode or sketch seed, or by other code, is rebuilt.
+    """
+    checkpoint = load_checkpoint(path, cache_dir)
+    if (checkpoint is None or getattr(checkpoint, 'version', None) != checkpoint_version()
+            or checkpoint.aggregates.exact_customers != exact_customers or checkpoint.aggregates.seed != seed):
+        checkpoint = Checkpoint(*read_header(path), exact_customers=exact_customers, seed=seed)
+
+    end = complete_end(path, checkpoint.offset)
+    new_rows = 0
+    if end > checkpoint.offset:
+        with open(path, 'rb') as handle:
+            appended = io.BufferedReader(AppendedBytes(handle, checkpoint.offset, end))
+            chunks = pd.read_csv(appended, header=None, names=checkpoint.columns,
+                                 chunksize=chunksize, **read_options())
+            for chunk in chunks:
+                chunk = add_derived_features(apply_schema(chunk))
+                checkpoint.aggregates.update(chunk)
+                new_rows += len(chunk)
+
+                if 'booking_date' in chunk.columns and chunk['booking_date'].notna().any():
+                    latest = chunk['booking_date'].max().date()
+                    if checkpoint.last_booking_date is None or latest > checkpoint.last_booking_date:
+                        checkpoint.last_booking_date = latest
+
+    checkpoint.offset = end
+    checkpoint.rows += new_rows
+    checkpoint.prefix_digest = prefix_digest(path, end)
+    save_checkpoint(checkpoint, path, cache_dir)
+    return checkpoint, new_rows
+
+
+def refresh_scorecards(path=DATA_PATH, cache_dir=CACHE_DIR, exact_customers=False):
+    """Property and city scorecards, refreshed with any bookings appended since the last call"""
+    checkpoint, _ = refresh_aggregates(path, cache_dir, exact_customers=exact_customers)
+    return checkpoint.aggregates.scorecards
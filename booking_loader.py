@@ -0,0 +1,108 @@
+"""
+Booking Data Loader - Schema-pinned CSV loading shared by every analysis script
+Declares the 24-column booking schema once so each entry point reads only the
+columns it needs, with categorical strings, downcast numbers and dates parsed
+once per distinct value (see booking_dates).
+"""
+
+import pandas as pd
+
+from booking_dates import parse_date_column
+
+DATA_PATH = 'Hotel_bookings_final.csv'
+
+# Declared schema for Hotel_bookings_final.csv (column -> storage kind)
+BOOKING_SCHEMA = {
+    'customer_id': 'int',
+    'property_id': 'int',
+    'city': 'category',
+    'star_rating': 'int',
+    'booking_date': 'date',
+    'check_in_date': 'date',
+    'check_out_date': 'date',
+    'room_type': 'category',
+    'num_rooms_booked': 'int',
+    'stay_type': 'category',
+    'booking_channel': 'category',
+    'booking_value': 'float',
+    'costprice': 'int',
+    'markup': 'int',
+    'selling_price': 'int',
+    'payment_method': 'category',
+    'refund_status': 'category',
+    'refund_amount': 'float',
+    'channel_of_booking': 'category',
+    'booking_status': 'category',
+    'travel_date': 'date',
+    'cashback': 'float',
+    'coupon_redeem': 'float',
+    'Coupon USed?': 'category',
+}
+
+DATE_COLUMNS = [col for col, kind in BOOKING_SCHEMA.items() if kind == 'date']
+CATEGORY_COLUMNS = [col for col, kind in BOOKING_SCHEMA.items() if kind == 'category']
+NUMERIC_COLUMNS = [col for col, kind in BOOKING_SCHEMA.items() if kind in ('int', 'float')]
+
+
+def downcast_numeric(series):
+    """Shrink a numeric column to the smallest dtype that holds it losslessly"""
+    if pd.api.types.is_integer_dtype(series):
+        return pd.to_numeric(series, downcast='integer')
+
+    if pd.api.types.is_float_dtype(series):
+        if series.notna().all() and (series % 1 == 0).all():
+            return pd.to_numeric(series.astype('int64'), downcast='integer')
+        narrow = series.astype('float32')
+        if ((narrow.astype('float64') == series) | series.isna()).all():
+            return narrow
+    return series
+
+
+def read_options(columns=None):
+    """Keyword arguments for pd.read_csv implementing the declared schema"""
+    usecols = list(columns) if columns is not None else None
+    selected = usecols if usecols is not None else list(BOOKING_SCHEMA)
+
+    # Date strings are read as categories so each distinct day is parsed once
+    dtypes = {col: 'category' for col in selected if BOOKING_SCHEMA.get(col) in ('category', 'date')}
+    return {'usecols': usecols, 'dtype': dtypes}
+
+
+def apply_schema(df):
+    """Parse date columns and downcast numeric columns in place"""
+    for col in df.columns:
+        kind = BOOKING_SCHEMA.get(col)
+        if kind == 'date':
+            df[col] = parse_date_column(df[col])
+        elif kind in ('int', 'float'):
+            df[col] = downcast_numeric(df[col])
+    return df
+
+
+def load_bookings(path=DATA_PATH, columns=None, report=False):
+    """Load the booking CSV with the declared schema, reading only `columns`"""
+    df = apply_schema(pd.read_csv(path, **read_options(columns)))
+
+    if report:
+        memory_report(df)
+
+    return df
+
+
+def iter_bookings(path=DATA_PATH, chunksize=500_000, columns=None):
+    """Stream the booking CSV in schema-typed chunks of at most `chunksize` rows"""
+    for chunk in pd.read_csv(path, chunksize=chunksize, **read_options(columns)):
+        yield apply_schema(chunk)
+
+
+def memory_report(df):
+    """Print per-column memory usage and return the total in bytes"""
+    usage = df.memory_usage(deep=True, index=False)
+
+    print("\nMemory by column:")
+    for col, nbytes in usage.sort_values(ascending=False).items():
+        print(f"   {col:<20} {str(df[col].dtype):<16} {nbytes / 1024:>10,.1f} KB")
+
+    total = int(usage.sum())
+    print(f"   {'TOTAL':<20} {'':<16} {total / 1024:>10,.1f} KB")
+    return total
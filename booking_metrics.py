@@ -0,0 +1,46 @@
+"""
+Booking Metrics - Vectorised cancellation-rate kernel
+Each distinct booking_status value is classified once (by its category), and
+the per-booking int8 flags feed a single groupby().mean() for any list of
+grouping keys, instead of a Python-level regex per group.
+"""
+
+import numpy as np
+import pandas as pd
+
+CANCEL_PATTERN = 'cancel'
+
+
+def cancellation_flags(status):
+    """int8 flag per booking: 1 when its booking_status mentions a cancellation"""
+    if not isinstance(status.dtype, pd.CategoricalDtype):
+        status = status.astype('category')
+    categories = status.cat.categories
+
+    is_cancelled = pd.Series(categories, dtype='string').str.contains(
+        CANCEL_PATTERN, case=False, na=False).to_numpy(dtype='int8')
+
+    # Code -1 (missing status) indexes the trailing "not cancelled" slot
+    lookup = np.append(is_cancelled, np.int8(0))
+    return lookup[status.cat.codes.to_numpy()]
+
+
+def overall_cancellation_rate(status):
+    """Overall cancellation rate (%)"""
+    if len(status) == 0:
+        return float('nan')
+    return cancellation_flags(status).mean() * 100
+
+
+def cancellation_rates(df, by, status_col='booking_status'):
+    """Cancellation rate (%) per combination of grouping keys, in one pass.
+
+    `by` is a column name, a Series (e.g. lead-time bins) or a list of either;
+    several keys give a MultiIndex result.
+    """
+    keys = by if isinstance(by, list) else [by]
+    keys = [df[key] if isinstance(key, str) else key for key in keys]
+
+    flags = pd.Series(cancellation_flags(df[status_col]), index=df.index)
+    rates = flags.groupby(keys if len(keys) > 1 else keys[0], observed=True).mean() * 100
+    return rates.rename('cancellation_rate')
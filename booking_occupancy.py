@@ -0,0 +1,91 @@
+"""
+Booking Occupancy - Nightly room-night demand from difference arrays
+Each stay adds its rooms on the check-in night and removes them on the
+check-out day in a dense day x group difference grid (two bincounts over
+flat cell indices); a cumulative sum down the days turns that into rooms
+occupied per night. Cost is linear in bookings plus the grid size, however
+long the stays are - no booking is exploded into one row per night.
+"""
+
+import numpy as np
+import pandas as pd
+
+from booking_dates import NAT_ORDINAL, datetime_to_ordinals, ordinals_to_datetime
+from booking_engine import encode_dimension
+from booking_metrics import cancellation_flags
+
+
+class OccupancyCalendar:
+    """Rooms occupied per night (rows) and group (columns) as a dense int64 grid"""
+
+    def __init__(self, start, labels, nights, by='property_id'):
+        self.start = start
+        self.labels = labels
+        self.nights = nights
+        self.by = by
+
+    @classmethod
+    def from_frame(cls, df, by='property_id', exclude_cancelled=False, exclude=None,
+                   rooms_col='num_rooms_booked'):
+        """Build the calendar from check-in/check-out dates and rooms booked.
+
+        Stays without both dates, a group or at least one night are left out,
+        as are rows flagged in the boolean `exclude` mask (e.g. stays whose
+        dates were imputed); a missing room count counts as one room.
+        """
+        check_in = datetime_to_ordinals(df['check_in_date']).astype('int64')
+        check_out = datetime_to_ordinals(df['check_out_date']).astype('int64')
+        codes, labels = encode_dimension(df[by])
+        valid = (check_in != NAT_ORDINAL) & (check_out != NAT_ORDINAL) & (check_out > check_in) & (codes >= 0)
+        if exclude_cancelled and 'booking_status' in df.columns:
+            valid &= cancellation_flags(df['booking_status']) == 0
+        if exclude is not None:
+            valid &= ~np.asarray(exclude, dtype=bool)
+
+        rooms = np.ones(len(df))
+        if rooms_col in df.columns:
+            rooms = np.nan_to_num(df[rooms_col].to_numpy(dtype='float64'), nan=1.0)
+        check_in, check_out, codes, rooms = check_in[valid], check_out[valid], codes[valid], rooms[valid]
+
+        groups = len(labels)
+        if len(check_in) == 0:
+            return cls(0, labels, np.zeros((0, groups), dtype='int64'), by)
+
+        start = int(check_in.min())
+        days = int(check_out.max()) - start + 1
+        cells = days * groups
+        # Check-out is the first night no longer occupied, so it sits in the grid's last row at most
+        delta = (np.bincount((check_in - start) * groups + codes, weights=rooms, minlength=cells)
+                 - np.bincount((check_out - start) * groups + codes, weights=rooms, minlength=cells))
+        nights = np.cumsum(delta.reshape(days, groups), axis=0)[:-1]
+        return cls(start, labels, np.rint(nights).astype('int64'), by)
+
+    def dates(self):
+        ordinals = np.arange(self.start, self.start + len(self.nights), dtype='int32')
+        return pd.DatetimeIndex(ordinals_to_datetime(ordinals), name='night')
+
+    def nightly(self):
+        """Rooms occupied per night and group as a DataFrame"""
+        return pd.DataFrame(self.nights, index=self.dates(), columns=pd.Index(self.labels, name=self.by))
+
+    def total(self):
+        """Rooms occupied per night across all groups"""
+        return pd.Series(self.nights.sum(axis=1), index=self.dates(), name='rooms')
+
+    def room_nights(self):
+        """Total room-nights per group"""
+        return pd.Series(self.nights.sum(axis=0), index=pd.Index(self.labels, name=self.by), name='room_nights')
+
+    def pressure(self, capacity=None):
+        """Nightly demand as a percentage of capacity per group.
+
+        Without a capacity, each group's busiest night stands in for its inventory.
+        """
+        if capacity is None:
+            capacity = self.nights.max(axis=0, initial=0)
+        elif isinstance(capacity, pd.Series):
+            capacity = capacity.reindex(self.labels).to_numpy(dtype='float64')
+        with np.errstate(invalid='ignore', divide='ignore'):
+            percent = self.nights / np.asarray(capacity, dtype='float64') * 100
+        return pd.DataFrame(percent, index=self.dates(), columns=pd.Index(self.labels, name=self.by))
+
@@ -0,0 +1,111 @@
+"""
+Booking Partitions - Parallel ingestion of one-CSV-per-day/month exports
+A source may be a single CSV, a directory of CSVs or a glob. Each partition
+is parsed (and pre-aggregated) by a worker in a process pool; the parent
+only reduces the partial results. Parsed partition frames come back as
+.npy column files in the cache layout (see booking_cache) that the parent
+memory-maps, so no column data is pickled between processes.
+"""
+
+import glob
+import os
+import tempfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from booking_aggregates import BookingAggregates
+from booking_cache import CACHE_DIR, load_columns, write_column
+from booking_cleaning import add_derived_features, clean_bookings
+from booking_loader import iter_bookings, load_bookings
+from booking_sketches import DEFAULT_SEED
+
+
+def resolve_partitions(source):
+    """Expand a file, directory or glob pattern into a sorted list of CSV paths"""
+    source = os.fspath(source)
+    if os.path.isdir(source):
+        paths = glob.glob(os.path.join(source, '*.csv'))
+    elif glob.has_magic(source):
+        paths = glob.glob(source)
+    else:
+        paths = [source] if os.path.exists(source) else []
+
+    if not paths:
+        raise FileNotFoundError(f"No booking partitions found for {source!r}")
+    return sorted(paths)
+
+
+def aggregate_partition(path, chunksize=None, exact_customers=False, seed=DEFAULT_SEED):
+    """Worker task: parse one partition and reduce it to BookingAggregates"""
+    # Each partition's sketches get their own reproducible stream, keyed by the file name
+    aggregates = BookingAggregates(exact_customers, seed=(seed, zlib.crc32(os.path.basename(path).encode())))
+    if chunksize:
+        for chunk in iter_bookings(path, chunksize=chunksize):
+            aggregates.update(add_derived_features(chunk))
+    else:
+        aggregates.update(add_derived_features(load_bookings(path)))
+    return aggregates
+
+
+def map_partitions(task, paths, workers=None, **kwargs):
+    """Run `task(path, **kwargs)` for every partition, in a process pool when useful"""
+    if len(paths) == 1 or workers == 1:
+        return [task(path, **kwargs) for path in paths]
+
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(task, path, **kwargs) for path in paths]
+        return [future.result() for future in futures]
+
+
+def aggregate_partitions(paths, workers=None, chunksize=None, exact_customers=False, seed=DEFAULT_SEED):
+    """Pre-aggregate every partition in parallel and merge the partials (in path order)"""
+    total = BookingAggregates(exact_customers, seed)
+    for partial in map_partitions(aggregate_partition, paths, workers, chunksize=chunksize,
+                                  exact_customers=exact_customers, seed=seed):
+        total.merge(partial)
+    return total
+
+
+def concat_partitions(frames):
+    """Concatenate partition frames, keeping categorical columns categorical"""
+    frames = list(frames)
+    for col in frames[0].columns:
+        if isinstance(frames[0][col].dtype, pd.CategoricalDtype):
+            categories = pd.api.types.union_categoricals(
+                [frame[col] for frame in frames], ignore_order=True).categories
+            for frame in frames:
+                frame[col] = frame[col].cat.set_categories(categories)
+    return pd.concat(frames, ignore_index=True)
+
+
+def stage_partition(path, staging, columns=None):
+    """Worker task: parse one partition into .npy column files under staging; returns their metadata"""
+    df = load_bookings(path, columns=columns)
+    directory = tempfile.mkdtemp(dir=staging)
+    entries = [write_column(directory, df[col], f"{i:03d}.npy") for i, col in enumerate(df.columns)]
+    return {'directory': directory, 'columns': entries}
+
+
+def attach_partition(staged):
+    """Frame over a staged partition's memory-mapped columns"""
+    data = load_columns(staged['directory'], staged, {entry['name'] for entry in staged['columns']})
+    return pd.DataFrame(data, copy=False)
+
+
+def read_staged_partitions(paths, staging, workers=None, columns=None):
+    """Stage every partition in parallel, then concatenate the memory-mapped frames"""
+    staged = map_partitions(stage_partition, paths, workers, staging=staging, columns=columns)
+    return concat_partitions(attach_partition(entry) for entry in staged)
+
+
+def load_clean_partitions(paths, workers=None, columns=None, cache_dir=CACHE_DIR):
+    """Parse partitions in parallel, then clean the combined frame once"""
+    os.makedirs(cache_dir, exist_ok=True)
+    with tempfile.TemporaryDirectory(prefix='partitions-', dir=cache_dir, ignore_cleanup_errors=True) as staging:
+        df = read_staged_partitions(paths, staging, workers, columns)
+    df.attrs['missing_counts'] = {col: int(n) for col, n in df.isnull().sum().items()}
+    df.attrs['source_columns'] = list(df.columns)
+    return clean_bookings(df)
@@ -0,0 +1,171 @@
+"""
+Booking Query - Bitmap-indexed filters for slice-and-dice report re-runs
+Every value of the low-cardinality columns (city, star rating, room type,
+channel, status, stay type, booking month) gets a packed bitset with one bit
+per booking, built once per frame. A filter such as "Goa, 4-5 star, Q4,
+App" resolves by OR-ing the bitsets of the values allowed in each column and
+AND-ing across columns - a few word-wise operations over rows / 8 bytes,
+which takes milliseconds on millions of rows - before any row is touched.
+"""
+
+import numpy as np
+
+from booking_engine import encode_dimension
+
+INDEXED_COLUMNS = ['city', 'star_rating', 'room_type', 'booking_channel',
+                   'booking_status', 'stay_type', 'booking_month']
+
+# Set bits in each byte value (np.bitwise_count needs NumPy 2)
+POPCOUNT = np.array([bin(byte).count('1') for byte in range(256)], dtype='uint8')
+
+
+class Q:
+    """Filter expression: a column matching any of the given values.
+
+    Combine with & (and), | (or) and ~ (not), e.g.
+    Q('city', 'Goa') & Q('star_rating', 4, 5) | Q('booking_channel', 'App').
+    """
+
+    def __init__(self, column=None, *values, op=None, terms=()):
+        self.column = column
+        self.values = values
+        self.op = op
+        self.terms = terms
+
+    def __and__(self, other):
+        return Q(op='and', terms=(self, other))
+
+    def __or__(self, other):
+        return Q(op='or', terms=(self, other))
+
+    def __invert__(self):
+        return Q(op='not', terms=(self,))
+
+    def leaves(self):
+        """Single-column terms of the expression"""
+        if self.op is None:
+            return [self]
+        return [leaf for term in self.terms for leaf in term.leaves()]
+
+    def columns(self):
+        """Columns the expression filters on"""
+        return list(dict.fromkeys(leaf.column for leaf in self.leaves()))
+
+    def __repr__(self):
+        if self.op == 'not':
+            return f"~{self.terms[0]!r}"
+        if self.op is not None:
+            return f"({self.terms[0]!r} {'&' if self.op == 'and' else '|'} {self.terms[1]!r})"
+        return f"{self.column} in {list(self.values)}"
+
+
+def where(**filters):
+    """Conjunction of column filters; a list or tuple value means any of those values"""
+    query = None
+    for column, values in filters.items():
+        values = values if isinstance(values, (list, tuple, set)) else [values]
+        term = Q(column, *values)
+        query = term if query is None else query & term
+    return query
+
+
+def parse_filter(text):
+    """Q from CLI text: 'city=Goa', 'star_rating=4,5' or alternatives joined by '|'"""
+    query = None
+    for alternative in text.split('|'):
+        column, _, values = alternative.partition('=')
+        if not values:
+            raise ValueError(f"Filter {alternative!r} should look like column=value[,value...]")
+        term = Q(column.strip(), *[value.strip() for value in values.split(',')])
+        query = term if query is None else query | term
+    return query
+
+
+class BitmapIndex:
+    """Packed bitset per value of each indexed column"""
+
+    def __init__(self, rows, bitmaps):
+        self.rows = rows
+        self.bitmaps = bitmaps
+        self.words = (rows + 7) // 8
+        # Clears the padding bits past the last row after a NOT
+        self.tail = np.packbits(np.ones(rows, dtype=bool))
+
+    @classmethod
+    def from_frame(cls, df, columns=INDEXED_COLUMNS):
+        """Index every value of the given columns that are present in the frame"""
+        bitmaps = {}
+        for col in columns:
+            if col not in df.columns:
+                continue
+            codes, labels = encode_dimension(df[col])
+            bitmaps[col] = {label: np.packbits(codes == code) for code, label in enumerate(labels)}
+        return cls(len(df), bitmaps)
+
+    def values(self, column):
+        """Indexed values of one column"""
+        return list(self.bitmaps[column])
+
+    def label_bits(self, column, value):
+        """Bitset for one value, or None when no row has it; CLI strings match labels by their text"""
+        bitmaps = self.bitmaps[column]
+        if value in bitmaps:
+            return bitmaps[value]
+        for label, bits in bitmaps.items():
+            if str(label) == str(value):
+                return bits
+        return None
+
+    def value_bits(self, column, value):
+        """Bitset for one value (no rows for a value that never occurs)"""
+        if column not in self.bitmaps:
+            raise KeyError(f"Column {column!r} is not indexed (indexed: {', '.join(self.bitmaps)})")
+        bits = self.label_bits(column, value)
+        return np.zeros(self.words, dtype='uint8') if bits is None else bits
+
+    def check(self, query):
+        """Raise ValueError for columns that are not indexed or values no row has (e.g. typos)"""
+        for leaf in query.leaves():
+            if leaf.column not in self.bitmaps:
+                raise ValueError(f"Column {leaf.column!r} is not indexed (indexed: {', '.join(self.bitmaps)})")
+            unknown = [value for value in leaf.values if self.label_bits(leaf.column, value) is None]
+            if unknown:
+                known = ', '.join(str(label) for label in self.bitmaps[leaf.column])
+                raise ValueError(f"No {leaf.column} matches {', '.join(map(str, unknown))} (values: {known})")
+
+    def resolve(self, query):
+        """Packed bitset of the rows matching a Q expression"""
+        if query.op == 'and':
+            return np.bitwise_and(self.resolve(query.terms[0]), self.resolve(query.terms[1]))
+        if query.op == 'or':
+            return np.bitwise_or(self.resolve(query.terms[0]), self.resolve(query.terms[1]))
+        if query.op == 'not':
+            return np.bitwise_and(np.invert(self.resolve(query.terms[0])), self.tail)
+
+        bits = np.zeros(self.words, dtype='uint8')
+        for value in query.values:
+            bits |= self.value_bits(query.column, value)
+        return bits
+
+    def count(self, query):
+        """Number of matching rows, without unpacking the bitset"""
+        return int(POPCOUNT[self.resolve(query)].sum(dtype='int64'))
+
+    def select(self, query):
+        """Positions of the matching rows, in order"""
+        return np.flatnonzero(np.unpackbits(self.resolve(query), count=self.rows))
+
+
+def filter_bookings(df, query, index=None, strict=False):
+    """Rows of df matching the query, with the bitmap index used to find them.
+
+    With strict set, unknown columns or values raise ValueError instead of matching nothing.
+    """
+    if index is None:
+        index = BitmapIndex.from_frame(df)
+    if strict:
+        index.check(query)
+    rows = index.select(query)
+    subset = df.take(rows)
+    subset.attrs = dict(df.attrs)
+    return subset, rows
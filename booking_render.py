@@ -0,0 +1,346 @@
+"""
+Booking Render - Headless figure rendering with an explicit figure lifecycle
+In batch mode (the default) pyplot is switched to the non-interactive Agg
+backend, so nothing blocks on a window. Each figure is saved, closed and
+garbage-collected as soon as it is finished, so a long-running process
+holds at most one figure at a time. Figures can be queued as builder
+functions and rendered one after another. Each render records its time and
+the process RSS with the figure drawn (its peak) and after it is freed.
+Passing --preview (or setting BOOKING_PREVIEW=1) keeps the interactive
+plt.show() behaviour.
+
+In batch mode figures are rasterised in a pool of worker processes, each
+with its own matplotlib state, so a dashboard refresh takes about as long
+as its slowest figure. Queued builders run entirely in a worker; figures
+drawn in this process are pickled to a worker for the expensive savefig.
+The worker count defaults to the CPU count and can be set per renderer or
+with BOOKING_RENDER_WORKERS (1 renders everything in-process).
+
+Batch renders go through a content-addressed cache in .render_cache. A
+figure's key hashes its inputs (the builder and its arguments - for chart
+specs, the spec and its aggregate payload - or the digest of the data a
+drawn figure comes from), the savefig options, the active rcParams, the
+library versions and the project source. Unchanged figures are copied
+from the cache instead of rasterised; BOOKING_RENDER_CACHE=0 disables it.
+"""
+
+import gc
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import sys
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from importlib import metadata
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+try:
+    import psutil
+except ImportError:  # RSS falls back to /proc or getrusage
+    psutil = None
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+PREVIEW_FLAG = '--preview'
+PREVIEW_ENV = 'BOOKING_PREVIEW'
+WORKERS_ENV = 'BOOKING_RENDER_WORKERS'
+CACHE_ENV = 'BOOKING_RENDER_CACHE'
+
+RENDER_CACHE_DIR = '.render_cache'
+CACHE_INDEX = 'index.json'
+VERSIONED_LIBRARIES = ('matplotlib', 'numpy', 'pandas', 'seaborn')
+
+SAVEFIG_DEFAULTS = {'dpi': 300, 'bbox_inches': 'tight'}
+
+# One rendered figure: seconds to draw and save, RSS (MB) with it drawn and after it was
+# closed, and whether it was copied from the render cache
+FigureRecord = namedtuple('FigureRecord', ['path', 'seconds', 'peak_rss_mb', 'rss_after_mb', 'cached'],
+                          defaults=[False])
+
+
+def preview_requested(argv=None):
+    """True when the command line or environment asks for interactive windows"""
+    argv = sys.argv[1:] if argv is None else argv
+    return PREVIEW_FLAG in argv or os.environ.get(PREVIEW_ENV, '') not in ('', '0')
+
+
+def requested_workers():
+    """Worker count from BOOKING_RENDER_WORKERS, or None for one per CPU"""
+    value = os.environ.get(WORKERS_ENV, '')
+    return int(value) if value else None
+
+
+def rss_mb():
+    """Current resident set size of this process in MB (peak RSS where only that is known)"""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / 1024**2
+    try:
+        with open('/proc/self/statm') as handle:
+            return int(handle.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024**2
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is not None:
+        # ru_maxrss is in KB on Linux and bytes on macOS
+        scale = 1024**2 if sys.platform == 'darwin' else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+    return float('nan')
+
+
+def library_versions():
+    """Installed versions of the libraries that shape a rendered figure"""
+    versions = {}
+    for name in VERSIONED_LIBRARIES:
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+
+def code_version():
+    """Hash of the project modules loaded in this process, so code edits invalidate cached figures"""
+    root = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.blake2b(digest_size=8)
+    for name, module in sorted(sys.modules.items()):
+        path = getattr(module, '__file__', None)
+        if path and os.path.dirname(os.path.abspath(path)) == root:
+            with open(path, 'rb') as handle:
+                digest.update(handle.read())
+    return digest.hexdigest()
+
+
+def frame_digest(df, *arrays):
+    """Content hash of a booking frame (and any extra arrays) to key the figures drawn from it"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update('\x00'.join(map(str, df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    for array in arrays:
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()
+
+
+class RenderCache:
+    """Rendered images stored by content key, with the seconds each took to render"""
+
+    def __init__(self, directory=RENDER_CACHE_DIR):
+        self.directory = directory
+        self.index = self.read_index()
+        self.environment = None
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    def read_index(self):
+        try:
+            with open(os.path.join(self.directory, CACHE_INDEX)) as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return {}
+
+    def key(self, inputs, options):
+        """Content key of a figure from its inputs, savefig options, style, libraries and code"""
+        if self.environment is None:
+            self.environment = json.dumps({'versions': library_versions(), 'code': code_version()})
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(pickle.dumps(inputs))
+        digest.update(repr(sorted(dict(SAVEFIG_DEFAULTS, **options).items())).encode())
+        # rcParams carry the active matplotlib/seaborn style
+        digest.update(repr(sorted(plt.rcParams.items())).encode())
+        digest.update(self.environment.encode())
+        return digest.hexdigest()
+
+    def entry(self, key, path):
+        return os.path.join(self.directory, key + os.path.splitext(str(path))[1])
+
+    def fetch(self, key, path):
+        """Copy a cached image to path; returns whether it was cached"""
+        entry = self.entry(key, path)
+        if key not in self.index or not os.path.exists(entry):
+            self.misses += 1
+            return False
+        shutil.copyfile(entry, path)
+        self.hits += 1
+        self.saved_seconds += self.index[key]
+        return True
+
+    def store(self, key, path, seconds):
+        """Keep a freshly rendered image under its key"""
+        os.makedirs(self.directory, exist_ok=True)
+        shutil.copyfile(path, self.entry(key, path))
+        # Merge with entries other processes wrote since this cache was opened
+        self.index = dict(self.read_index(), **self.index, **{key: seconds})
+        target = os.path.join(self.directory, CACHE_INDEX)
+        with open(target + '.tmp', 'w') as handle:
+            json.dump(self.index, handle)
+        os.replace(target + '.tmp', target)
+
+
+def default_cache(interactive):
+    """The render cache to use unless the caller chooses: none when previewing or disabled"""
+    if interactive or os.environ.get(CACHE_ENV, '') == '0':
+        return None
+    return RenderCache()
+
+
+def render_job(path, build, args, options):
+    """Worker entry point: build (or unpickle) one figure, save it and free it"""
+    plt.switch_backend('Agg')
+    started = time.perf_counter()
+    fig = build(*args) if callable(build) else build
+    fig.savefig(path, **dict(SAVEFIG_DEFAULTS, **options))
+    peak = rss_mb()
+    plt.close(fig)
+    gc.collect()
+    return FigureRecord(path, time.perf_counter() - started, peak, rss_mb())
+
+
+class Renderer:
+    """Saves, shows (in preview mode) and frees figures, in worker processes when batching"""
+
+    def __init__(self, interactive=None, workers=None, cache=None):
+        self.interactive = preview_requested() if interactive is None else interactive
+        # cache: None for the default .render_cache, False for none, or a RenderCache
+        self.cache = default_cache(self.interactive) if cache is None else cache or None
+        if not self.interactive:
+            plt.switch_backend('Agg')
+        # Interactive windows belong to this process, so previews never use the pool
+        self.workers = 1 if self.interactive else workers or requested_workers() or os.cpu_count() or 1
+        self.queue = deque()
+        self.records = []
+        self.pool = None
+        self.pending = []
+        self.started = None
+        self.wall_seconds = 0.0
+
+    def start_pool(self):
+        # The wall clock covers pool rendering only, from the first job sent to it
+        if self.started is None:
+            self.started = time.perf_counter()
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers)
+
+    def submit_job(self, path, build, args, options, key=None):
+        """Hand one figure to the worker pool, starting it on first use"""
+        self.start_pool()
+        self.pending.append((self.pool.submit(render_job, path, build, args, options), key))
+
+    def cached(self, key, path, started):
+        """Record of a figure copied from the render cache, or None on a miss"""
+        if key is None or not self.cache.fetch(key, path):
+            return None
+        rss = rss_mb()
+        record = FigureRecord(path, time.perf_counter() - started, rss, rss, cached=True)
+        if self.workers > 1:
+            # Kept in line with pool renders so records stay in submission order
+            self.pending.append((record, None))
+        else:
+            self.records.append(record)
+        return record
+
+    def finish(self, fig, path, started=None, inputs=None, **options):
+        """Save a drawn figure, show it when previewing, then close and free it.
+
+        `inputs` identifies what the figure is drawn from (e.g. a data digest
+        and chart name); with a cache, an unchanged figure is copied from it
+        instead of saved. With worker processes the figure is pickled to the
+        pool and closed here straight away; its record arrives with wait().
+        """
+        if started is None:
+            started = time.perf_counter()
+        key = None
+        if self.cache is not None and inputs is not None:
+            key = self.cache.key(inputs, options)
+            if self.cached(key, path, started):
+                plt.close(fig)
+                return None if self.workers > 1 else self.records[-1]
+        if self.workers > 1:
+            self.submit_job(path, fig, (), options, key)
+            plt.close(fig)
+            return None
+        fig.savefig(path, **dict(SAVEFIG_DEFAULTS, **options))
+        peak = rss_mb()
+        if self.interactive:
+            plt.show()
+        plt.close(fig)
+        gc.collect()
+        record = FigureRecord(path, time.perf_counter() - started, peak, rss_mb())
+        self.records.append(record)
+        if key is not None:
+            self.cache.store(key, path, record.seconds)
+        return record
+
+    def submit(self, path, build, *args, **options):
+        """Queue a figure: build(*args) must draw and return it; options go to savefig"""
+        self.queue.append((path, build, args, options))
+
+    def run(self):
+        """Render queued figures, each closed before the next is built (records in queue order).
+
+        A queued figure's cache key comes from its builder and arguments, so
+        cached figures are not even built.
+        """
+        records = []
+        while self.queue:
+            path, build, args, options = self.queue.popleft()
+            started = time.perf_counter()
+            key = None
+            if self.cache is not None:
+                key = self.cache.key((build.__module__, build.__qualname__, args), options)
+                if self.cached(key, path, started):
+                    records.append(self.records[-1] if self.workers == 1 else None)
+                    continue
+            if self.workers > 1:
+                self.submit_job(path, build, args, options, key)
+                continue
+            record = self.finish(build(*args), path, started, **options)
+            if key is not None:
+                self.cache.store(key, path, record.seconds)
+            records.append(record)
+        return self.wait() if self.workers > 1 else records
+
+    def wait(self):
+        """Collect figures still rendering in the pool (storing them in the cache), then shut it down"""
+        if not self.pending:
+            return []
+        records = []
+        for job, key in self.pending:
+            record = job if isinstance(job, FigureRecord) else job.result()
+            if key is not None:
+                self.cache.store(key, record.path, record.seconds)
+            records.append(record)
+        if self.pool is not None:
+            self.pool.shutdown()
+        if self.started is not None:
+            self.wall_seconds += time.perf_counter() - self.started
+        self.records.extend(records)
+        self.pool, self.pending, self.started = None, [], None
+        return records
+
+    def report(self):
+        """Print the time and memory of every figure rendered so far"""
+        self.wait()
+        mode = 'preview' if self.interactive else f"batch, {self.workers} worker{'s' if self.workers > 1 else ''}"
+        print(f"\nRENDERING SUMMARY ({mode}):")
+        for record in self.records:
+            if record.cached:
+                print(f"   {record.path}: {record.seconds:.2f}s, reused from the render cache")
+                continue
+            print(f"   {record.path}: {record.seconds:.2f}s, peak RSS {record.peak_rss_mb:.0f} MB, "
+                  f"{record.rss_after_mb:.0f} MB after close")
+        if self.wall_seconds:
+            total = sum(record.seconds for record in self.records)
+            print(f"   Wall time {self.wall_seconds:.2f}s for {total:.2f}s of rendering")
+        if self.cache is not None:
+            spent = sum(record.seconds for record in self.records if record.cached)
+            print(f"   Render cache: {self.cache.hits} hits, {self.cache.misses} misses, "
+                  f"{max(self.cache.saved_seconds - spent, 0):.2f}s saved")
+        print(f"   Open figures: {len(plt.get_fignums())}")
@@ -0,0 +1,180 @@
+"""
+Booking Risk - Cancellation probability per booking with a NumPy logistic regression
+Numeric features are standardised into a small float matrix. Each
+categorical feature is kept as int16 codes - the column index of the single
+non-zero entry in its one-hot block - so the one-hot matrix is never
+materialised: its product with the weights is a gather, and its gradient is
+a bincount. The model is fitted on bookings whose outcome is known
+(cancelled or completed) by full-batch gradient descent. Bookings are
+scored in vectorised batches, and large files are scored chunk by chunk in
+bounded memory. Fitted models are saved as JSON.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from booking_cleaning import add_derived_features
+from booking_loader import iter_bookings
+from booking_metrics import cancellation_flags
+
+NUMERIC_FEATURES = ['booking_lead_time', 'stay_duration', 'star_rating']
+CATEGORICAL_FEATURES = ['booking_channel', 'room_type', 'payment_method', 'Coupon USed?']
+
+# Statuses whose outcome is settled; anything else is an open reservation
+CLOSED_PATTERN = 'cancel|complet|no.?show|checked'
+
+
+def open_reservations(status):
+    """Boolean mask of bookings whose outcome is not yet known"""
+    closed = pd.Series(status.astype('string')).str.contains(CLOSED_PATTERN, case=False, na=False)
+    return ~closed.to_numpy()
+
+
+def category_codes(values, categories):
+    """int16 position of each value in `categories`; missing and unseen values get len(categories)"""
+    index = pd.Index(categories)
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Map each distinct category once, then gather through the codes (-1 is missing)
+        lookup = index.get_indexer(values.cat.categories.astype(str))
+        lookup = np.append(np.where(lookup >= 0, lookup, len(index)), len(index))
+        return lookup[values.cat.codes.to_numpy()].astype('int16')
+    positions = index.get_indexer(values.astype(str).where(values.notna()))
+    return np.where(positions >= 0, positions, len(index)).astype('int16')
+
+
+def sigmoid(z):
+    return 0.5 * (1.0 + np.tanh(0.5 * z))
+
+
+def roc_auc(labels, scores):
+    """Area under the ROC curve from score ranks (ties get their average rank)"""
+    labels = np.asarray(labels, dtype=bool)
+    positives, negatives = labels.sum(), (~labels).sum()
+    if positives == 0 or negatives == 0:
+        return float('nan')
+    ranks = pd.Series(scores).rank().to_numpy()
+    return float((ranks[labels].sum() - positives * (positives + 1) / 2) / (positives * negatives))
+
+
+class CancellationModel:
+    """Logistic regression over numeric features and sparse one-hot categories"""
+
+    def __init__(self, numeric=NUMERIC_FEATURES, categorical=CATEGORICAL_FEATURES):
+        self.numeric = list(numeric)
+        self.categorical = list(categorical)
+        self.means = {}
+        self.scales = {}
+        self.categories = {}
+        self.bias = 0.0
+        self.numeric_weights = np.zeros(len(self.numeric))
+        self.category_weights = {}
+
+    def encode(self, df):
+        """Standardised numeric matrix and int16 category codes (last slot: missing or unseen)"""
+        numeric = np.empty((len(df), len(self.numeric)))
+        for j, col in enumerate(self.numeric):
+            values = df[col].to_numpy(dtype='float64')
+            numeric[:, j] = np.nan_to_num((values - self.means[col]) / self.scales[col])
+
+        codes = {}
+        for col in self.categorical:
+            codes[col] = category_codes(df[col], self.categories[col])
+        return numeric, codes
+
+    def linear(self, numeric, codes):
+        """Log-odds per row: the one-hot products are weight gathers"""
+        z = self.bias + numeric @ self.numeric_weights
+        for col, col_codes in codes.items():
+            z += self.category_weights[col][col_codes]
+        return z
+
+    def fit(self, df, labels=None, iterations=300, learning_rate=0.5, l2=1e-4):
+        """Fit on bookings with a known outcome (labels default to the cancellation flags)"""
+        if labels is None:
+            labels = cancellation_flags(df['booking_status'])
+        labels = np.asarray(labels, dtype='float64')
+
+        for col in self.numeric:
+            values = df[col].to_numpy(dtype='float64')
+            self.means[col] = float(np.nanmean(values))
+            self.scales[col] = float(np.nanstd(values)) or 1.0
+        for col in self.categorical:
+            self.categories[col] = sorted({str(value) for value in df[col].dropna().unique()})
+            self.category_weights[col] = np.zeros(len(self.categories[col]) + 1)
+
+        numeric, codes = self.encode(df)
+        n = max(len(labels), 1)
+        self.bias = float(np.log((labels.mean() + 1e-9) / (1 - labels.mean() + 1e-9)))
+        for _ in range(iterations):
+            residual = sigmoid(self.linear(numeric, codes)) - labels
+            self.bias -= learning_rate * residual.mean()
+            self.numeric_weights -= learning_rate * (numeric.T @ residual / n + l2 * self.numeric_weights)
+            for col, col_codes in codes.items():
+                weights = self.category_weights[col]
+                gradient = np.bincount(col_codes, weights=residual, minlength=len(weights)) / n
+                weights -= learning_rate * (gradient + l2 * weights)
+        return self
+
+    def predict_proba(self, df, batch_size=1_000_000):
+        """Cancellation probability per booking, scored in vectorised batches"""
+        scores = np.empty(len(df))
+        for start in range(0, len(df), batch_size):
+            batch = df.iloc[start:start + batch_size]
+            scores[start:start + batch_size] = sigmoid(self.linear(*self.encode(batch)))
+        return scores
+
+    def coefficients(self):
+        """Fitted log-odds per numeric feature (per standard deviation) and category"""
+        rows = {col: weight for col, weight in zip(self.numeric, self.numeric_weights)}
+        for col, categories in self.categories.items():
+            for category, weight in zip(categories, self.category_weights[col]):
+                rows[f"{col}={category}"] = weight
+        return pd.Series(rows, name='log_odds')
+
+    def save(self, path):
+        """Write the fitted model as JSON"""
+        state = {
+            'numeric': self.numeric, 'categorical': self.categorical,
+            'means': self.means, 'scales': self.scales, 'categories': self.categories,
+            'bias': self.bias, 'numeric_weights': self.numeric_weights.tolist(),
+            'category_weights': {col: weights.tolist() for col, weights in self.category_weights.items()},
+        }
+        with open(path, 'w') as handle:
+            json.dump(state, handle, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        """Read a model saved with save()"""
+        with open(path) as handle:
+            state = json.load(handle)
+        model = cls(state['numeric'], state['categorical'])
+        model.means, model.scales, model.categories = state['means'], state['scales'], state['categories']
+        model.bias = state['bias']
+        model.numeric_weights = np.array(state['numeric_weights'])
+        model.category_weights = {col: np.array(weights) for col, weights in state['category_weights'].items()}
+        return model
+
+
+def fit_cancellation_model(df, **options):
+    """Fit on settled bookings (falling back to all bookings when none are settled)"""
+    settled = ~open_reservations(df['booking_status'])
+    training = df[settled] if settled.any() else df
+    return CancellationModel().fit(training, **options)
+
+
+def score_open_reservations(model, df):
+    """Cancellation probability of every open reservation, indexed like df"""
+    mask = open_reservations(df['booking_status'])
+    return pd.Series(model.predict_proba(df[mask]), index=df.index[mask], name='cancellation_risk')
+
+
+def score_bookings_streaming(model, path, chunksize=500_000, open_only=True):
+    """Yield risk scores chunk by chunk for a booking CSV too large to load at once"""
+    for chunk in iter_bookings(path, chunksize=chunksize):
+        chunk = add_derived_features(chunk)
+        if open_only:
+            yield score_open_reservations(model, chunk)
+        else:
+            yield pd.Series(model.predict_proba(chunk), index=chunk.index, name='cancellation_risk')
@@ -0,0 +1,100 @@
+"""
+Booking Scorecards - Per-property and per-city summary tables with O(1) lookups
+Bookings, cancellations, revenue and cost are accumulated per key in one
+booking_engine pass and materialised as a table sorted by key, together
+with a hash index from key to row. A lookup is a dict hit plus a few
+divisions, never a scan of the bookings. Tables hold only additive totals,
+so new bookings (or other chunks and partitions) are folded in by addition
+in O(keys), and the incremental checkpoint keeps them up to date.
+"""
+
+import numpy as np
+import pandas as pd
+
+from booking_engine import Aggregate, aggregate
+
+SCORECARD_KEYS = ['property_id', 'city']
+
+# Additive totals stored per key; ratios are derived on read
+TOTALS = ['bookings', 'cancelled', 'revenue', 'cost']
+
+
+class ScorecardTable:
+    """Additive booking totals per value of one key column, sorted by key"""
+
+    def __init__(self, key, totals=None):
+        self.key = key
+        if totals is None:
+            totals = pd.DataFrame({name: np.zeros(0) for name in TOTALS}, index=pd.Index([], name=key))
+        self.set_totals(totals)
+
+    def set_totals(self, totals):
+        """Store the totals sorted by key and rebuild the key -> row index"""
+        self.totals = totals.sort_index()
+        self.values = self.totals.to_numpy(dtype='float64')
+        self.positions = {value: row for row, value in enumerate(self.totals.index.tolist())}
+
+    @classmethod
+    def from_frame(cls, df, key):
+        """Totals for one frame (or chunk) of bookings"""
+        requests = {'bookings': Aggregate(key, 'count')}
+        if 'booking_status' in df.columns:
+            requests['cancelled'] = Aggregate(key, 'cancelled')
+        if 'selling_price' in df.columns:
+            requests['revenue'] = Aggregate(key, 'sum', 'selling_price')
+        if 'costprice' in df.columns:
+            requests['cost'] = Aggregate(key, 'sum', 'costprice')
+        results = aggregate(df, list(requests.values()))
+
+        index = pd.Index(results[requests['bookings']].index.tolist(), name=key)
+        totals = pd.DataFrame({name: np.zeros(len(index)) for name in TOTALS}, index=index)
+        for name, request in requests.items():
+            totals[name] = results[request].to_numpy(dtype='float64')
+        return cls(key, totals)
+
+    def __len__(self):
+        return len(self.totals)
+
+    def __contains__(self, value):
+        return value in self.positions
+
+    def update(self, chunk):
+        """Fold newly arrived bookings into the table"""
+        return self.merge(ScorecardTable.from_frame(chunk, self.key))
+
+    def merge(self, other):
+        """Add another table's totals (from a chunk, partition or worker)"""
+        self.set_totals(self.totals.add(other.totals, fill_value=0))
+        return self
+
+    def lookup(self, value):
+        """Metrics for one key value in O(1), or None when it has no bookings"""
+        row = self.positions.get(value)
+        if row is None:
+            return None
+        bookings, cancelled, revenue, cost = self.values[row]
+        return {
+            self.key: value,
+            'bookings': int(bookings),
+            'revenue': revenue,
+            'avg_booking_value': revenue / bookings if bookings else float('nan'),
+            'profit_margin': (revenue - cost) / revenue * 100 if revenue else float('nan'),
+            'cancellation_rate': cancelled / bookings * 100 if bookings else float('nan'),
+        }
+
+    def frame(self):
+        """The whole scorecard, sorted by key, with derived ratios"""
+        totals = self.totals
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return pd.DataFrame({
+                'bookings': totals['bookings'].astype('int64'),
+                'revenue': totals['revenue'],
+                'avg_booking_value': totals['revenue'] / totals['bookings'],
+                'profit_margin': (totals['revenue'] - totals['cost']) / totals['revenue'] * 100,
+                'cancellation_rate': totals['cancelled'] / totals['bookings'] * 100,
+            })
+
+
+def build_scorecards(df, keys=SCORECARD_KEYS):
+    """Scorecard tables for every key column present in the frame"""
+    return {key: ScorecardTable.from_frame(df, key) for key in keys if key in df.columns}
@@ -0,0 +1,81 @@
+"""
+Booking Segments - Vectorised RFM customer segmentation
+Recency, frequency and monetary value per customer come from one sort of the
+bookings by customer_id followed by np.add/np.maximum.reduceat over the
+contiguous runs. Segments are assigned with np.searchsorted against quantile
+edges and summarised with a single bincount reduction, so the cost is one
+O(n log n) sort and a few flat arrays even for tens of millions of customers.
+"""
+
+import numpy as np
+import pandas as pd
+
+from booking_dates import NAT_ORDINAL, datetime_to_ordinals
+
+# Segments in ascending value order (codes 0, 1, 2)
+SEGMENT_LABELS = ['Low Value', 'Medium Value', 'High Value']
+
+# A customer reaches a segment when both frequency and spend reach its quantile
+SEGMENT_QUANTILES = [0.5, 0.75]
+
+
+def customer_rfm(df, value_col='selling_price', date_col='booking_date'):
+    """Recency (days before the latest booking), frequency and monetary per customer"""
+    ids = df['customer_id'].to_numpy()
+    missing = pd.isna(ids)
+    # Bookings without a customer are dropped; sorting groups each customer's rows
+    order = np.argsort(ids) if not missing.any() else np.flatnonzero(~missing)[np.argsort(ids[~missing])]
+    ids = ids[order]
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]]) if len(ids) else np.zeros(0, dtype='int64')
+    frequency = np.diff(np.r_[starts, len(ids)])
+
+    values = np.nan_to_num(df[value_col].to_numpy(dtype='float64')[order])
+    monetary = np.add.reduceat(values, starts) if len(ids) else np.zeros(0)
+
+    rfm = {'frequency': frequency, 'monetary': monetary}
+    if date_col in df.columns:
+        days = datetime_to_ordinals(df[date_col])[order]
+        last = np.maximum.reduceat(days, starts) if len(ids) else np.zeros(0, dtype='int32')
+        recency = (days.max(initial=NAT_ORDINAL) - last).astype('float64')
+        recency[last == NAT_ORDINAL] = np.nan
+        rfm['recency'] = recency
+
+    return pd.DataFrame(rfm, index=pd.Index(ids[starts], name='customer_id'))
+
+
+def assign_segments(rfm, quantiles=SEGMENT_QUANTILES):
+    """Segment code per customer: the lower of its frequency and spend quantile levels"""
+    levels = []
+    for col in ('frequency', 'monetary'):
+        values = rfm[col].to_numpy()
+        edges = np.quantile(values, quantiles) if len(values) else np.zeros(len(quantiles))
+        # side='right' counts the edges a value reaches (value >= edge)
+        levels.append(np.searchsorted(edges, values, side='right'))
+    return np.minimum(*levels)
+
+
+def segment_summary(rfm, segments):
+    """Customers, share, average bookings, spend and recency per segment"""
+    size = len(SEGMENT_LABELS)
+    customers = np.bincount(segments, minlength=size)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        summary = pd.DataFrame({
+            'customers': customers,
+            'share': customers / max(len(segments), 1) * 100,
+            'avg_bookings': np.bincount(segments, weights=rfm['frequency'], minlength=size) / customers,
+            'avg_spent': np.bincount(segments, weights=rfm['monetary'], minlength=size) / customers,
+        }, index=pd.Index(SEGMENT_LABELS, name='segment'))
+        if 'recency' in rfm.columns:
+            recency = rfm['recency'].to_numpy()
+            known = ~np.isnan(recency)
+            summary['avg_recency'] = (np.bincount(segments[known], weights=recency[known], minlength=size)
+                                      / np.bincount(segments[known], minlength=size))
+    return summary
+
+
+def segment_customers(df, value_col='selling_price', date_col='booking_date'):
+    """RFM table with a segment column, plus the per-segment summary"""
+    rfm = customer_rfm(df, value_col, date_col)
+    segments = assign_segments(rfm)
+    rfm['segment'] = pd.Categorical.from_codes(segments, SEGMENT_LABELS)
+    return rfm, segment_summary(rfm, segments)
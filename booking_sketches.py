@@ -0,0 +1,116 @@
+"""
+Booking Sketches - Mergeable KLL quantile sketches for out-of-core order statistics
+A sketch keeps a few hundred weighted samples per column in a stack of
+compactors: when a level fills up it is sorted and every other item (from a
+random offset) is promoted to the next level with double weight. Sketches
+built on separate chunks, partitions or processes merge by concatenating
+their levels, so medians and percentile thresholds stay available when no
+single process sees all rows.
+
+Error: with the default k=200 the rank of a returned quantile is within
+about 1.7% of the requested rank with 99% probability (the KLL bound, see
+Karnin, Lang & Liberty 2016), independent of the number of rows. Memory is
+O(k) values per sketch. Below k values the sketch is exact, returning a
+sample value at the requested rank rather than interpolating between two.
+The compaction offsets come from a seeded generator, so the same input in
+the same chunks gives the same estimates on every run.
+"""
+
+import numpy as np
+
+DEFAULT_K = 200
+CAPACITY_DECAY = 2 / 3
+MIN_CAPACITY = 2
+DEFAULT_SEED = 0
+
+
+class QuantileSketch:
+    """KLL sketch over a stream of numeric values (NaN values are ignored)"""
+
+    def __init__(self, k=DEFAULT_K, seed=DEFAULT_SEED):
+        self.k = k
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self.levels = [np.empty(0)]
+        self.rng = np.random.default_rng(seed)
+
+    def capacity(self, level):
+        """Items a level may hold before it is compacted (the top level holds k)"""
+        depth = len(self.levels) - level - 1
+        return max(MIN_CAPACITY, int(np.ceil(self.k * CAPACITY_DECAY ** depth)))
+
+    def size(self):
+        return sum(len(items) for items in self.levels)
+
+    def update(self, values):
+        """Add a batch of values"""
+        values = np.asarray(values, dtype='float64').ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+
+        self.count += len(values)
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self.compress()
+        return self
+
+    def merge(self, other):
+        """Fold another sketch (from a chunk, partition or worker) into this one"""
+        if other.count == 0:
+            return self
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.compress()
+        return self
+
+    def compress(self):
+        """Compact full levels, lowest first, until the sketch fits its capacity"""
+        while self.size() > sum(self.capacity(level) for level in range(len(self.levels))):
+            for level, items in enumerate(self.levels):
+                if len(items) < self.capacity(level):
+                    continue
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+
+                items = np.sort(items)
+                # An odd item out stays behind at this level
+                keep = items[:1] if len(items) % 2 else items[:0]
+                pairs = items[len(keep):]
+                promoted = pairs[self.rng.integers(2)::2]
+
+                self.levels[level] = keep
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+                break
+
+    def quantile(self, q):
+        """Approximate q-quantile(s) for q in [0, 1]; NaN when the sketch is empty"""
+        scalar = np.ndim(q) == 0
+        q = np.atleast_1d(np.asarray(q, dtype='float64'))
+        if self.count == 0:
+            result = np.full(len(q), np.nan)
+            return result[0] if scalar else result
+
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level_items), 2.0 ** level)
+                                  for level, level_items in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        items, cumulative = items[order], np.cumsum(weights[order])
+
+        ranks = q * cumulative[-1]
+        positions = np.minimum(np.searchsorted(cumulative, ranks, side='left'), len(items) - 1)
+        result = items[positions]
+        result[q <= 0] = self.min
+        result[q >= 1] = self.max
+        return result[0] if scalar else result
+
+    def median(self):
+        return self.quantile(0.5)
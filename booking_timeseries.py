@@ -0,0 +1,139 @@
+"""
+Booking Time Series - Dense daily rollups with O(days) coarser views
+Bookings, revenue and cancellations are bincounted once per day ordinal of a
+date column (booking_date, check_in_date or travel_date) into dense arrays
+covering every day from the first to the last. Prefix sums over those arrays
+give weekly, monthly and yearly totals, rolling windows and year-over-year
+changes in O(days) however many rows were counted. Unlike
+groupby('booking_month'), periods keep their year.
+"""
+
+import numpy as np
+import pandas as pd
+
+from booking_dates import MONDAY_ORDINAL, NAT_ORDINAL, datetime_to_ordinals, ordinals_to_datetime
+from booking_metrics import cancellation_flags
+
+DATE_COLUMNS = ['booking_date', 'check_in_date', 'travel_date']
+MEASURES = ('bookings', 'revenue', 'cancelled')
+FREQUENCIES = ('D', 'W', 'M', 'Y')
+
+# Periods one year back, per frequency (days ignore leap years)
+YEAR_LAGS = {'D': 365, 'W': 52, 'M': 12, 'Y': 1}
+
+
+def period_starts(ordinals, freq):
+    """Day ordinal of the first day of the period containing each day"""
+    if freq == 'D':
+        return ordinals
+    if freq == 'W':
+        return ordinals - (ordinals - MONDAY_ORDINAL) % 7
+    if freq in ('M', 'Y'):
+        days = ordinals.astype('datetime64[D]')
+        return days.astype(f'datetime64[{freq}]').astype('datetime64[D]').astype('int64')
+    raise ValueError(f"Unknown frequency {freq!r}; expected one of {FREQUENCIES}")
+
+
+class DailySeries:
+    """Daily bookings, revenue and cancellations for one date column, as dense arrays"""
+
+    def __init__(self, start, bookings, revenue, cancelled):
+        self.start = start
+        self.bookings = bookings
+        self.revenue = revenue
+        self.cancelled = cancelled
+        self.prefix = {}
+
+    @classmethod
+    def from_frame(cls, df, date_col='booking_date', value_col='selling_price'):
+        """Bincount a frame's bookings by day; rows without a date are left out"""
+        days = datetime_to_ordinals(df[date_col]).astype('int64')
+        known = days != NAT_ORDINAL
+        days = days[known]
+        if len(days) == 0:
+            return cls(0, np.zeros(0, dtype='int64'), np.zeros(0), np.zeros(0, dtype='int64'))
+
+        start = int(days.min())
+        offsets = days - start
+        size = int(offsets.max()) + 1
+
+        revenue = np.zeros(size)
+        if value_col in df.columns:
+            values = np.nan_to_num(df[value_col].to_numpy(dtype='float64')[known])
+            revenue = np.bincount(offsets, weights=values, minlength=size)
+        cancelled = np.zeros(size, dtype='int64')
+        if 'booking_status' in df.columns:
+            flags = cancellation_flags(df['booking_status'])[known]
+            cancelled = np.bincount(offsets, weights=flags, minlength=size).astype('int64')
+
+        return cls(start, np.bincount(offsets, minlength=size), revenue, cancelled)
+
+    def __len__(self):
+        return len(self.bookings)
+
+    def ordinals(self):
+        return np.arange(self.start, self.start + len(self), dtype='int64')
+
+    def dates(self):
+        return pd.DatetimeIndex(ordinals_to_datetime(self.ordinals().astype('int32')), name='date')
+
+    def cumulative(self, measure):
+        """Prefix sums of a measure with a leading zero (computed once)"""
+        if measure not in self.prefix:
+            self.prefix[measure] = np.concatenate([[0], np.cumsum(getattr(self, measure))])
+        return self.prefix[measure]
+
+    def merge(self, other):
+        """Add another series (e.g. from a later chunk), widening the day range as needed"""
+        if len(other) == 0:
+            return self
+        if len(self) == 0:
+            self.start = other.start
+        start = min(self.start, other.start)
+        end = max(self.start + len(self), other.start + len(other))
+        for measure in MEASURES:
+            combined = np.zeros(end - start, dtype=np.result_type(getattr(self, measure), getattr(other, measure)))
+            for series in (self, other):
+                offset = series.start - start
+                combined[offset:offset + len(series)] += getattr(series, measure)
+            setattr(self, measure, combined)
+        self.start = start
+        self.prefix = {}
+        return self
+
+    def rollup(self, freq='M'):
+        """Bookings, revenue, cancellations and cancellation rate per day, week, month or year"""
+        ordinals = self.ordinals()
+        starts = period_starts(ordinals, freq)
+        # Days are contiguous, so each period is one run of equal period starts
+        edges = np.flatnonzero(np.r_[True, starts[1:] != starts[:-1]])
+        bounds = np.r_[edges, len(ordinals)]
+
+        table = {}
+        for measure in MEASURES:
+            prefix = self.cumulative(measure)
+            table[measure] = prefix[bounds[1:]] - prefix[bounds[:-1]]
+        periods = pd.DatetimeIndex(ordinals_to_datetime(starts[edges].astype('int32')), name='period')
+        rollup = pd.DataFrame(table, index=periods)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rollup['cancellation_rate'] = rollup['cancelled'] / rollup['bookings'] * 100
+        return rollup
+
+    def rolling(self, measure='bookings', window=7):
+        """Trailing `window`-day totals, indexed by each window's last day"""
+        prefix = self.cumulative(measure)
+        if len(self) < window:
+            return pd.Series(dtype=prefix.dtype, index=pd.DatetimeIndex([], name='date'), name=measure)
+        return pd.Series(prefix[window:] - prefix[:-window], index=self.dates()[window - 1:], name=measure)
+
+    def year_over_year(self, measure='revenue', freq='M'):
+        """Percentage change of each period's total against the same period a year earlier"""
+        totals = self.rollup(freq)[measure].astype('float64')
+        with np.errstate(invalid='ignore', divide='ignore'):
+            change = (totals / totals.shift(YEAR_LAGS[freq]) - 1) * 100
+        return change.rename(f'{measure}_yoy')
+
+
+def build_time_series(df, date_columns=DATE_COLUMNS, value_col='selling_price'):
+    """DailySeries for every date column present in the frame"""
+    return {col: DailySeries.from_frame(df, col, value_col) for col in date_columns if col in df.columns}
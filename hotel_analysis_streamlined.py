@@ -4,39 +4,174 @@ Streamlined version for quick analysis and insights
 """
 
 import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
+import argparse
+import time
 import warnings
+from booking_aggregates import BookingAggregates
+from booking_cache import load_clean_bookings, load_missing_masks
+from booking_cardinality import CardinalitySketches, exact_customer_summary
+from booking_cohorts import cohort_counts, pooled_retention
+from booking_cleaning import add_derived_features
+from booking_engine import REPORT_AGGREGATES, Aggregate, aggregate, available_requests
+from booking_histogram import column_histogram
+from booking_incremental import refresh_aggregates
+from booking_loader import iter_bookings
+from booking_metrics import overall_cancellation_rate
+from booking_partitions import aggregate_partitions, resolve_partitions
+from booking_query import INDEXED_COLUMNS, filter_bookings, parse_filter
+from booking_scorecards import build_scorecards
 warnings.filterwarnings('ignore')
 
-def analyze_hotel_bookings():
-    """Comprehensive hotel booking analysis"""
+# Distribution charts drawn from the mergeable histograms of the aggregate modes
+DISTRIBUTIONS_FILE = 'distributions_streaming.png'
+CUSTOMER_SPEND = ('customer_id', 'sum', 'selling_price')
+DISTRIBUTIONS = {
+    'title': 'Hotel Booking Distributions', 'title_style': {'fontsize': 18, 'fontweight': 'bold'},
+    'figsize': (20, 8), 'panel_title_style': {'fontsize': 14, 'fontweight': 'bold'},
+    'panels': [
+        {'kind': 'hist', 'data': 'profit_margin', 'bins': 30, 'grid': True,
+         'title': 'Profit Margin Distribution', 'xlabel': 'Profit Margin (%)', 'ylabel': 'Frequency',
+         'style': {'color': 'purple', 'alpha': 0.7, 'edgecolor': 'black'},
+         'mean_label': 'Mean: {:.1f}%', 'median_label': 'Median: {:.1f}%'},
+        {'kind': 'hist', 'data': CUSTOMER_SPEND, 'bins': 25, 'scale': 1000, 'grid': True,
+         'title': 'Customer Total Spend Distribution', 'xlabel': 'Total Customer Spend (Thousands $)',
+         'ylabel': 'Number of Customers', 'style': {'color': 'teal', 'alpha': 0.8, 'edgecolor': 'black'},
+         'mean_label': 'Mean: ${:.0f}K', 'median_label': 'Median: ${:.0f}K'},
+    ],
+}
+
+def print_recommendations():
+    """Print the static business recommendations section"""
+    recommendations = [
+        "REDUCE CANCELLATIONS:",
+        "• Implement flexible booking policies for high-cancellation channels",
+        "• Offer incentives for non-refundable bookings",
+        "• Send booking reminders closer to check-in date",
+        "",
+        "IMPROVE PROFITABILITY:",
+        "• Focus marketing on high-value customer segments",
+        "• Optimize pricing for peak seasons and popular room types",
+        "• Increase direct booking initiatives",
+        "",
+        "CHANNEL OPTIMIZATION:",
+        "• Invest more in top-performing booking channels",
+        "• Negotiate better rates with high-volume channels",
+        "• Monitor and improve underperforming channels",
+        "",
+        "CUSTOMER RETENTION:",
+        "• Create loyalty programs for repeat customers",
+        "• Personalize offers based on booking history",
+        "• Implement post-stay follow-up campaigns"
+    ]
+    
+    for rec in recommendations:
+        print(rec)
+
+
+def print_customer_summary(summary, unique_properties=None, customers_by_channel=None):
+    """Print customer behaviour metrics (exact or sketch estimates)"""
+    total_customers = summary['unique_customers']
+    repeat_customers = summary['repeat_customers']
+    repeat_rate = (repeat_customers / total_customers) * 100 if total_customers else 0.0
+    
+    print(f"\nCUSTOMER BEHAVIOR:")
+    print(f"   Total Unique Customers: {total_customers:,}")
+    print(f"   Repeat Customers: {repeat_customers:,} ({repeat_rate:.1f}%)")
+    print(f"   Average Bookings per Customer: {summary['avg_bookings']:.1f}")
+    
+    if 'high_value_threshold' in summary:
+        print(f"   High-Value Customers (top 10%): {summary['high_value_customers']:,}")
+        print(f"   High-Value Threshold: ${summary['high_value_threshold']:.2f}")
+    
+    if unique_properties is not None:
+        print(f"   Unique Properties: {unique_properties:,}")
+    
+    if customers_by_channel is not None:
+        print(f"\nUNIQUE CUSTOMERS BY CHANNEL:")
+        for channel, count in customers_by_channel.sort_values(ascending=False).items():
+            print(f"   {channel}: {count:,}")
+
+
+def print_cohort_retention(df, offsets=3):
+    """Print the share of customers booking again 1..offsets months and weeks after their first booking"""
+    print(f"\nCOHORT RETENTION (share of customers booking again):")
+    for freq, unit in (('M', 'Month'), ('W', 'Week')):
+        retention = pooled_retention(cohort_counts(df, freq, max_offset=offsets))
+        shares = [f"{unit} +{k}: {retention[k]:.1f}%" for k in range(1, offsets + 1) if k in retention.index]
+        if shares:
+            print(f"   {', '.join(shares)}")
+
+
+def print_scorecards(scorecards, top=5):
+    """Print the per-city scorecard and the top properties by revenue"""
+    if 'city' in scorecards:
+        print(f"\nPERFORMANCE BY CITY:")
+        cities = scorecards['city'].frame().sort_values('revenue', ascending=False)
+        for city, row in cities.iterrows():
+            print(f"   {city}: {int(row['bookings']):,} bookings, Revenue ${row['revenue']:,.2f}, "
+                  f"Margin {row['profit_margin']:.1f}%, Cancellations {row['cancellation_rate']:.1f}%")
+    
+    if 'property_id' in scorecards:
+        print(f"\nTOP {top} PROPERTIES BY REVENUE:")
+        properties = scorecards['property_id'].frame().nlargest(top, 'revenue')
+        for prop, row in properties.iterrows():
+            print(f"   Property {prop}: {int(row['bookings']):,} bookings, Revenue ${row['revenue']:,.2f}, "
+                  f"Margin {row['profit_margin']:.1f}%, Cancellations {row['cancellation_rate']:.1f}%")
+
+
+def analyze_hotel_bookings(path='Hotel_bookings_final.csv', exact_customers=False, query=None):
+    """Comprehensive hotel booking analysis.
+
+    Customer and property counts are HyperLogLog/sample estimates unless
+    exact_customers is set (see booking_cardinality). With a query (a
+    booking_query.Q filter) every section is computed on the matching rows only.
+    """
     
     print("="*60)
     print("HOTEL BOOKING DATA ANALYSIS - TRAVCLAN ASSIGNMENT")
     print("="*60)
     
-    # Load data
+    # Load data (cleaned frame, memory-mapped from the cache when fresh)
     try:
-        df = pd.read_csv('Hotel_bookings_final.csv')
-        print(f"Data loaded successfully: {df.shape[0]} rows, {df.shape[1]} columns")
+        df = load_clean_bookings(path)
+        source_columns = df.attrs['source_columns']
+        print(f"Data loaded successfully: {df.shape[0]} rows, {len(source_columns)} columns")
+        # Missingness bitsets recorded before imputation keep filled rows identifiable
+        masks = load_missing_masks(path)
     except Exception as e:
         print(f"Error loading data: {e}")
         return
     
+    selected = None
+    if query is not None:
+        # Resolved with bitmap AND/OR before any row is copied (see booking_query)
+        start = time.perf_counter()
+        total_rows = len(df)
+        try:
+            df, selected = filter_bookings(df, query, strict=True)
+        except ValueError as e:
+            print(f"Invalid filter: {e}")
+            return
+        print(f"Filter {query!r}: {len(df):,} of {total_rows:,} rows selected "
+              f"in {(time.perf_counter() - start) * 1000:.1f} ms")
+        if len(df) == 0:
+            print("No bookings match the filter")
+            return
+    
     # 1. DATASET OVERVIEW
     print("\n1. DATASET OVERVIEW")
     print("-" * 30)
-    print(f"Dataset shape: {df.shape}")
+    print(f"Dataset shape: {(df.shape[0], len(source_columns))}")
     print("\nColumn Information:")
-    for i, col in enumerate(df.columns, 1):
+    for i, col in enumerate(source_columns, 1):
         print(f"{i:2d}. {col:<20} ({df[col].dtype})")
     
-    # 2. MISSING VALUES ANALYSIS
+    # 2. MISSING VALUES ANALYSIS (counts recorded before cleaning)
     print("\n2. MISSING VALUES ANALYSIS")
     print("-" * 30)
-    missing = df.isnull().sum()
+    missing = pd.Series(df.attrs['missing_counts'])
+    if selected is not None:
+        missing = pd.Series({col: int(masks.mask(col)[selected].sum()) for col in missing.index})
     missing_percent = (missing / len(df)) * 100
     
     missing_df = pd.DataFrame({
@@ -47,43 +182,18 @@ def analyze_hotel_bookings():
     
     print(missing_df[missing_df['Missing_Count'] > 0])
     
-    # 3. DATA PREPROCESSING
+    # 3. DATA PREPROCESSING (fitted median/mode imputation and derived features, see booking_imputer)
     print("\n3. DATA PREPROCESSING")
     print("-" * 30)
-    
-    # Handle missing values for numeric columns
-    numeric_cols = df.select_dtypes(include=[np.number]).columns
-    for col in numeric_cols:
-        if df[col].isnull().sum() > 0:
-            df[col].fillna(df[col].median(), inplace=True)
-    
-    # Handle missing values for categorical columns
-    categorical_cols = df.select_dtypes(include=['object']).columns
-    for col in categorical_cols:
-        if df[col].isnull().sum() > 0:
-            df[col].fillna(df[col].mode()[0], inplace=True)
-    
-    # Convert date columns
-    date_columns = [col for col in df.columns if 'date' in col.lower()]
-    for col in date_columns:
-        df[col] = pd.to_datetime(df[col], errors='coerce')
-    
-    # Create derived features
-    if 'booking_date' in df.columns and 'check_in_date' in df.columns:
-        df['booking_lead_time'] = (df['check_in_date'] - df['booking_date']).dt.days
-    
-    if 'check_in_date' in df.columns and 'check_out_date' in df.columns:
-        df['stay_duration'] = (df['check_out_date'] - df['check_in_date']).dt.days
-    
-    if 'selling_price' in df.columns and 'costprice' in df.columns:
-        df['profit_margin'] = ((df['selling_price'] - df['costprice']) / df['selling_price']) * 100
-    
-    if 'booking_date' in df.columns:
-        df['booking_month'] = df['booking_date'].dt.month
-    
     print("Data preprocessing completed")
+    imputed = masks.mask('check_in_date', 'check_out_date')
+    imputed_dates = int(imputed.sum() if selected is None else imputed[selected].sum())
+    print(f"Imputed check-in/check-out dates: {imputed_dates} rows ({imputed_dates / len(df) * 100:.1f}%)")
     print("Created derived features: booking_lead_time, stay_duration, profit_margin")
     
+    # Every per-dimension count, rate and revenue below comes from one engine pass
+    results = aggregate(df, available_requests(REPORT_AGGREGATES, df.columns))
+    
     # 4. KEY OBSERVATIONS - BOOKING PATTERNS
     print("\n4. KEY OBSERVATIONS - BOOKING PATTERNS")
     print("-" * 40)
@@ -91,7 +201,7 @@ def analyze_hotel_bookings():
     # Booking Channel Analysis
     if 'booking_channel' in df.columns:
         print("\nA. BOOKING CHANNEL ANALYSIS:")
-        channel_counts = df['booking_channel'].value_counts()
+        channel_counts = results[Aggregate('booking_channel', 'count')].sort_values(ascending=False)
         channel_percentages = (channel_counts / len(df)) * 100
         for channel, count in channel_counts.head().items():
             pct = channel_percentages[channel]
@@ -100,7 +210,7 @@ def analyze_hotel_bookings():
     # Star Rating Analysis
     if 'star_rating' in df.columns:
         print("\nB. HOTEL STAR RATING ANALYSIS:")
-        rating_counts = df['star_rating'].value_counts().sort_index()
+        rating_counts = results[Aggregate('star_rating', 'count')]
         for rating, count in rating_counts.items():
             pct = (count / len(df)) * 100
             print(f"   {rating}-star hotels: {count:,} bookings ({pct:.1f}%)")
@@ -108,7 +218,7 @@ def analyze_hotel_bookings():
     # Room Type Analysis
     if 'room_type' in df.columns:
         print("\nC. ROOM TYPE PREFERENCES:")
-        room_counts = df['room_type'].value_counts()
+        room_counts = results[Aggregate('room_type', 'count')].sort_values(ascending=False)
         for room, count in room_counts.head().items():
             pct = (count / len(df)) * 100
             print(f"   {room}: {count:,} bookings ({pct:.1f}%)")
@@ -119,18 +229,14 @@ def analyze_hotel_bookings():
     
     if 'booking_status' in df.columns:
         # Overall cancellation rate
-        total_bookings = len(df)
-        cancelled_bookings = len(df[df['booking_status'].str.contains('cancel', case=False, na=False)])
-        cancellation_rate = (cancelled_bookings / total_bookings) * 100
+        cancellation_rate = overall_cancellation_rate(df['booking_status'])
         
         print(f"\nOverall Cancellation Rate: {cancellation_rate:.2f}%")
         
         # Cancellation by channel
         if 'booking_channel' in df.columns:
             print("\nCANCELLATION RATES BY CHANNEL:")
-            cancel_by_channel = df.groupby('booking_channel')['booking_status'].apply(
-                lambda x: (x.str.contains('cancel', case=False, na=False).sum() / len(x)) * 100
-            ).sort_values(ascending=False)
+            cancel_by_channel = results[Aggregate('booking_channel', 'cancellation_rate')].sort_values(ascending=False)
             
             for channel, rate in cancel_by_channel.head().items():
                 print(f"   {channel}: {rate:.1f}%")
@@ -138,9 +244,7 @@ def analyze_hotel_bookings():
         # Cancellation by star rating
         if 'star_rating' in df.columns:
             print("\nCANCELLATION RATES BY STAR RATING:")
-            cancel_by_rating = df.groupby('star_rating')['booking_status'].apply(
-                lambda x: (x.str.contains('cancel', case=False, na=False).sum() / len(x)) * 100
-            )
+            cancel_by_rating = results[Aggregate('star_rating', 'cancellation_rate')]
             
             for rating in sorted(cancel_by_rating.index):
                 rate = cancel_by_rating[rating]
@@ -163,7 +267,10 @@ def analyze_hotel_bookings():
         # Revenue by channel
         if 'booking_channel' in df.columns:
             print(f"\nREVENUE BY BOOKING CHANNEL:")
-            revenue_by_channel = df.groupby('booking_channel')['selling_price'].agg(['sum', 'mean']).round(2)
+            revenue_by_channel = pd.DataFrame({
+                'sum': results[Aggregate('booking_channel', 'sum', 'selling_price')],
+                'mean': results[Aggregate('booking_channel', 'mean', 'selling_price')],
+            }).round(2)
             revenue_by_channel = revenue_by_channel.sort_values('sum', ascending=False)
             
             for channel in revenue_by_channel.index[:5]:
@@ -179,13 +286,16 @@ def analyze_hotel_bookings():
             print(f"   Average Profit Margin: {avg_profit_margin:.2f}%")
             print(f"   Median Profit Margin: {median_profit_margin:.2f}%")
     
+    # Property and city scorecards (sorted by key, see booking_scorecards)
+    print_scorecards(build_scorecards(df))
+    
     # 7. TEMPORAL ANALYSIS
     print("\n7. TEMPORAL TRENDS ANALYSIS")
     print("-" * 40)
     
     if 'booking_month' in df.columns:
         print("\nBOOKINGS BY MONTH:")
-        monthly_bookings = df['booking_month'].value_counts().sort_index()
+        monthly_bookings = results[Aggregate('booking_month', 'count')]
         month_names = {1: 'Jan', 2: 'Feb', 3: 'Mar', 4: 'Apr', 5: 'May', 6: 'Jun',
                       7: 'Jul', 8: 'Aug', 9: 'Sep', 10: 'Oct', 11: 'Nov', 12: 'Dec'}
         
@@ -211,55 +321,31 @@ def analyze_hotel_bookings():
     print("\n8. CUSTOMER SEGMENTATION INSIGHTS")
     print("-" * 40)
     
-    if 'customer_id' in df.columns:
-        # Customer booking frequency
+    customer_summary = None
+    if 'customer_id' in df.columns and exact_customers:
         customer_bookings = df.groupby('customer_id').size()
-        repeat_customers = (customer_bookings > 1).sum()
-        total_customers = len(customer_bookings)
-        repeat_rate = (repeat_customers / total_customers) * 100
-        
-        print(f"\nCUSTOMER BEHAVIOR:")
-        print(f"   Total Unique Customers: {total_customers:,}")
-        print(f"   Repeat Customers: {repeat_customers:,} ({repeat_rate:.1f}%)")
-        print(f"   Average Bookings per Customer: {customer_bookings.mean():.1f}")
-        
-        # High-value customers
-        if 'selling_price' in df.columns:
-            customer_value = df.groupby('customer_id')['selling_price'].sum()
-            high_value_threshold = customer_value.quantile(0.9)
-            high_value_customers = (customer_value >= high_value_threshold).sum()
-            
-            print(f"   High-Value Customers (top 10%): {high_value_customers:,}")
-            print(f"   High-Value Threshold: ${high_value_threshold:.2f}")
+        customer_value = df.groupby('customer_id')['selling_price'].sum() if 'selling_price' in df.columns else None
+        customer_summary = exact_customer_summary(customer_bookings, customer_value)
+        unique_properties = df['property_id'].nunique() if 'property_id' in df.columns else None
+        customers_by_channel = None
+        if 'booking_channel' in df.columns:
+            customers_by_channel = df.groupby('booking_channel', observed=True)['customer_id'].nunique()
+        print_customer_summary(customer_summary, unique_properties, customers_by_channel)
+    elif 'customer_id' in df.columns:
+        # Bounded-memory estimates instead of a per-customer table
+        sketches = CardinalitySketches().update(df)
+        customer_summary = sketches.customer_summary()
+        print_customer_summary(customer_summary, sketches.unique('property_id'),
+                               sketches.unique('customer_id', 'booking_channel'))
+    
+    if 'customer_id' in df.columns and 'booking_date' in df.columns:
+        print_cohort_retention(df)
     
     # 9. BUSINESS RECOMMENDATIONS
     print("\n9. BUSINESS RECOMMENDATIONS")
     print("=" * 40)
     
-    recommendations = [
-        "REDUCE CANCELLATIONS:",
-        "• Implement flexible booking policies for high-cancellation channels",
-        "• Offer incentives for non-refundable bookings",
-        "• Send booking reminders closer to check-in date",
-        "",
-        "IMPROVE PROFITABILITY:",
-        "• Focus marketing on high-value customer segments",
-        "• Optimize pricing for peak seasons and popular room types",
-        "• Increase direct booking initiatives",
-        "",
-        "CHANNEL OPTIMIZATION:",
-        "• Invest more in top-performing booking channels",
-        "• Negotiate better rates with high-volume channels",
-        "• Monitor and improve underperforming channels",
-        "",
-        "CUSTOMER RETENTION:",
-        "• Create loyalty programs for repeat customers",
-        "• Personalize offers based on booking history",
-        "• Implement post-stay follow-up campaigns"
-    ]
-    
-    for rec in recommendations:
-        print(rec)
+    print_recommendations()
     
     # 10. KEY METRICS SUMMARY
     print("\n10. EXECUTIVE SUMMARY - KEY METRICS")
@@ -268,8 +354,7 @@ def analyze_hotel_bookings():
     summary_metrics = []
     
     if 'booking_status' in df.columns:
-        cancelled = df[df['booking_status'].str.contains('cancel', case=False, na=False)]
-        cancel_rate = (len(cancelled) / len(df)) * 100
+        cancel_rate = overall_cancellation_rate(df['booking_status'])
         summary_metrics.append(f"Cancellation Rate: {cancel_rate:.1f}%")
     
     if 'selling_price' in df.columns:
@@ -277,13 +362,13 @@ def analyze_hotel_bookings():
         summary_metrics.append(f"Average Booking Value: ${avg_revenue:.2f}")
     
     if 'booking_channel' in df.columns:
-        top_channel = df['booking_channel'].value_counts().index[0]
-        channel_share = (df['booking_channel'].value_counts().iloc[0] / len(df)) * 100
+        channel_counts = results[Aggregate('booking_channel', 'count')]
+        top_channel = channel_counts.idxmax()
+        channel_share = (channel_counts.max() / len(df)) * 100
         summary_metrics.append(f"Top Channel: {top_channel} ({channel_share:.1f}%)")
     
-    if 'customer_id' in df.columns:
-        unique_customers = df['customer_id'].nunique()
-        summary_metrics.append(f"Unique Customers: {unique_customers:,}")
+    if customer_summary is not None:
+        summary_metrics.append(f"Unique Customers: {customer_summary['unique_customers']:,}")
     
     for metric in summary_metrics:
         print(f"• {metric}")
@@ -292,5 +377,276 @@ def analyze_hotel_bookings():
     print("ANALYSIS COMPLETE!")
     print(f"{'='*60}")
 
+def analyze_hotel_bookings_streaming(path='Hotel_bookings_final.csv', chunksize=500_000, exact_customers=False,
+                                     charts=False):
+    """Out-of-core version of the report built from mergeable per-chunk aggregates.
+
+    Missing values are skipped rather than imputed (global medians and modes
+    are not known chunk by chunk); medians come from mergeable quantile sketches.
+    """
+    
+    print("="*60)
+    print("HOTEL BOOKING DATA ANALYSIS - TRAVCLAN ASSIGNMENT (STREAMING)")
+    print("="*60)
+    
+    aggregates = BookingAggregates(exact_customers)
+    chunks = 0
+    try:
+        for chunk in iter_bookings(path, chunksize=chunksize):
+            aggregates.update(add_derived_features(chunk))
+            chunks += 1
+    except Exception as e:
+        print(f"Error loading data: {e}")
+        return
+    
+    print(f"Streamed {aggregates.rows:,} rows in {chunks} chunks of up to {chunksize:,} rows")
+    print_aggregate_report(aggregates)
+    if charts:
+        render_distributions(aggregates)
+
+
+def analyze_partitions(paths, workers=None, chunksize=None, exact_customers=False, charts=False):
+    """Report over many partition files, each parsed and pre-aggregated by a worker process"""
+    
+    print("="*60)
+    print("HOTEL BOOKING DATA ANALYSIS - TRAVCLAN ASSIGNMENT (PARTITIONED)")
+    print("="*60)
+    
+    start = time.perf_counter()
+    try:
+        aggregates = aggregate_partitions(paths, workers=workers, chunksize=chunksize,
+                                          exact_customers=exact_customers)
+    except Exception as e:
+        print(f"Error loading data: {e}")
+        return
+    
+    print(f"Aggregated {len(paths)} partitions in {time.perf_counter() - start:.2f}s")
+    print_aggregate_report(aggregates)
+    if charts:
+        render_distributions(aggregates)
+
+
+def analyze_incremental(path='Hotel_bookings_final.csv', exact_customers=False, charts=False):
+    """Report from checkpointed aggregates, ingesting only bookings appended since the last run"""
+    
+    print("="*60)
+    print("HOTEL BOOKING DATA ANALYSIS - TRAVCLAN ASSIGNMENT (INCREMENTAL)")
+    print("="*60)
+    
+    start = time.perf_counter()
+    try:
+        checkpoint, new_rows = refresh_aggregates(path, exact_customers=exact_customers)
+    except Exception as e:
+        print(f"Error loading data: {e}")
+        return
+    
+    print(f"Ingested {new_rows:,} new rows in {time.perf_counter() - start:.2f}s "
+          f"({checkpoint.rows:,} rows in checkpoint, bookings through {checkpoint.last_booking_date})")
+    print_aggregate_report(checkpoint.aggregates)
+    if charts:
+        render_distributions(checkpoint.aggregates)
+
+
+def render_distributions(aggregates, path=DISTRIBUTIONS_FILE):
+    """Draw the distribution charts from merged histograms; customer spend needs exact customer tables"""
+    # Plotting modules (and matplotlib) are only imported when charts are asked for
+    from booking_charts import panel_key, render_chart
+    from booking_render import Renderer
+    
+    histograms = dict(aggregates.histograms)
+    if aggregates.customer_spend is not None:
+        histograms[CUSTOMER_SPEND] = column_histogram(aggregates.customer_spend)
+    panels = [panel for panel in DISTRIBUTIONS['panels'] if panel['data'] in histograms]
+    if not panels:
+        return
+    
+    spec = dict(DISTRIBUTIONS, grid=(1, len(panels)), panels=panels)
+    payload = {panel_key(panel): histograms[panel['data']].payload(panel['bins']) for panel in panels}
+    renderer = Renderer(interactive=False, workers=1)
+    renderer.submit(path, render_chart, spec, payload)
+    renderer.run()
+    print(f"\nDistribution charts saved to: {path}")
+
+
+def print_aggregate_report(aggregates):
+    """Print the report sections that can be built from partial aggregates.
+
+    Medians are KLL sketch estimates (within about 1.7% in rank, see booking_sketches).
+    """
+    
+    total = aggregates.rows
+    print(f"Data aggregated successfully: {total} rows")
+    
+    # 4. KEY OBSERVATIONS - BOOKING PATTERNS
+    print("\n4. KEY OBSERVATIONS - BOOKING PATTERNS")
+    print("-" * 40)
+    
+    if 'booking_channel' in aggregates.counts:
+        print("\nA. BOOKING CHANNEL ANALYSIS:")
+        channel_counts = aggregates.counts['booking_channel'].sort_values(ascending=False)
+        for channel, count in channel_counts.head().items():
+            print(f"   {channel}: {int(count):,} bookings ({count / total * 100:.1f}%)")
+    
+    if 'star_rating' in aggregates.counts:
+        print("\nB. HOTEL STAR RATING ANALYSIS:")
+        rating_counts = aggregates.counts['star_rating'].sort_index()
+        for rating, count in rating_counts.items():
+            print(f"   {int(rating)}-star hotels: {int(count):,} bookings ({count / total * 100:.1f}%)")
+    
+    if 'room_type' in aggregates.counts:
+        print("\nC. ROOM TYPE PREFERENCES:")
+        room_counts = aggregates.counts['room_type'].sort_values(ascending=False)
+        for room, count in room_counts.head().items():
+            print(f"   {room}: {int(count):,} bookings ({count / total * 100:.1f}%)")
+    
+    # 5. CANCELLATION ANALYSIS
+    print("\n5. CANCELLATION BEHAVIOR ANALYSIS")
+    print("-" * 40)
+    
+    if aggregates.cancelled:
+        print(f"\nOverall Cancellation Rate: {aggregates.cancelled_total / total * 100:.2f}%")
+        
+        if 'booking_channel' in aggregates.cancelled:
+            print("\nCANCELLATION RATES BY CHANNEL:")
+            cancel_by_channel = aggregates.cancellation_rate('booking_channel').sort_values(ascending=False)
+            for channel, rate in cancel_by_channel.head().items():
+                print(f"   {channel}: {rate:.1f}%")
+        
+        if 'star_rating' in aggregates.cancelled:
+            print("\nCANCELLATION RATES BY STAR RATING:")
+            for rating, rate in aggregates.cancellation_rate('star_rating').sort_index().items():
+                print(f"   {int(rating)}-star hotels: {rate:.1f}%")
+    
+    # 6. REVENUE & PROFITABILITY ANALYSIS
+    print("\n6. REVENUE & PROFITABILITY ANALYSIS")
+    print("-" * 40)
+    
+    if 'selling_price' in aggregates.sums:
+        print(f"\nREVENUE METRICS:")
+        print(f"   Total Revenue: ${aggregates.sums['selling_price']:,.2f}")
+        print(f"   Average Booking Value: ${aggregates.mean('selling_price'):.2f}")
+        print(f"   Median Booking Value: ${aggregates.quantile('selling_price', 0.5):.2f}")
+        
+        if 'booking_channel' in aggregates.revenue:
+            print(f"\nREVENUE BY BOOKING CHANNEL:")
+            revenue_by_channel = aggregates.revenue_summary('booking_channel').round(2)
+            revenue_by_channel = revenue_by_channel.sort_values('sum', ascending=False)
+            for channel in revenue_by_channel.index[:5]:
+                total_rev = revenue_by_channel.loc[channel, 'sum']
+                avg_rev = revenue_by_channel.loc[channel, 'mean']
+                print(f"   {channel}: Total ${total_rev:,.2f}, Avg ${avg_rev:.2f}")
+        
+        if 'profit_margin' in aggregates.sums:
+            print(f"\nPROFIT MARGINS:")
+            print(f"   Average Profit Margin: {aggregates.mean('profit_margin'):.2f}%")
+            print(f"   Median Profit Margin: {aggregates.quantile('profit_margin', 0.5):.2f}%")
+    
+    print_scorecards(aggregates.scorecards)
+    
+    # 7. TEMPORAL ANALYSIS
+    print("\n7. TEMPORAL TRENDS ANALYSIS")
+    print("-" * 40)
+    
+    if 'booking_month' in aggregates.counts:
+        print("\nBOOKINGS BY MONTH:")
+        month_names = {1: 'Jan', 2: 'Feb', 3: 'Mar', 4: 'Apr', 5: 'May', 6: 'Jun',
+                      7: 'Jul', 8: 'Aug', 9: 'Sep', 10: 'Oct', 11: 'Nov', 12: 'Dec'}
+        for month, count in aggregates.counts['booking_month'].sort_index().items():
+            print(f"   {month_names.get(int(month), month)}: {int(count):,} bookings ({count / total * 100:.1f}%)")
+    
+    if 'stay_duration' in aggregates.sums:
+        print(f"\nSTAY DURATION:")
+        print(f"   Average Stay: {aggregates.mean('stay_duration'):.1f} days")
+        print(f"   Median Stay: {aggregates.quantile('stay_duration', 0.5):.1f} days")
+    
+    if 'booking_lead_time' in aggregates.sums:
+        print(f"\nBOOKING LEAD TIME:")
+        print(f"   Average Lead Time: {aggregates.mean('booking_lead_time'):.1f} days")
+        print(f"   Median Lead Time: {aggregates.quantile('booking_lead_time', 0.5):.1f} days")
+    
+    # 8. CUSTOMER SEGMENTATION
+    print("\n8. CUSTOMER SEGMENTATION INSIGHTS")
+    print("-" * 40)
+    
+    customer_summary = aggregates.customer_summary()
+    if customer_summary is not None:
+        print_customer_summary(customer_summary, aggregates.cardinality.unique('property_id'),
+                               aggregates.cardinality.unique('customer_id', 'booking_channel'))
+    
+    # 9. BUSINESS RECOMMENDATIONS
+    print("\n9. BUSINESS RECOMMENDATIONS")
+    print("=" * 40)
+    print_recommendations()
+    
+    # 10. KEY METRICS SUMMARY
+    print("\n10. EXECUTIVE SUMMARY - KEY METRICS")
+    print("=" * 40)
+    
+    if aggregates.cancelled:
+        print(f"• Cancellation Rate: {aggregates.cancelled_total / total * 100:.1f}%")
+    if 'selling_price' in aggregates.sums:
+        print(f"• Average Booking Value: ${aggregates.mean('selling_price'):.2f}")
+    if 'booking_channel' in aggregates.counts:
+        channel_counts = aggregates.counts['booking_channel'].sort_values(ascending=False)
+        print(f"• Top Channel: {channel_counts.index[0]} ({channel_counts.iloc[0] / total * 100:.1f}%)")
+    if customer_summary is not None:
+        print(f"• Unique Customers: {customer_summary['unique_customers']:,}")
+    
+    print(f"\n{'='*60}")
+    print("ANALYSIS COMPLETE!")
+    print(f"{'='*60}")
+
 if __name__ == "__main__":
-    analyze_hotel_bookings()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Streamlined hotel booking analysis")
+    parser.add_argument('source', nargs='?', default='Hotel_bookings_final.csv',
+                        help="booking CSV, directory of partition CSVs, or glob pattern")
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help="stream the CSV in chunks of N rows using mergeable aggregates")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes for partitioned sources (default: CPU count)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="fold only rows appended since the last run into checkpointed aggregates")
+    parser.add_argument('--exact-customers', action='store_true',
+                        help="count customers exactly instead of with bounded-memory sketches")
+    parser.add_argument('--where', action='append', default=[], metavar='COLUMN=VALUE[,VALUE...]',
+                        help="only analyse matching bookings; repeat to AND filters, join with '|' to OR "
+                             "(e.g. --where city=Goa --where star_rating=4,5)")
+    parser.add_argument('--charts', action='store_true',
+                        help=f"with --chunksize, --incremental or partitions, also draw {DISTRIBUTIONS_FILE}")
+    args = parser.parse_args()
+    
+    query = None
+    try:
+        for text in args.where:
+            query = parse_filter(text) if query is None else query & parse_filter(text)
+    except ValueError as e:
+        parser.error(str(e))
+    if query is not None:
+        unindexed = [column for column in query.columns() if column not in INDEXED_COLUMNS]
+        if unindexed:
+            parser.error(f"--where can filter on {', '.join(INDEXED_COLUMNS)}, not {', '.join(unindexed)}")
+    
+    try:
+        paths = resolve_partitions(args.source)
+    except FileNotFoundError as e:
+        # Reported like any other load failure, without a traceback
+        print(f"Error loading data: {e}")
+        raise SystemExit
+    if args.incremental and len(paths) > 1:
+        parser.error("--incremental refreshes the checkpoint of a single CSV, not partitions")
+    if args.charts and (query is not None or not (args.incremental or args.chunksize or len(paths) > 1)):
+        parser.error("--charts draws from the streaming, partitioned or incremental aggregates")
+    if query is not None:
+        if args.incremental or args.chunksize or len(paths) > 1:
+            parser.error("--where works on the in-memory report of a single CSV")
+        analyze_hotel_bookings(paths[0], exact_customers=args.exact_customers, query=query)
+    elif args.incremental:
+        analyze_incremental(paths[0], exact_customers=args.exact_customers, charts=args.charts)
+    elif len(paths) > 1:
+        analyze_partitions(paths, workers=args.workers, chunksize=args.chunksize,
+                           exact_customers=args.exact_customers, charts=args.charts)
+    elif args.chunksize:
+        analyze_hotel_bookings_streaming(paths[0], chunksize=args.chunksize,
+                                         exact_customers=args.exact_customers, charts=args.charts)
+    else:
+        analyze_hotel_bookings(paths[0], exact_customers=args.exact_customers)
\ No newline at end of file
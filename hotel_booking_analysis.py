@@ -12,6 +12,7 @@ This script performs comprehensive analysis of hotel booking data including:
 Dataset: Hotel_bookings_final.csv (30,000 rows, 24 columns)
 """
 
+import sys
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -20,6 +21,22 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import warnings
+from booking_cache import load_clean_bookings, load_missing_masks
+from booking_cohorts import cohort_retention
+from booking_cleaning import DERIVED_FEATURES, clean_bookings
+from booking_engine import CHART_AGGREGATES, Aggregate, aggregate, available_requests
+from booking_features import FeatureStore
+from booking_histogram import column_histogram
+from booking_incremental import refresh_aggregates
+from booking_loader import memory_report
+from booking_metrics import cancellation_flags, cancellation_rates, overall_cancellation_rate
+from booking_occupancy import OccupancyCalendar
+from booking_partitions import load_clean_partitions, resolve_partitions
+from booking_render import Renderer, frame_digest
+from booking_risk import (CATEGORICAL_FEATURES, NUMERIC_FEATURES, fit_cancellation_model,
+                          open_reservations, roc_auc, score_open_reservations)
+from booking_segments import segment_customers
+from booking_timeseries import build_time_series
 warnings.filterwarnings('ignore')
 
 # Set style for better visualizations
@@ -28,11 +45,44 @@ sns.set_palette("husl")
 sns.set_style("whitegrid")
 
 class HotelBookingAnalysis:
-    def __init__(self, csv_path):
-        """Initialize the analysis with data loading"""
+    def __init__(self, csv_path, preview=None, load=True):
+        """Initialize the analysis with data loading (a CSV, directory or glob of partitions)
+
+        With load=False the bookings are not read; only the incremental refresh can run.
+        """
         self.csv_path = csv_path
+        # Figures are saved and closed headlessly unless previewing interactively
+        self.renderer = Renderer(preview)
         self.df = None
-        self.load_data()
+        self.source_columns = []
+        self.features = None
+        self.results = None
+        self.series = None
+        self.missing_masks = None
+        self.data_digest = None
+        if load:
+            self.load_data()
+    
+    def result(self, dimension, statistic, measure=None):
+        """One per-dimension aggregate; all of them are computed together on first use"""
+        if self.results is None:
+            self.results = aggregate(self.df, available_requests(CHART_AGGREGATES, self.df.columns))
+        return self.results[Aggregate(dimension, statistic, measure)]
+    
+    def chart_inputs(self, chart, *options):
+        """Render-cache inputs of a class chart: a content hash of the bookings plus the chart and its options"""
+        columns = tuple(self.df.columns)
+        # Re-hashed only when derived features change the frame's columns
+        if self.data_digest is None or self.data_digest[0] != columns:
+            masks = () if self.missing_masks is None else (self.missing_masks.bits,)
+            self.data_digest = (columns, frame_digest(self.df, *masks))
+        return self.data_digest[1], chart, options
+    
+    def time_series(self, date_col='booking_date'):
+        """Daily series for one date column; all date columns are indexed together on first use"""
+        if self.series is None:
+            self.series = build_time_series(self.df)
+        return self.series[date_col]
     
     def load_data(self):
         """Load and perform initial data inspection"""
@@ -41,13 +91,22 @@ class HotelBookingAnalysis:
         print("="*60)
         
         try:
-            self.df = pd.read_csv(self.csv_path)
-            print(f"Data loaded successfully: {self.df.shape[0]} rows, {self.df.shape[1]} columns")
+            paths = resolve_partitions(self.csv_path)
+            if len(paths) > 1:
+                self.df = load_clean_partitions(paths)
+                print(f"Parsed {len(paths)} partitions in parallel")
+            else:
+                self.df = load_clean_bookings(paths[0])
+                self.missing_masks = load_missing_masks(paths[0])
+            self.source_columns = self.df.attrs['source_columns']
+            self.features = FeatureStore(self.df)
+            print(f"Data loaded successfully: {self.df.shape[0]} rows, {len(self.source_columns)} columns")
             
             # Display basic info
             print("\n1. DATASET OVERVIEW")
             print("-" * 30)
-            print(f"Dataset shape: {self.df.shape}")
+            print(f"Dataset shape: {(self.df.shape[0], len(self.source_columns))}")
+            memory_report(self.df)
             print(f"Memory usage: {self.df.memory_usage(deep=True).sum() / 1024**2:.2f} MB")
             
         except Exception as e:
@@ -59,23 +118,25 @@ class HotelBookingAnalysis:
         print("\n2. DATA STRUCTURE ANALYSIS")
         print("-" * 30)
         
+        source_df = self.df[self.source_columns]
+        
         # Column information
         print("\nColumn Information:")
-        print(self.df.info())
+        print(source_df.info())
         
         # Display first few rows
         print("\nFirst 5 rows:")
-        print(self.df.head())
+        print(source_df.head())
         
         # Column names and types
-        print(f"\nColumns ({len(self.df.columns)}):")
-        for i, col in enumerate(self.df.columns, 1):
-            print(f"{i:2d}. {col:<20} ({self.df[col].dtype})")
+        print(f"\nColumns ({len(source_df.columns)}):")
+        for i, col in enumerate(source_df.columns, 1):
+            print(f"{i:2d}. {col:<20} ({source_df[col].dtype})")
         
-        # Missing values analysis
+        # Missing values analysis (counts recorded before cleaning)
         print("\n3. MISSING VALUES ANALYSIS")
         print("-" * 30)
-        missing = self.df.isnull().sum()
+        missing = pd.Series(self.df.attrs['missing_counts'])
         missing_percent = (missing / len(self.df)) * 100
         
         missing_df = pd.DataFrame({
@@ -93,44 +154,12 @@ class HotelBookingAnalysis:
         print("\n4. DATA CLEANING & FEATURE ENGINEERING")
         print("-" * 30)
         
-        # Handle missing values
-        numeric_columns = self.df.select_dtypes(include=[np.number]).columns
-        categorical_columns = self.df.select_dtypes(include=['object']).columns
-        
-        # Fill missing values
-        for col in numeric_columns:
-            if self.df[col].isnull().sum() > 0:
-                self.df[col].fillna(self.df[col].median(), inplace=True)
-        
-        for col in categorical_columns:
-            if self.df[col].isnull().sum() > 0:
-                self.df[col].fillna(self.df[col].mode()[0], inplace=True)
-        
-        # Convert date columns
-        date_columns = [col for col in self.df.columns if 'date' in col.lower()]
-        for col in date_columns:
-            self.df[col] = pd.to_datetime(self.df[col], errors='coerce')
-        
-        # Create derived features
-        if 'booking_date' in self.df.columns and 'check_in_date' in self.df.columns:
-            self.df['booking_lead_time'] = (self.df['check_in_date'] - self.df['booking_date']).dt.days
-        
-        if 'check_in_date' in self.df.columns and 'check_out_date' in self.df.columns:
-            self.df['stay_duration'] = (self.df['check_out_date'] - self.df['check_in_date']).dt.days
-        
-        # Profit margin calculation
-        if 'selling_price' in self.df.columns and 'costprice' in self.df.columns:
-            self.df['profit_margin'] = ((self.df['selling_price'] - self.df['costprice']) / self.df['selling_price']) * 100
-        
-        # Booking month and season
-        if 'booking_date' in self.df.columns:
-            self.df['booking_month'] = self.df['booking_date'].dt.month
-            self.df['booking_season'] = self.df['booking_month'].map({
-                12: 'Winter', 1: 'Winter', 2: 'Winter',
-                3: 'Spring', 4: 'Spring', 5: 'Spring',
-                6: 'Summer', 7: 'Summer', 8: 'Summer',
-                9: 'Autumn', 10: 'Autumn', 11: 'Autumn'
-            })
+        # Frames from the cache are already cleaned; anything else is cleaned here
+        if not set(DERIVED_FEATURES).issubset(self.df.columns):
+            clean_bookings(self.df)
+            self.features = FeatureStore(self.df)
+            self.results = None
+            self.series = None
         
         print("Data cleaning completed")
         print(f"Created derived features: booking_lead_time, stay_duration, profit_margin, booking_season")
@@ -146,13 +175,13 @@ class HotelBookingAnalysis:
         
         # 1. Booking Channel Distribution
         if 'booking_channel' in self.df.columns:
-            channel_counts = self.df['booking_channel'].value_counts()
+            channel_counts = self.result('booking_channel', 'count').sort_values(ascending=False)
             axes[0,0].pie(channel_counts.values, labels=channel_counts.index, autopct='%1.1f%%')
             axes[0,0].set_title('Booking Channel Distribution', fontsize=14, fontweight='bold')
         
         # 2. Star Rating vs Booking Volume
         if 'star_rating' in self.df.columns:
-            star_booking = self.df.groupby('star_rating').size()
+            star_booking = self.result('star_rating', 'count')
             axes[0,1].bar(star_booking.index, star_booking.values, color='skyblue')
             axes[0,1].set_title('Bookings by Hotel Star Rating', fontsize=14, fontweight='bold')
             axes[0,1].set_xlabel('Star Rating')
@@ -160,7 +189,7 @@ class HotelBookingAnalysis:
         
         # 3. Room Type Analysis
         if 'room_type' in self.df.columns:
-            room_counts = self.df['room_type'].value_counts()
+            room_counts = self.result('room_type', 'count').sort_values(ascending=False)
             axes[1,0].barh(range(len(room_counts)), room_counts.values)
             axes[1,0].set_yticks(range(len(room_counts)))
             axes[1,0].set_yticklabels(room_counts.index)
@@ -169,7 +198,7 @@ class HotelBookingAnalysis:
         
         # 4. Seasonal Booking Trends
         if 'booking_season' in self.df.columns:
-            seasonal_bookings = self.df['booking_season'].value_counts()
+            seasonal_bookings = self.result('booking_season', 'count').sort_values(ascending=False)
             axes[1,1].bar(seasonal_bookings.index, seasonal_bookings.values, 
                          color=['#ff9999', '#66b3ff', '#99ff99', '#ffcc99'])
             axes[1,1].set_title('Seasonal Booking Distribution', fontsize=14, fontweight='bold')
@@ -177,22 +206,22 @@ class HotelBookingAnalysis:
             axes[1,1].set_ylabel('Number of Bookings')
         
         plt.tight_layout()
-        plt.savefig('booking_patterns_analysis.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        self.renderer.finish(fig, 'booking_patterns_analysis.png', inputs=self.chart_inputs('booking_patterns'))
         
         # Print key insights
         print("KEY BOOKING PATTERN INSIGHTS:")
         if 'booking_channel' in self.df.columns:
-            top_channel = self.df['booking_channel'].value_counts().index[0]
-            channel_pct = (self.df['booking_channel'].value_counts().iloc[0] / len(self.df)) * 100
+            channel_counts = self.result('booking_channel', 'count')
+            top_channel = channel_counts.idxmax()
+            channel_pct = (channel_counts.max() / len(self.df)) * 100
             print(f"• Top booking channel: {top_channel} ({channel_pct:.1f}% of bookings)")
         
         if 'star_rating' in self.df.columns:
-            popular_rating = self.df['star_rating'].mode()[0]
+            popular_rating = self.result('star_rating', 'count').idxmax()
             print(f"• Most popular hotel rating: {popular_rating}-star hotels")
         
         if 'room_type' in self.df.columns:
-            popular_room = self.df['room_type'].value_counts().index[0]
+            popular_room = self.result('room_type', 'count').idxmax()
             print(f"• Most booked room type: {popular_room}")
     
     def analyze_cancellations(self):
@@ -205,9 +234,7 @@ class HotelBookingAnalysis:
             return
         
         # Overall cancellation rate
-        total_bookings = len(self.df)
-        cancelled_bookings = len(self.df[self.df['booking_status'].str.contains('cancel', case=False, na=False)])
-        cancellation_rate = (cancelled_bookings / total_bookings) * 100
+        cancellation_rate = overall_cancellation_rate(self.df['booking_status'])
         
         print(f"Overall Cancellation Rate: {cancellation_rate:.2f}%")
         
@@ -217,9 +244,7 @@ class HotelBookingAnalysis:
         
         # 1. Cancellation by Channel
         if 'booking_channel' in self.df.columns:
-            cancel_by_channel = self.df.groupby('booking_channel')['booking_status'].apply(
-                lambda x: (x.str.contains('cancel', case=False, na=False).sum() / len(x)) * 100
-            ).sort_values(ascending=False)
+            cancel_by_channel = self.result('booking_channel', 'cancellation_rate').sort_values(ascending=False)
             
             axes[0,0].bar(range(len(cancel_by_channel)), cancel_by_channel.values, color='coral')
             axes[0,0].set_xticks(range(len(cancel_by_channel)))
@@ -229,9 +254,7 @@ class HotelBookingAnalysis:
         
         # 2. Cancellation by Star Rating
         if 'star_rating' in self.df.columns:
-            cancel_by_rating = self.df.groupby('star_rating')['booking_status'].apply(
-                lambda x: (x.str.contains('cancel', case=False, na=False).sum() / len(x)) * 100
-            )
+            cancel_by_rating = self.result('star_rating', 'cancellation_rate')
             
             axes[0,1].plot(cancel_by_rating.index, cancel_by_rating.values, 
                           marker='o', linewidth=3, markersize=8, color='red')
@@ -242,14 +265,8 @@ class HotelBookingAnalysis:
         
         # 3. Cancellation by Lead Time
         if 'booking_lead_time' in self.df.columns:
-            # Create lead time bins
-            self.df['lead_time_bin'] = pd.cut(self.df['booking_lead_time'], 
-                                            bins=[-1, 7, 30, 90, float('inf')], 
-                                            labels=['0-7 days', '8-30 days', '31-90 days', '90+ days'])
-            
-            cancel_by_leadtime = self.df.groupby('lead_time_bin')['booking_status'].apply(
-                lambda x: (x.str.contains('cancel', case=False, na=False).sum() / len(x)) * 100
-            )
+            # Lead time bins are a memoised feature, not a column added to self.df
+            cancel_by_leadtime = cancellation_rates(self.df, self.features['lead_time_bin'])
             
             axes[1,0].bar(range(len(cancel_by_leadtime)), cancel_by_leadtime.values, color='orange')
             axes[1,0].set_xticks(range(len(cancel_by_leadtime)))
@@ -258,13 +275,12 @@ class HotelBookingAnalysis:
             axes[1,0].set_ylabel('Cancellation Rate (%)')
         
         # 4. Booking Status Distribution
-        status_counts = self.df['booking_status'].value_counts()
+        status_counts = self.result('booking_status', 'count').sort_values(ascending=False)
         axes[1,1].pie(status_counts.values, labels=status_counts.index, autopct='%1.1f%%')
         axes[1,1].set_title('Overall Booking Status Distribution', fontsize=14, fontweight='bold')
         
         plt.tight_layout()
-        plt.savefig('cancellation_analysis.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        self.renderer.finish(fig, 'cancellation_analysis.png', inputs=self.chart_inputs('cancellations'))
         
         # Print cancellation insights
         print("\nCANCELLATION INSIGHTS:")
@@ -274,6 +290,27 @@ class HotelBookingAnalysis:
             highest_cancel_channel = cancel_by_channel.index[0]
             highest_cancel_rate = cancel_by_channel.iloc[0]
             print(f"• Highest cancellation channel: {highest_cancel_channel} ({highest_cancel_rate:.1f}%)")
+        
+        if set(NUMERIC_FEATURES + CATEGORICAL_FEATURES).issubset(self.df.columns):
+            self.cancellation_risk()
+    
+    def cancellation_risk(self):
+        """Fit the cancellation model on settled bookings and score every open reservation"""
+        model = fit_cancellation_model(self.df)
+        settled = self.df[~open_reservations(self.df['booking_status'])]
+        auc = roc_auc(cancellation_flags(settled['booking_status']), model.predict_proba(settled))
+        risk = score_open_reservations(model, self.df)
+        
+        print("\nCANCELLATION RISK MODEL:")
+        print(f"• Trained on {len(settled):,} settled bookings (in-sample AUC {auc:.3f})")
+        coefficients = model.coefficients().sort_values(ascending=False)
+        print(f"• Strongest risk factors: {', '.join(coefficients.index[:3])}")
+        if len(risk):
+            high_risk = risk.quantile(0.9)
+            print(f"• Open reservations scored: {len(risk):,} (mean risk {risk.mean() * 100:.1f}%)")
+            print(f"• Top-decile risk threshold: {high_risk * 100:.1f}% ({int((risk >= high_risk).sum()):,} reservations)")
+        
+        return risk
     
     def revenue_profitability_analysis(self):
         """Analyze revenue patterns and profitability"""
@@ -286,18 +323,22 @@ class HotelBookingAnalysis:
         
         # 1. Revenue by Channel
         if 'booking_channel' in self.df.columns and 'selling_price' in self.df.columns:
-            revenue_by_channel = self.df.groupby('booking_channel')['selling_price'].sum().sort_values(ascending=False)
+            revenue_by_channel = self.result('booking_channel', 'sum', 'selling_price').sort_values(ascending=False)
             axes[0,0].bar(range(len(revenue_by_channel)), revenue_by_channel.values, color='green')
             axes[0,0].set_xticks(range(len(revenue_by_channel)))
             axes[0,0].set_xticklabels(revenue_by_channel.index, rotation=45)
             axes[0,0].set_title('Total Revenue by Booking Channel', fontsize=14, fontweight='bold')
             axes[0,0].set_ylabel('Revenue')
         
-        # 2. Profit Margin Distribution
+        # 2. Profit Margin Distribution (pre-binned in slices; mean and median from the same pass)
         if 'profit_margin' in self.df.columns:
-            axes[0,1].hist(self.df['profit_margin'].dropna(), bins=30, color='purple', alpha=0.7)
-            axes[0,1].axvline(self.df['profit_margin'].mean(), color='red', linestyle='--', 
-                             label=f'Mean: {self.df["profit_margin"].mean():.1f}%')
+            margins = column_histogram(self.df['profit_margin'].to_numpy(dtype='float64', na_value=np.nan))
+            counts, edges = margins.bars(30)
+            axes[0,1].hist(edges[:-1], bins=edges, weights=counts, color='purple', alpha=0.7)
+            axes[0,1].axvline(margins.mean(), color='red', linestyle='--', 
+                             label=f'Mean: {margins.mean():.1f}%')
+            axes[0,1].axvline(margins.median(), color='darkorange', linestyle=':', 
+                             label=f'Median: {margins.median():.1f}%')
             axes[0,1].set_title('Profit Margin Distribution', fontsize=14, fontweight='bold')
             axes[0,1].set_xlabel('Profit Margin (%)')
             axes[0,1].set_ylabel('Frequency')
@@ -305,26 +346,26 @@ class HotelBookingAnalysis:
         
         # 3. Revenue by Star Rating
         if 'star_rating' in self.df.columns and 'selling_price' in self.df.columns:
-            revenue_by_rating = self.df.groupby('star_rating')['selling_price'].mean()
+            revenue_by_rating = self.result('star_rating', 'mean', 'selling_price')
             axes[1,0].bar(revenue_by_rating.index, revenue_by_rating.values, color='gold')
             axes[1,0].set_title('Average Revenue per Booking by Star Rating', fontsize=14, fontweight='bold')
             axes[1,0].set_xlabel('Star Rating')
             axes[1,0].set_ylabel('Average Revenue')
         
         # 4. Monthly Revenue Trend
-        if 'booking_month' in self.df.columns and 'selling_price' in self.df.columns:
-            monthly_revenue = self.df.groupby('booking_month')['selling_price'].sum()
+        if 'booking_date' in self.df.columns and 'selling_price' in self.df.columns:
+            monthly_revenue = self.time_series('booking_date').rollup('M')['revenue']
             axes[1,1].plot(monthly_revenue.index, monthly_revenue.values, 
                           marker='o', linewidth=3, markersize=8, color='blue')
             axes[1,1].set_title('Monthly Revenue Trend', fontsize=14, fontweight='bold')
             axes[1,1].set_xlabel('Month')
             axes[1,1].set_ylabel('Total Revenue')
-            axes[1,1].set_xticks(range(1, 13))
+            axes[1,1].set_xticks(monthly_revenue.index)
+            axes[1,1].set_xticklabels(monthly_revenue.index.strftime('%b %Y'), rotation=45)
             axes[1,1].grid(True, alpha=0.3)
         
         plt.tight_layout()
-        plt.savefig('revenue_analysis.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        self.renderer.finish(fig, 'revenue_analysis.png', inputs=self.chart_inputs('revenue'))
         
         # Calculate key metrics
         if 'selling_price' in self.df.columns:
@@ -347,57 +388,124 @@ class HotelBookingAnalysis:
             print("customer_id column not found, skipping segmentation analysis")
             return
         
-        # Customer behavior metrics
-        customer_metrics = self.df.groupby('customer_id').agg({
-            'booking_value': ['count', 'sum', 'mean'],
-            'stay_duration': 'mean',
-            'booking_lead_time': 'mean'
-        }).round(2)
-        
-        customer_metrics.columns = ['total_bookings', 'total_spent', 'avg_booking_value', 
-                                  'avg_stay_duration', 'avg_lead_time']
-        
-        # Customer segments based on booking frequency and value
-        customer_metrics['segment'] = 'Low Value'
-        customer_metrics.loc[
-            (customer_metrics['total_bookings'] >= customer_metrics['total_bookings'].quantile(0.75)) & 
-            (customer_metrics['total_spent'] >= customer_metrics['total_spent'].quantile(0.75)), 'segment'
-        ] = 'High Value'
-        customer_metrics.loc[
-            (customer_metrics['total_bookings'] >= customer_metrics['total_bookings'].quantile(0.5)) & 
-            (customer_metrics['total_spent'] >= customer_metrics['total_spent'].quantile(0.5)) & 
-            (customer_metrics['segment'] == 'Low Value'), 'segment'
-        ] = 'Medium Value'
+        # Recency/frequency/monetary per customer from one sorted pass (see booking_segments)
+        customer_metrics, segments = segment_customers(self.df, value_col='booking_value')
         
         # Visualization
         fig, axes = plt.subplots(1, 2, figsize=(16, 6))
         fig.suptitle('Customer Segmentation Analysis', fontsize=18, fontweight='bold')
         
         # Segment distribution
-        segment_counts = customer_metrics['segment'].value_counts()
+        segment_counts = segments['customers'][segments['customers'] > 0]
         axes[0].pie(segment_counts.values, labels=segment_counts.index, autopct='%1.1f%%')
         axes[0].set_title('Customer Segment Distribution')
         
         # Segment value comparison
-        segment_value = customer_metrics.groupby('segment')['total_spent'].mean()
-        axes[1].bar(segment_value.index, segment_value.values, color=['red', 'orange', 'green'])
+        segment_value = segments['avg_spent'].dropna()
+        axes[1].bar(segment_value.index, segment_value.values, color=['red', 'orange', 'green'][:len(segment_value)])
         axes[1].set_title('Average Spend by Customer Segment')
         axes[1].set_ylabel('Average Total Spent')
         
         plt.tight_layout()
-        plt.savefig('customer_segmentation.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        self.renderer.finish(fig, 'customer_segmentation.png', inputs=self.chart_inputs('segments'))
         
         print("CUSTOMER SEGMENTATION INSIGHTS:")
-        for segment in customer_metrics['segment'].unique():
-            seg_data = customer_metrics[customer_metrics['segment'] == segment]
-            print(f"• {segment} customers: {len(seg_data)} ({len(seg_data)/len(customer_metrics)*100:.1f}%)")
-            print(f"  - Avg bookings: {seg_data['total_bookings'].mean():.1f}")
-            print(f"  - Avg total spent: ${seg_data['total_spent'].mean():.2f}")
+        for segment, row in segments[segments['customers'] > 0].iloc[::-1].iterrows():
+            print(f"• {segment} customers: {int(row['customers'])} ({row['share']:.1f}%)")
+            print(f"  - Avg bookings: {row['avg_bookings']:.1f}")
+            print(f"  - Avg total spent: ${row['avg_spent']:.2f}")
+            if 'avg_recency' in segments.columns:
+                print(f"  - Avg days since last booking: {row['avg_recency']:.0f}")
+        
+        if 'booking_date' in self.df.columns:
+            self.cohort_analysis()
+        
+        return customer_metrics
+    
+    def cohort_analysis(self, weeks=12):
+        """Retention heatmaps by first-booking month and week (see booking_cohorts)"""
+        monthly, monthly_sizes = cohort_retention(self.df, 'M')
+        weekly, weekly_sizes = cohort_retention(self.df, 'W', max_offset=weeks)
+        weekly = weekly.head(weeks)
+        
+        fig, axes = plt.subplots(1, 2, figsize=(20, 8))
+        fig.suptitle('Customer Cohort Retention', fontsize=18, fontweight='bold')
+        
+        for ax, retention, fmt, unit in ((axes[0], monthly, '%b %Y', 'Months'), (axes[1], weekly, '%d %b %Y', 'Weeks')):
+            labels = retention.index.strftime(fmt)
+            sns.heatmap(retention.set_axis(labels), cmap='Blues', vmin=0, vmax=100, annot=len(retention.columns) <= 13,
+                        fmt='.0f', ax=ax, cbar_kws={'label': '% of cohort booking again'})
+            ax.set_title(f'Retention by First-Booking {unit[:-1]}')
+            ax.set_xlabel(f'{unit} Since First Booking')
+            ax.set_ylabel('Cohort')
+        
+        plt.tight_layout()
+        self.renderer.finish(fig, 'cohort_retention.png', inputs=self.chart_inputs('cohort_retention', weeks))
+        
+        print("\nCOHORT RETENTION INSIGHTS:")
+        print(f"• Monthly cohorts: {len(monthly)} (largest: {monthly_sizes.idxmax():%b %Y}, {monthly_sizes.max():,} customers)")
+        if 1 in weekly.columns:
+            print(f"• Average week +1 retention over the first {len(weekly)} weekly cohorts: {weekly[1].mean():.1f}%")
+        
+        return monthly
+    
+    def occupancy_analysis(self, exclude_cancelled=True):
+        """Nightly room-night demand and inventory pressure per city and property"""
+        print("\n9. OCCUPANCY & INVENTORY PRESSURE")
+        print("-" * 30)
+        
+        required = {'check_in_date', 'check_out_date', 'city', 'property_id'}
+        if not required.issubset(self.df.columns):
+            print("check-in/check-out, city or property columns not found, skipping occupancy analysis")
+            return
+        
+        # Difference arrays over night x group grids (see booking_occupancy); stays are never exploded
+        # Stays with an imputed check-in or check-out date would span the fill date, so they are left out
+        imputed = None
+        if self.missing_masks is not None:
+            imputed = self.missing_masks.mask('check_in_date', 'check_out_date')
+            print(f"Stays with imputed dates left out: {imputed.sum():,}")
+        by_city = OccupancyCalendar.from_frame(self.df, 'city', exclude_cancelled, imputed)
+        by_property = OccupancyCalendar.from_frame(self.df, 'property_id', exclude_cancelled, imputed)
+        
+        fig, axes = plt.subplots(1, 2, figsize=(20, 7))
+        fig.suptitle('Inventory Pressure Analysis', fontsize=18, fontweight='bold')
+        
+        # Nightly rooms occupied per city (7-night average)
+        by_city.nightly().rolling(7, min_periods=1).mean().plot(ax=axes[0], linewidth=2)
+        axes[0].set_title('Rooms Occupied per Night by City (7-night average)')
+        axes[0].set_xlabel('Night')
+        axes[0].set_ylabel('Rooms Occupied')
+        axes[0].grid(True, alpha=0.3)
+        
+        # Monthly average demand as a share of each city's busiest night
+        pressure = by_city.pressure().resample('MS').mean()
+        pressure.index = pressure.index.strftime('%b %Y')
+        sns.heatmap(pressure.T, cmap='YlOrRd', vmin=0, vmax=100, ax=axes[1],
+                    cbar_kws={'label': '% of peak night'})
+        axes[1].set_title('Inventory Pressure by City and Month')
+        axes[1].set_xlabel('Month')
+        axes[1].set_ylabel('City')
+        
+        plt.tight_layout()
+        self.renderer.finish(fig, 'inventory_pressure.png', inputs=self.chart_inputs('inventory_pressure', exclude_cancelled))
+        
+        total = by_city.total()
+        high_pressure = (by_property.pressure() >= 90).sum().sort_values(ascending=False)
+        print("OCCUPANCY INSIGHTS:")
+        scope = " (excluding cancellations)" if exclude_cancelled else ""
+        print(f"• Room-nights{scope}: {total.sum():,}")
+        print(f"• Busiest night: {total.idxmax():%Y-%m-%d} ({total.max():,} rooms)")
+        print(f"• Busiest city: {by_city.room_nights().idxmax()}")
+        print("• Properties with the most nights at 90%+ of their peak:")
+        for prop, nights in high_pressure.head(5).items():
+            print(f"  - Property {prop}: {nights} nights")
+        
+        return by_property
     
     def generate_business_recommendations(self):
         """Generate actionable business recommendations"""
-        print("\n9. BUSINESS RECOMMENDATIONS")
+        print("\n10. BUSINESS RECOMMENDATIONS")
         print("=" * 50)
         
         recommendations = {
@@ -447,7 +555,7 @@ class HotelBookingAnalysis:
     
     def create_executive_summary(self):
         """Create executive summary with key findings"""
-        print("\n10. EXECUTIVE SUMMARY")
+        print("\n11. EXECUTIVE SUMMARY")
         print("=" * 50)
         
         summary = {
@@ -459,7 +567,7 @@ class HotelBookingAnalysis:
         
         # Calculate key metrics for summary
         if 'booking_status' in self.df.columns:
-            cancellation_rate = (self.df['booking_status'].str.contains('cancel', case=False, na=False).sum() / len(self.df)) * 100
+            cancellation_rate = overall_cancellation_rate(self.df['booking_status'])
             summary["Key Findings"].append(f"Overall cancellation rate: {cancellation_rate:.1f}%")
         
         if 'selling_price' in self.df.columns:
@@ -469,8 +577,9 @@ class HotelBookingAnalysis:
             summary["Key Findings"].append(f"Average booking value: ${avg_booking:.2f}")
         
         if 'booking_channel' in self.df.columns:
-            top_channel = self.df['booking_channel'].value_counts().index[0]
-            channel_share = (self.df['booking_channel'].value_counts().iloc[0] / len(self.df)) * 100
+            channel_counts = self.result('booking_channel', 'count')
+            top_channel = channel_counts.idxmax()
+            channel_share = (channel_counts.max() / len(self.df)) * 100
             summary["Key Findings"].append(f"Top channel: {top_channel} ({channel_share:.1f}% of bookings)")
         
         summary["Business Impact"] = [
@@ -509,6 +618,7 @@ class HotelBookingAnalysis:
         self.analyze_cancellations()
         self.revenue_profitability_analysis()
         self.customer_segmentation()
+        self.occupancy_analysis()
         recommendations = self.generate_business_recommendations()
         summary = self.create_executive_summary()
         
@@ -520,10 +630,47 @@ class HotelBookingAnalysis:
         print("• cancellation_analysis.png")
         print("• revenue_analysis.png")
         print("• customer_segmentation.png")
+        print("• cohort_retention.png")
+        print("• inventory_pressure.png")
+        self.renderer.report()
         print(f"{'='*60}")
 
+    def run_incremental_analysis(self):
+        """Refresh checkpointed aggregates with newly appended bookings and summarise them"""
+        print("\nINCREMENTAL REFRESH")
+        print("=" * 50)
+        
+        checkpoint, new_rows = refresh_aggregates(self.csv_path)
+        aggregates = checkpoint.aggregates
+        total = aggregates.rows
+        
+        print(f"• New bookings ingested: {new_rows:,}")
+        print(f"• Bookings in checkpoint: {total:,} (through {checkpoint.last_booking_date})")
+        if total == 0:
+            return aggregates
+        
+        if aggregates.cancelled:
+            print(f"• Overall cancellation rate: {aggregates.cancelled_total / total * 100:.1f}%")
+        if 'selling_price' in aggregates.sums:
+            print(f"• Total revenue analyzed: ${aggregates.sums['selling_price']:,.2f}")
+            print(f"• Average booking value: ${aggregates.mean('selling_price'):.2f}")
+        if 'booking_channel' in aggregates.counts:
+            channel_counts = aggregates.counts['booking_channel'].sort_values(ascending=False)
+            print(f"• Top channel: {channel_counts.index[0]} ({channel_counts.iloc[0] / total * 100:.1f}% of bookings)")
+        customers = aggregates.customer_summary()
+        if customers is not None:
+            print(f"• Unique customers: {customers['unique_customers']:,} ({customers['repeat_customers']:,} repeat)")
+        
+        return aggregates
+
 # Execute the analysis
 if __name__ == "__main__":
+    # --incremental refreshes checkpointed aggregates with appended bookings instead of reloading them all
+    incremental = '--incremental' in sys.argv[1:]
+    
     # Initialize and run analysis
-    analyzer = HotelBookingAnalysis('Hotel_bookings_final.csv')
-    analyzer.run_complete_analysis()
\ No newline at end of file
+    analyzer = HotelBookingAnalysis('Hotel_bookings_final.csv', load=not incremental)
+    if incremental:
+        analyzer.run_incremental_analysis()
+    else:
+        analyzer.run_complete_analysis()
\ No newline at end of file
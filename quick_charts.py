@@ -2,12 +2,19 @@
 Quick Chart Generation for README Documentation
 """
 
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
+from booking_cache import load_clean_bookings
+from booking_charts import build_payload, render_chart, save_payload
+from booking_render import Renderer
 
-# Load data
-df = pd.read_csv('Hotel_bookings_final.csv')
+# Load only the columns the metrics dashboard needs
+df = load_clean_bookings('Hotel_bookings_final.csv',
+                   columns=['star_rating', 'booking_channel', 'selling_price', 'booking_status'])
+
+# Figures are saved and freed without opening windows unless --preview is passed;
+# they render in-process because worker processes would re-run this module-level script
+renderer = Renderer(workers=1)
 
 # Set style
 plt.style.use('default')
@@ -40,45 +47,35 @@ ax.set_ylim(0, 1)
 ax.axis('off')
 plt.title('Project Architecture Overview', fontsize=14, pad=20)
 plt.tight_layout()
-plt.savefig('project_architecture.png', dpi=300, bbox_inches='tight')
-plt.close()
-
-# Create a simple metrics summary chart
-fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
-fig.suptitle('Hotel Booking Analysis - Key Metrics Summary', fontsize=16, fontweight='bold')
-
-# 1. Channel Distribution
-channel_counts = df['booking_channel'].value_counts()
-ax1.pie(channel_counts.values, labels=channel_counts.index, autopct='%1.1f%%', 
-        colors=['lightblue', 'lightgreen', 'orange'])
-ax1.set_title('Booking Channel Distribution', fontweight='bold')
+renderer.finish(fig, 'project_architecture.png', inputs=('project_architecture', layers, colors))
 
-# 2. Cancellation Overview
-cancelled = len(df[df['booking_status'].str.contains('cancel', case=False, na=False)])
-confirmed = len(df) - cancelled
-ax2.pie([confirmed, cancelled], labels=['Confirmed', 'Cancelled'], autopct='%1.1f%%',
-        colors=['lightgreen', 'lightcoral'])
-ax2.set_title('Booking Status Overview', fontweight='bold')
+# Create a simple metrics summary chart from its declarative spec
+METRICS_SUMMARY = {
+    'title': 'Hotel Booking Analysis - Key Metrics Summary',
+    'title_style': {'fontsize': 16, 'fontweight': 'bold'},
+    'figsize': (16, 12), 'grid': (2, 2), 'panel_title_style': {'fontweight': 'bold'},
+    'panels': [
+        {'kind': 'pie', 'data': ('booking_channel', 'count'), 'sort': True, 'title': 'Booking Channel Distribution',
+         'style': {'autopct': '%1.1f%%', 'colors': ['lightblue', 'lightgreen', 'orange']}},
+        {'kind': 'pie', 'data': 'booking_status_split', 'title': 'Booking Status Overview',
+         'style': {'autopct': '%1.1f%%', 'colors': ['lightgreen', 'lightcoral']}},
+        {'kind': 'bar', 'data': ('star_rating', 'count'), 'title': 'Hotel Star Rating Distribution',
+         'xlabel': 'Star Rating', 'ylabel': 'Number of Bookings', 'style': {'color': 'gold', 'alpha': 0.7}},
+        {'kind': 'bar', 'data': 'revenue_metrics', 'title': 'Revenue Metrics', 'ylabel': 'Value',
+         'style': {'color': ['green', 'blue'], 'alpha': 0.7}},
+    ],
+}
 
-# 3. Star Rating Distribution
-star_counts = df['star_rating'].value_counts().sort_index()
-ax3.bar(star_counts.index, star_counts.values, color='gold', alpha=0.7)
-ax3.set_title('Hotel Star Rating Distribution', fontweight='bold')
-ax3.set_xlabel('Star Rating')
-ax3.set_ylabel('Number of Bookings')
-
-# 4. Revenue Metrics
-revenue_data = [df['selling_price'].sum()/1000000, df['selling_price'].mean()/1000]
-labels = ['Total Revenue\n($M)', 'Average Booking\n($K)']
-ax4.bar(labels, revenue_data, color=['green', 'blue'], alpha=0.7)
-ax4.set_title('Revenue Metrics', fontweight='bold')
-ax4.set_ylabel('Value')
-
-plt.tight_layout()
-plt.savefig('metrics_summary_dashboard.png', dpi=300, bbox_inches='tight')
-plt.close()
+# Chart inputs, enough to re-render the dashboard without the bookings
+payload = build_payload(df, [METRICS_SUMMARY])
+save_payload(payload, 'metrics_summary_payload.json')
+# Queued so an unchanged dashboard is copied from the render cache without being drawn
+renderer.submit('metrics_summary_dashboard.png', render_chart, METRICS_SUMMARY, payload)
+renderer.run()
 
 print("Quick charts generated successfully!")
 print("Files created:")
 print("• project_architecture.png")
-print("• metrics_summary_dashboard.png")
\ No newline at end of file
+print("• metrics_summary_dashboard.png")
+print("• metrics_summary_payload.json")
+renderer.report()
@@ -2,57 +2,58 @@
 Quick Visualization Test - Minimal Charts for Testing
 """
 
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+from booking_cache import load_clean_bookings
+from booking_charts import build_payload, render_chart, save_payload
+from booking_render import Renderer
 
-def quick_test():
+# Columns mapped from the cleaned booking cache for the test charts
+CHART_COLUMNS = ['star_rating', 'room_type', 'booking_channel', 'selling_price', 'booking_status']
+
+# Aggregated chart inputs, enough to re-render the test charts without the bookings
+PAYLOAD_FILE = 'quick_test_payload.json'
+
+# Simple 2x2 grid
+QUICK_TEST = {
+    'title': 'TravClan Hotel Booking Analysis - Quick Test',
+    'title_style': {'fontsize': 16, 'fontweight': 'bold'},
+    'figsize': (16, 12), 'grid': (2, 2), 'panel_title_style': {'fontweight': 'bold'},
+    'panels': [
+        {'kind': 'pie', 'data': ('booking_channel', 'count'), 'sort': True, 'title': 'Booking Channels',
+         'style': {'autopct': '%1.1f%%'}},
+        {'kind': 'bar', 'data': ('star_rating', 'count'), 'title': 'Star Ratings',
+         'xlabel': 'Rating', 'ylabel': 'Count', 'style': {'color': 'skyblue'}},
+        {'kind': 'pie', 'data': 'booking_status_split', 'title': 'Booking Status',
+         'style': {'colors': ['lightgreen', 'lightcoral'], 'autopct': '%1.1f%%'}},
+        {'kind': 'barh', 'data': ('room_type', 'count'), 'sort': True, 'title': 'Room Types',
+         'xlabel': 'Bookings', 'style': {'color': 'orange'}},
+    ],
+}
+
+def quick_test(preview=None):
     """Create minimal charts to test visualization functionality"""
-    
+
     print("Loading data for visualization test...")
-    df = pd.read_csv('Hotel_bookings_final.csv')
-    
-    # Create simple 2x2 grid
-    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
-    fig.suptitle('TravClan Hotel Booking Analysis - Quick Test', fontsize=16, fontweight='bold')
-    
-    # 1. Simple Channel Distribution
-    channel_counts = df['booking_channel'].value_counts()
-    ax1.pie(channel_counts.values, labels=channel_counts.index, autopct='%1.1f%%')
-    ax1.set_title('Booking Channels', fontweight='bold')
-    
-    # 2. Star Rating Bars
-    star_counts = df['star_rating'].value_counts().sort_index()
-    ax2.bar(star_counts.index, star_counts.values, color='skyblue')
-    ax2.set_title('Star Ratings', fontweight='bold')
-    ax2.set_xlabel('Rating')
-    ax2.set_ylabel('Count')
-    
-    # 3. Booking Status
-    cancelled = len(df[df['booking_status'].str.contains('cancel', case=False, na=False)])
-    confirmed = len(df) - cancelled
-    ax3.pie([confirmed, cancelled], labels=['Confirmed', 'Cancelled'], 
-           colors=['lightgreen', 'lightcoral'], autopct='%1.1f%%')
-    ax3.set_title('Booking Status', fontweight='bold')
-    
-    # 4. Room Types
-    room_counts = df['room_type'].value_counts()
-    ax4.barh(room_counts.index, room_counts.values, color='orange')
-    ax4.set_title('Room Types', fontweight='bold')
-    ax4.set_xlabel('Bookings')
-    
-    plt.tight_layout()
-    plt.savefig('quick_test_charts.png', dpi=200, bbox_inches='tight')
+    df = load_clean_bookings('Hotel_bookings_final.csv', columns=CHART_COLUMNS)
+    # Reduce the bookings to the few numbers each chart panel draws
+    payload = build_payload(df, [QUICK_TEST])
+    save_payload(payload, PAYLOAD_FILE)
+
+    renderer = Renderer(preview)
+    renderer.submit('quick_test_charts.png', render_chart, QUICK_TEST, payload, dpi=200)
+    renderer.run()
     print("Test charts saved to: quick_test_charts.png")
-    plt.show()
-    
+
     # Print quick stats
+    channel = payload['booking_channel.count']
+    top = max(range(len(channel['values'])), key=channel['values'].__getitem__)
+    cancelled = payload['booking_status_split']['values'][1]
     print(f"\n=== QUICK STATS ===")
     print(f"Total Bookings: {len(df):,}")
     print(f"Cancellation Rate: {(cancelled/len(df)*100):.1f}%")
     print(f"Average Booking Value: ${df['selling_price'].mean():,.2f}")
-    print(f"Top Channel: {channel_counts.index[0]} ({channel_counts.iloc[0]/len(df)*100:.1f}%)")
+    print(f"Top Channel: {channel['index'][top]} ({channel['values'][top]/len(df)*100:.1f}%)")
     print(f"Visualization test completed successfully!")
+    renderer.report()
 
 if __name__ == "__main__":
-    quick_test()
\ No newline at end of file
+    quick_test()
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from booking_aggregates import BookingAggregates
+
+
+def sample_bookings():
+    return pd.DataFrame({
+        'customer_id': [1, 2, 1, 3, 2, 1],
+        'booking_channel': pd.Categorical(['Web', 'App', 'Web', 'Agent', 'Web', 'App']),
+        'star_rating': [3, 4, 4, 5, 3, 4],
+        'selling_price': [100, 200, 300, 400, 500, 600],
+        'booking_status': pd.Categorical(['Confirmed', 'Cancelled', 'Confirmed',
+                                          'Cancelled', 'Completed', 'Confirmed']),
+    })
+
+
+def test_chunked_aggregates_match_single_pass():
+    df = sample_bookings()
+    whole = BookingAggregates(exact_customers=True).update(df)
+
+    chunked = BookingAggregates(exact_customers=True)
+    for start in range(0, len(df), 4):
+        chunked.merge(BookingAggregates(exact_customers=True).update(df.iloc[start:start + 4]))
+
+    assert chunked.rows == whole.rows == 6
+    assert chunked.cancelled_total == 2
+    pd.testing.assert_series_equal(chunked.counts['booking_channel'].sort_index(),
+                                   whole.counts['booking_channel'].sort_index(), check_names=False)
+    assert chunked.cancellation_rate('booking_channel')['App'] == 50.0
+    assert chunked.revenue_summary('star_rating').loc[4, 'sum'] == 1100
+    assert chunked.mean('selling_price') == 350
+    assert chunked.customer_bookings[1] == 3
+
+
+def test_merged_aggregates_keep_medians():
+    df = sample_bookings()
+    chunked = BookingAggregates()
+    for start in range(0, len(df), 4):
+        chunked.merge(BookingAggregates().update(df.iloc[start:start + 4]))
+
+    assert chunked.quantile('selling_price', 0.5) == 300
+    assert 'customer_id' not in chunked.sketches
+
+
+def test_customer_summary_from_sketches_matches_exact():
+    df = sample_bookings()
+    exact = BookingAggregates(exact_customers=True).update(df)
+    sketched = BookingAggregates()
+    for start in range(0, len(df), 4):
+        sketched.merge(BookingAggregates().update(df.iloc[start:start + 4]))
+
+    assert sketched.customer_bookings is None
+    # Small customer bases fit in the distinct sample, so the estimates are exact
+    assert sketched.customer_summary()['unique_customers'] == 3
+    assert sketched.customer_summary()['repeat_customers'] == 2
+    assert exact.customer_summary()['repeat_customers'] == 2
+
+
+def test_sketched_medians_are_reproducible():
+    rng = np.random.default_rng(11)
+    df = pd.DataFrame({'selling_price': rng.lognormal(10, 1, 20_000)})
+
+    def chunked_median():
+        aggregates = BookingAggregates()
+        for start in range(0, len(df), 3_000):
+            aggregates.merge(BookingAggregates().update(df.iloc[start:start + 3_000]))
+        return aggregates.quantile('selling_price', 0.5)
+
+    assert chunked_median() == chunked_median()
@@ -0,0 +1,75 @@
+import os
+
+import pandas as pd
+
+import booking_cache
+from booking_cache import load_clean_bookings
+
+
+def write_sample(path, price=25000):
+    pd.DataFrame({
+        'customer_id': [101, 102, 101],
+        'booking_date': ['2023-01-05', '2023-02-10', '2023-03-15'],
+        'check_in_date': ['2023-01-20', None, '2023-03-20'],
+        'check_out_date': ['2023-01-22', '2023-02-14', '2023-03-21'],
+        'booking_channel': ['Web', 'App', None],
+        'costprice': [20000, 30000, 15000],
+        'selling_price': [price, 41000, 18000],
+    }).to_csv(path, index=False)
+
+
+def test_cache_is_built_then_reused(tmp_path, monkeypatch):
+    path = tmp_path / 'bookings.csv'
+    write_sample(path)
+    cache_dir = tmp_path / 'cache'
+
+    cold = load_clean_bookings(path, cache_dir=cache_dir)
+
+    def fail(*args):
+        raise AssertionError("cache should not be rebuilt")
+
+    monkeypatch.setattr(booking_cache, 'build_clean_bookings', fail)
+    warm = load_clean_bookings(path, cache_dir=cache_dir)
+
+    pd.testing.assert_frame_equal(cold, warm)
+    assert warm.attrs['missing_counts']['check_in_date'] == 1
+    assert warm['booking_channel'].isna().sum() == 0
+    assert 'profit_margin' in warm.columns
+
+
+def test_cache_survives_touch_but_not_edit(tmp_path):
+    path = tmp_path / 'bookings.csv'
+    write_sample(path)
+    cache_dir = tmp_path / 'cache'
+    load_clean_bookings(path, cache_dir=cache_dir)
+
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert load_clean_bookings(path, cache_dir=cache_dir)['selling_price'].iloc[0] == 25000
+
+    write_sample(path, price=26000)
+    assert load_clean_bookings(path, cache_dir=cache_dir)['selling_price'].iloc[0] == 26000
+
+
+def test_cache_projects_columns(tmp_path):
+    path = tmp_path / 'bookings.csv'
+    write_sample(path)
+
+    df = load_clean_bookings(path, columns=['booking_channel', 'booking_month'],
+                             cache_dir=tmp_path / 'cache')
+
+    assert list(df.columns) == ['booking_channel', 'booking_month']
+
+
+def test_features_are_added_to_the_cache_on_first_request(tmp_path):
+    path = tmp_path / 'bookings.csv'
+    write_sample(path)
+    cache_dir = tmp_path / 'cache'
+
+    df = load_clean_bookings(path, columns=['stay_duration'], cache_dir=cache_dir)
+    assert df['stay_duration'].tolist() == [2, 25, 1]
+
+    meta = booking_cache.read_meta(booking_cache.cache_path(path, cache_dir))
+    stored = [entry['name'] for entry in meta['columns']]
+    assert 'stay_duration' in stored
+    assert 'profit_margin' not in stored
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from booking_cardinality import CardinalitySketches, HyperLogLog, hash_values
+
+
+def test_hashes_ignore_integer_width_and_missing_values():
+    narrow = hash_values(pd.Series([7, 8], dtype='int16'))
+    gappy = hash_values(pd.Series([7.0, np.nan, 8.0]))
+    assert narrow.tolist() == gappy.tolist()
+
+
+def test_merged_hyperloglogs_estimate_distinct_counts():
+    ids = np.arange(200_000)
+    left = HyperLogLog().update(hash_values(pd.Series(ids[:120_000])))
+    right = HyperLogLog().update(hash_values(pd.Series(ids[80_000:])))
+
+    assert abs(left.merge(right).estimate() / len(ids) - 1) < 0.03
+
+
+def test_repeat_customers_from_distinct_sample():
+    rng = np.random.default_rng(3)
+    # 50,000 customers; the first 20% book twice
+    customers = np.concatenate([np.arange(50_000), np.arange(10_000)])
+    df = pd.DataFrame({'customer_id': rng.permutation(customers),
+                       'booking_channel': pd.Categorical(rng.choice(['App', 'Web'], len(customers))),
+                       'selling_price': 100.0})
+
+    sketches = CardinalitySketches()
+    for start in range(0, len(df), 10_000):
+        sketches.merge(CardinalitySketches().update(df.iloc[start:start + 10_000]))
+    summary = sketches.customer_summary()
+
+    assert abs(summary['unique_customers'] / 50_000 - 1) < 0.03
+    assert abs(summary['repeat_customers'] / 10_000 - 1) < 0.1
+    assert abs(summary['avg_bookings'] - 1.2) < 0.05
+    by_channel = sketches.unique('customer_id', 'booking_channel')
+    assert by_channel.index.tolist() == ['App', 'Web']
@@ -0,0 +1,44 @@
+import matplotlib.pyplot as plt
+import pandas as pd
+
+from booking_charts import build_payload, load_payload, panel_key, panel_series, render_chart, save_payload
+
+SPEC = {
+    'title': 'Test', 'figsize': (6, 4), 'grid': (1, 3),
+    'panels': [
+        {'kind': 'bar', 'data': ('booking_channel', 'cancellation_rate'), 'sort': True, 'value_labels': '{:.0f}%'},
+        {'kind': 'pie', 'data': 'booking_status_split'},
+        {'kind': 'hist', 'data': 'selling_price', 'bins': 4, 'scale': 1000, 'mean_label': 'Mean: {:.1f}K'},
+    ],
+}
+
+
+def sample_frame():
+    return pd.DataFrame({
+        'booking_channel': ['Web', 'Web', 'App', 'Agent', 'App', 'Web'],
+        'booking_status': ['Cancelled', 'Confirmed', 'Cancelled', 'Confirmed', 'Completed', 'Confirmed'],
+        'selling_price': [1000.0, 2000.0, 3000.0, 4000.0, None, 6000.0],
+    })
+
+
+def test_payload_holds_each_panel_input():
+    payload = build_payload(sample_frame(), [SPEC])
+
+    assert set(payload) == {'booking_channel.cancellation_rate', 'booking_status_split', 'selling_price:hist4'}
+    rates = panel_series(SPEC['panels'][0], payload[panel_key(SPEC['panels'][0])])
+    assert rates.index.tolist() == ['App', 'Web', 'Agent']
+    assert payload['booking_status_split']['values'] == [4, 2]
+    histogram = payload['selling_price:hist4']
+    assert sum(histogram['counts']) == 5 and histogram['mean'] == 3200.0
+
+
+def test_charts_render_from_a_saved_payload_alone(tmp_path):
+    save_payload(build_payload(sample_frame(), [SPEC]), tmp_path / 'payload.json')
+    payload = load_payload(tmp_path / 'payload.json')
+
+    fig = render_chart(SPEC, payload, figsize=(9, 3))
+    assert tuple(fig.get_size_inches()) == (9, 3)
+    bars, _, hist = fig.axes
+    assert [text.get_text() for text in bars.texts] == ['50%', '33%', '0%']
+    assert hist.get_legend().get_texts()[0].get_text() == 'Mean: 3.2K'
+    plt.close(fig)
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+from booking_cohorts import cohort_counts, cohort_retention, pooled_retention
+
+
+def sample_frame():
+    return pd.DataFrame({
+        'customer_id': [1, 1, 1, 2, 2, 3, 3, 4, 1],
+        'booking_date': pd.to_datetime(['2023-01-05', '2023-02-10', '2023-02-20', '2023-01-20', '2023-03-01',
+                                        '2023-02-03', '2023-03-30', '2023-03-15', '2023-01-09']),
+    })
+
+
+def test_counts_distinct_customers_per_cohort_and_offset():
+    counts = cohort_counts(sample_frame())
+
+    assert counts.index.tolist() == [pd.Timestamp('2023-01-01'), pd.Timestamp('2023-02-01'),
+                                     pd.Timestamp('2023-03-01')]
+    # Customer 1 books twice in February but is counted once
+    assert counts.loc['2023-01-01'].tolist() == [2, 1, 1]
+    assert counts.loc['2023-02-01'].tolist() == [1, 1, 0]
+    assert counts.loc['2023-03-01'].tolist() == [1, 0, 0]
+
+
+def test_retention_leaves_unreached_offsets_unknown():
+    retention, sizes = cohort_retention(sample_frame())
+
+    assert sizes.tolist() == [2, 1, 1]
+    assert retention.loc['2023-01-01'].tolist() == [100.0, 50.0, 50.0]
+    assert retention.loc['2023-02-01', 1] == 100.0
+    assert np.isnan(retention.loc['2023-02-01', 2])
+    assert pooled_retention(cohort_counts(sample_frame()))[1] == 2 / 3 * 100
+
+
+def test_weekly_cohorts_start_on_monday():
+    counts = cohort_counts(sample_frame(), 'W', max_offset=2)
+
+    assert counts.index[0] == pd.Timestamp('2023-01-02')
+    assert counts.columns.tolist() == [0, 1, 2]
+    # Customer 1 books in weeks 0 and +1 (2023-01-05 and 2023-01-09)
+    assert counts.iloc[0].tolist() == [1, 1, 0]
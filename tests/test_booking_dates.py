@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+
+from booking_dates import (NAT_ORDINAL, detect_date_format, ordinals_to_datetime,
+                           parse_date_column, parse_date_ordinals)
+
+
+def test_detect_date_format_prefers_unambiguous_match():
+    assert detect_date_format(['2023-01-05', '2023-12-31']) == '%Y-%m-%d'
+    assert detect_date_format(['05/01/2023', '31/12/2023']) == '%d/%m/%Y'
+    assert detect_date_format(['01/05/2023', '12/31/2023']) == '%m/%d/%Y'
+
+
+def test_parse_date_ordinals_maps_codes_and_missing():
+    values = pd.Series(['2023-01-01', None, '2023-01-02', '2023-01-01'])
+
+    ordinals = parse_date_ordinals(values)
+
+    assert ordinals.dtype == np.int32
+    assert ordinals.tolist() == [19358, NAT_ORDINAL, 19359, 19358]
+
+
+def test_parse_date_column_returns_datetime_view():
+    values = pd.Series(['31-12-2023', '01-01-2024', None], dtype='category', name='booking_date')
+
+    parsed = parse_date_column(values)
+
+    assert parsed.name == 'booking_date'
+    assert parsed.iloc[0] == pd.Timestamp('2023-12-31')
+    assert pd.isna(parsed.iloc[2])
+    assert np.isnat(ordinals_to_datetime(np.array([NAT_ORDINAL], dtype='int32'))[0])
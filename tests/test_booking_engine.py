@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from booking_engine import Aggregate, aggregate, available_requests
+
+
+def sample_bookings():
+    return pd.DataFrame({
+        'booking_channel': pd.Categorical(['Web', 'App', 'Web', None, 'Web', 'App'],
+                                          categories=['Agent', 'App', 'Web']),
+        'star_rating': [3, 4, 4, 5, 3, 4],
+        'selling_price': [100.0, 200.0, np.nan, 400.0, 500.0, 600.0],
+        'booking_status': pd.Categorical(['Confirmed', 'Cancelled', 'Confirmed',
+                                          'Cancelled', 'Completed', 'Confirmed']),
+    })
+
+
+def test_aggregate_matches_groupby():
+    df = sample_bookings()
+    requests = [Aggregate('booking_channel', 'count'),
+                Aggregate('booking_channel', 'sum', 'selling_price'),
+                Aggregate('booking_channel', 'mean', 'selling_price'),
+                Aggregate('star_rating', 'cancellation_rate'),
+                Aggregate('star_rating', 'cancelled')]
+    results = aggregate(df, requests)
+
+    # Unobserved categories and missing keys are dropped, as with groupby(observed=True)
+    counts = results[requests[0]]
+    assert counts.to_dict() == {'App': 2, 'Web': 3}
+    assert results[requests[1]].to_dict() == {'App': 800.0, 'Web': 600.0}
+    assert results[requests[2]]['Web'] == 300.0
+
+    rates = results[requests[3]]
+    assert rates.index.tolist() == [3, 4, 5]
+    assert rates[4] == pytest.approx(100 / 3)
+    assert results[requests[4]].to_dict() == {3: 0, 4: 1, 5: 1}
+
+
+def test_available_requests_and_unknown_statistic():
+    requests = [Aggregate('star_rating', 'count'), Aggregate('star_rating', 'cancellation_rate'),
+                Aggregate('room_type', 'count')]
+    assert available_requests(requests, ['star_rating']) == requests[:1]
+
+    with pytest.raises(ValueError):
+        aggregate(sample_bookings(), [Aggregate('star_rating', 'median', 'selling_price')])
@@ -0,0 +1,47 @@
+import pandas as pd
+
+import booking_features
+from booking_features import FeatureStore, derive_features, source_inputs
+
+
+def sample_bookings():
+    return pd.DataFrame({
+        'booking_date': pd.to_datetime(['2023-01-05', '2023-06-10', '2023-12-15']),
+        'check_in_date': pd.to_datetime(['2023-01-20', '2023-06-12', '2024-04-01']),
+        'selling_price': [100.0, 200.0, 300.0],
+    })
+
+
+def test_features_are_lazy_and_memoised(monkeypatch):
+    calls = []
+    original = booking_features.FEATURES['booking_lead_time']
+    counted = original._replace(compute=lambda *args: calls.append(1) or original.compute(*args))
+    monkeypatch.setitem(booking_features.FEATURES, 'booking_lead_time', counted)
+
+    df = sample_bookings()
+    store = FeatureStore(df)
+    assert calls == []
+
+    bins = store['lead_time_bin']
+    assert bins.tolist() == ['8-30 days', '0-7 days', '90+ days']
+    store['booking_lead_time']
+    assert calls == [1]
+    assert 'lead_time_bin' not in df.columns
+
+
+def test_replacing_an_input_invalidates_dependents():
+    store = FeatureStore(sample_bookings())
+    assert store['booking_season'].tolist() == ['Winter', 'Summer', 'Winter']
+
+    store.replace('booking_date', pd.to_datetime(['2023-04-01', '2023-06-10', '2023-12-15']))
+    assert store['booking_month'].tolist() == [4, 6, 12]
+    assert store['booking_season'].tolist() == ['Spring', 'Summer', 'Winter']
+
+
+def test_derive_features_skips_missing_inputs():
+    df = derive_features(sample_bookings(), ['booking_lead_time', 'stay_duration', 'booking_season'])
+
+    assert df['booking_lead_time'].tolist() == [15, 2, 108]
+    assert 'stay_duration' not in df.columns
+    assert 'booking_season' in df.columns
+    assert source_inputs('booking_season') == ['booking_date']
@@ -0,0 +1,41 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from booking_histogram import Histogram, column_histogram
+
+
+def test_chunked_partials_merge_to_the_single_pass_histogram():
+    rng = np.random.default_rng(3)
+    values = np.concatenate([rng.normal(20, 8, 200_000), -rng.lognormal(3, 1, 50_000), [np.nan, np.inf]])
+
+    whole = column_histogram(values, chunk_rows=64_000)
+    parts = [Histogram() for _ in range(3)]
+    for i, chunk in enumerate(np.array_split(values, 29)):
+        parts[i % 3].update(chunk)
+    # Histograms must survive the trip to and from worker processes
+    merged = pickle.loads(pickle.dumps(parts[0]))
+    for part in parts[1:]:
+        merged.merge(part)
+
+    assert merged.count == whole.count == 250_000
+    assert (merged.width, merged.offset) == (whole.width, whole.offset)
+    assert np.array_equal(merged.counts, whole.counts)
+    finite = values[np.isfinite(values)]
+    assert merged.mean() == pytest.approx(finite.mean())
+    assert abs(merged.median() - np.median(finite)) <= merged.width
+
+    counts, edges = merged.bars(30)
+    assert len(counts) <= 30 and counts.sum() == merged.count
+    assert edges[0] <= finite.min() and edges[-1] >= finite.max()
+
+
+def test_fixed_edges_count_values_outside_them():
+    histogram = Histogram(edges=[0, 10, 20]).update([-5, 1, 2, 15, 25, np.nan])
+
+    assert histogram.counts.tolist() == [2, 1]
+    assert (histogram.below, histogram.above, histogram.count) == (1, 1, 5)
+    assert histogram.median() == pytest.approx(7.5)
+    with pytest.raises(ValueError):
+        histogram.merge(Histogram())
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+import booking_cache
+from booking_imputer import BookingImputer, MissingMasks
+
+
+def sample_frame():
+    return pd.DataFrame({
+        'check_in_date': pd.to_datetime(['2023-01-20', None, '2023-01-20', '2023-03-20']),
+        'booking_channel': pd.Categorical(['Web', 'App', None, 'Web']),
+        'selling_price': [100.0, np.nan, 300.0, 400.0],
+        'city': ['Goa', 'Pune', 'Goa', None],
+    })
+
+
+def test_fit_learns_median_and_modes():
+    imputer = BookingImputer().fit(sample_frame())
+
+    assert imputer.fill_values['selling_price'] == {'kind': 'numeric', 'value': 300.0}
+    assert imputer.fill_values['booking_channel']['value'] == 'Web'
+    assert imputer.fill_values['check_in_date']['value'] == '2023-01-20'
+    assert imputer.fill_values['city']['value'] == 'Goa'
+
+
+def test_saved_imputer_fills_a_new_batch_without_refitting(tmp_path):
+    path = tmp_path / 'imputer.json'
+    BookingImputer().fit(sample_frame()).save(path)
+
+    batch = pd.DataFrame({
+        'check_in_date': pd.to_datetime([None, '2024-05-01']),
+        'booking_channel': pd.Categorical([None, 'Agent']),
+        'selling_price': [np.nan, 5.0],
+        'city': [None, 'Delhi'],
+    })
+    BookingImputer.load(path).transform(batch)
+
+    assert batch['check_in_date'].iloc[0] == pd.Timestamp('2023-01-20')
+    assert batch['booking_channel'].tolist() == ['Web', 'Agent']
+    assert batch['selling_price'].tolist() == [300.0, 5.0]
+    assert batch['city'].tolist() == ['Goa', 'Delhi']
+
+
+def test_missing_masks_pack_and_combine_columns():
+    masks = MissingMasks.from_frame(sample_frame())
+
+    assert masks.bits.dtype == np.uint8
+    assert masks.counts() == {'check_in_date': 1, 'booking_channel': 1, 'selling_price': 1, 'city': 1}
+    assert masks.mask('check_in_date', 'booking_channel').tolist() == [False, True, True, False]
+    assert masks.count('check_in_date', 'selling_price') == 1
+    assert masks.count('missing_column') == 0
+
+
+def test_cache_keeps_masks_and_imputer(tmp_path):
+    path = tmp_path / 'bookings.csv'
+    pd.DataFrame({
+        'customer_id': [101, 102, 103],
+        'booking_date': ['2023-01-05', '2023-02-10', '2023-03-15'],
+        'check_in_date': ['2023-01-20', None, '2023-03-20'],
+        'check_out_date': ['2023-01-22', '2023-02-14', None],
+        'selling_price': [25000, 41000, 18000],
+    }).to_csv(path, index=False)
+    cache_dir = tmp_path / 'cache'
+
+    df = booking_cache.load_clean_bookings(path, cache_dir=cache_dir)
+    masks = booking_cache.load_missing_masks(path, cache_dir=cache_dir)
+
+    assert df['check_in_date'].notna().all()
+    assert masks.mask('check_in_date', 'check_out_date').tolist() == [False, True, True]
+    assert booking_cache.load_imputer(path, cache_dir=cache_dir).fill_values['selling_price']['value'] == 25000
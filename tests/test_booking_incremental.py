@@ -0,0 +1,73 @@
+import pandas as pd
+
+from booking_incremental import refresh_aggregates
+
+
+def write_rows(path, rows, mode='w'):
+    pd.DataFrame(rows).to_csv(path, index=False, mode=mode, header=(mode == 'w'))
+
+
+def booking(customer, day, status='Confirmed', price=100):
+    return {'customer_id': customer, 'booking_date': f'2023-01-{day:02d}',
+            'booking_channel': 'Web', 'selling_price': price, 'booking_status': status}
+
+
+def test_refresh_ingests_only_appended_rows(tmp_path):
+    path = tmp_path / 'bookings.csv'
+    write_rows(path, [booking(1, 1), booking(2, 2, 'Cancelled')])
+
+    checkpoint, new_rows = refresh_aggregates(path, cache_dir=tmp_path / 'cache', exact_customers=True)
+    assert new_rows == 2
+
+    write_rows(path, [booking(1, 9, price=300)], mode='a')
+    checkpoint, new_rows = refresh_aggregates(path, cache_dir=tmp_path / 'cache', exact_customers=True)
+
+    assert new_rows == 1
+    assert checkpoint.rows == checkpoint.aggregates.rows == 3
+    assert checkpoint.aggregates.cancelled_total == 1
+    assert checkpoint.aggregates.customer_spend[1] == 400
+    assert str(checkpoint.last_booking_date) == '2023-01-09'
+
+    _, new_rows = refresh_aggregates(path, cache_dir=tmp_path / 'cache', exact_customers=True)
+    assert new_rows == 0
+
+
+def test_partial_last_line_waits_for_next_refresh(tmp_path):
+    path = tmp_path / 'bookings.csv'
+    write_rows(path, [booking(1, 1)])
+    with open(path, 'a') as handle:
+        handle.write('2,2023-01-02,Web,')
+
+    checkpoint, new_rows = refresh_aggregates(path, cache_dir=tmp_path / 'cache', chunksize=1)
+    assert new_rows == 1
+
+    with open(path, 'a') as handle:
+        handle.write('200,Confirmed\n')
+    write_rows(path, [booking(3, 3, price=50)], mode='a')
+    checkpoint, new_rows = refresh_aggregates(path, cache_dir=tmp_path / 'cache', chunksize=1)
+
+    assert new_rows == 2
+    assert checkpoint.aggregates.sums['selling_price'] == 350
+
+
+def test_rewritten_source_rebuilds_checkpoint(tmp_path):
+    path = tmp_path / 'bookings.csv'
+    write_rows(path, [booking(1, 1), booking(2, 2)])
+    refresh_aggregates(path, cache_dir=tmp_path / 'cache')
+
+    write_rows(path, [booking(3, 3, price=500), booking(4, 4), booking(5, 5)])
+    checkpoint, new_rows = refresh_aggregates(path, cache_dir=tmp_path / 'cache')
+
+    assert new_rows == 3
+    assert checkpoint.aggregates.sums['selling_price'] == 700
+
+
+def test_checkpoint_from_other_code_is_rebuilt(tmp_path, monkeypatch):
+    path = tmp_path / 'bookings.csv'
+    write_rows(path, [booking(1, 1), booking(2, 2)])
+    refresh_aggregates(path, cache_dir=tmp_path / 'cache')
+
+    monkeypatch.setattr('booking_incremental.checkpoint_version', lambda: 'changed')
+    checkpoint, new_rows = refresh_aggregates(path, cache_dir=tmp_path / 'cache')
+
+    assert new_rows == 2 and checkpoint.rows == 2
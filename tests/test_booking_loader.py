@@ -0,0 +1,52 @@
+import pandas as pd
+
+from booking_loader import load_bookings, memory_report
+
+
+def write_sample(path):
+    pd.DataFrame({
+        'customer_id': [101, 102, 101],
+        'city': ['Goa', 'Delhi', 'Goa'],
+        'star_rating': [4, 5, 3],
+        'booking_date': ['2023-01-05', '2023-02-10', '2023-03-15'],
+        'check_in_date': ['2023-01-20', None, '2023-03-20'],
+        'booking_channel': ['Web', 'App', 'Web'],
+        'selling_price': [25000, 41000, 18000],
+        'cashback': [0.0, 100.0, 250.5],
+        'booking_status': ['Confirmed', 'Cancelled', 'Completed'],
+    }).to_csv(path, index=False)
+
+
+def test_load_bookings_applies_schema(tmp_path):
+    path = tmp_path / 'bookings.csv'
+    write_sample(path)
+
+    df = load_bookings(path)
+
+    assert df['city'].dtype == 'category'
+    assert df['booking_status'].dtype == 'category'
+    assert df['star_rating'].dtype == 'int8'
+    assert df['selling_price'].dtype == 'int32'
+    assert df['cashback'].dtype == 'float32'
+    assert pd.api.types.is_datetime64_any_dtype(df['booking_date'])
+    assert df['check_in_date'].isna().sum() == 1
+
+
+def test_load_bookings_projects_columns(tmp_path):
+    path = tmp_path / 'bookings.csv'
+    write_sample(path)
+
+    df = load_bookings(path, columns=['booking_channel', 'selling_price'])
+
+    assert list(df.columns) == ['booking_channel', 'selling_price']
+
+
+def test_memory_report_returns_total(tmp_path, capsys):
+    path = tmp_path / 'bookings.csv'
+    write_sample(path)
+    df = load_bookings(path)
+
+    total = memory_report(df)
+
+    assert total == df.memory_usage(deep=True, index=False).sum()
+    assert 'selling_price' in capsys.readouterr().out
@@ -0,0 +1,33 @@
+import pandas as pd
+import pytest
+
+from booking_metrics import cancellation_flags, cancellation_rates, overall_cancellation_rate
+
+
+def sample_bookings():
+    return pd.DataFrame({
+        'booking_channel': ['Web', 'App', 'Web', 'App', 'Web'],
+        'star_rating': [3, 3, 4, 4, 4],
+        'booking_status': pd.Categorical(['Confirmed', 'Cancelled', 'cancelled by guest',
+                                          None, 'Completed']),
+    })
+
+
+def test_cancellation_flags_classify_each_status_once():
+    flags = cancellation_flags(sample_bookings()['booking_status'])
+
+    assert flags.dtype == 'int8'
+    assert flags.tolist() == [0, 1, 1, 0, 0]
+
+
+def test_cancellation_rates_single_and_multi_key():
+    df = sample_bookings()
+
+    by_channel = cancellation_rates(df, 'booking_channel')
+    by_both = cancellation_rates(df, ['booking_channel', 'star_rating'])
+    by_bin = cancellation_rates(df, pd.cut(df['star_rating'], bins=[0, 3, 5], labels=['low', 'high']))
+
+    assert by_channel.to_dict() == pytest.approx({'App': 50.0, 'Web': 100 / 3})
+    assert by_both[('Web', 4)] == 50.0
+    assert by_bin.to_dict() == pytest.approx({'low': 50.0, 'high': 100 / 3})
+    assert overall_cancellation_rate(df['booking_status']) == 40.0
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+from booking_occupancy import OccupancyCalendar
+
+
+def sample_frame():
+    return pd.DataFrame({
+        'property_id': [1, 1, 2, 2, 1, 2],
+        'city': ['Goa', 'Goa', 'Pune', 'Pune', 'Goa', None],
+        'check_in_date': pd.to_datetime(['2023-01-01', '2023-01-02', '2023-01-03', '2023-01-01',
+                                         None, '2023-01-01']),
+        'check_out_date': pd.to_datetime(['2023-01-03', '2023-01-05', '2023-01-04', '2023-01-01',
+                                          '2023-01-04', '2023-01-02']),
+        'num_rooms_booked': [2, 1, 3, 5, 1, 4],
+        'booking_status': ['Confirmed', 'Cancelled', 'Confirmed', 'Confirmed', 'Confirmed', 'Confirmed'],
+    })
+
+
+def exploded_nights(df, by):
+    """Reference: one row per night of every stay"""
+    rows = []
+    for _, row in df.dropna(subset=['check_in_date', 'check_out_date', by]).iterrows():
+        for night in pd.date_range(row['check_in_date'], row['check_out_date'] - pd.Timedelta(days=1)):
+            rows.append((night, row[by], row['num_rooms_booked']))
+    nights = pd.DataFrame(rows, columns=['night', by, 'rooms'])
+    return nights.pivot_table(index='night', columns=by, values='rooms', aggfunc='sum', fill_value=0)
+
+
+def test_difference_arrays_match_exploded_stays():
+    df = sample_frame()
+    nightly = OccupancyCalendar.from_frame(df).nightly()
+
+    expected = exploded_nights(df, 'property_id')
+    assert nightly.index.tolist() == expected.index.tolist()
+    np.testing.assert_array_equal(nightly.to_numpy(), expected.to_numpy())
+
+
+def test_cancelled_and_excluded_stays_are_left_out():
+    df = sample_frame()
+
+    kept = OccupancyCalendar.from_frame(df, exclude_cancelled=True)
+    assert kept.room_nights().tolist() == [4, 7]
+
+    imputed = np.array([False, False, True, False, False, False])
+    assert OccupancyCalendar.from_frame(df, exclude=imputed).room_nights().tolist() == [7, 4]
+
+
+def test_city_totals_and_pressure():
+    calendar = OccupancyCalendar.from_frame(sample_frame(), by='city')
+
+    assert calendar.total().tolist() == [2, 3, 4, 1]
+    pressure = calendar.pressure()
+    assert calendar.nightly()['Goa'].tolist() == [2, 3, 1, 1]
+    assert pressure['Goa'].iloc[1] == 100.0
+    assert pressure['Pune'].tolist() == [0.0, 0.0, 100.0, 0.0]
+    assert calendar.pressure(pd.Series({'Goa': 4, 'Pune': 6}))['Pune'].iloc[2] == 50.0
@@ -0,0 +1,50 @@
+import pandas as pd
+
+from booking_partitions import aggregate_partitions, load_clean_partitions, resolve_partitions
+
+
+def write_partitions(directory):
+    rows = pd.DataFrame({
+        'customer_id': [1, 2, 1, 3],
+        'city': ['Goa', 'Delhi', 'Pune', 'Goa'],
+        'booking_date': ['2023-01-05', '2023-01-06', '2023-02-01', '2023-02-02'],
+        'booking_channel': ['Web', 'App', 'Web', 'Agent'],
+        'selling_price': [100, 200, 300, 400],
+        'booking_status': ['Confirmed', 'Cancelled', 'Confirmed', 'Confirmed'],
+    })
+    rows.iloc[:2].to_csv(directory / 'bookings_2023_01.csv', index=False)
+    rows.iloc[2:].to_csv(directory / 'bookings_2023_02.csv', index=False)
+
+
+def test_resolve_partitions_accepts_directory_and_glob(tmp_path):
+    write_partitions(tmp_path)
+
+    assert resolve_partitions(tmp_path) == resolve_partitions(tmp_path / '*.csv')
+    assert len(resolve_partitions(tmp_path)) == 2
+
+
+def test_aggregate_partitions_reduces_worker_results(tmp_path):
+    write_partitions(tmp_path)
+
+    aggregates = aggregate_partitions(resolve_partitions(tmp_path), workers=2, exact_customers=True)
+
+    assert aggregates.rows == 4
+    assert aggregates.cancelled_total == 1
+    assert aggregates.counts['booking_month'].to_dict() == {1: 2, 2: 2}
+    assert aggregates.customer_spend[1] == 400
+
+    sketched = aggregate_partitions(resolve_partitions(tmp_path), workers=2)
+    assert sketched.customer_summary() == aggregates.customer_summary()
+
+
+def test_load_clean_partitions_keeps_categories(tmp_path):
+    write_partitions(tmp_path)
+
+    df = load_clean_partitions(resolve_partitions(tmp_path), workers=2, cache_dir=tmp_path / 'cache')
+
+    assert len(df) == 4
+    assert df['booking_date'].dt.month.tolist() == [1, 1, 2, 2]
+    # Staged column files are removed once the frame is assembled
+    assert list((tmp_path / 'cache').iterdir()) == []
+    assert df['city'].dtype == 'category'
+    assert sorted(df['city'].cat.categories) == ['Delhi', 'Goa', 'Pune']
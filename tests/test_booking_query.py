@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from booking_query import BitmapIndex, Q, filter_bookings, parse_filter, where
+
+
+def sample_frame():
+    return pd.DataFrame({
+        'city': pd.Categorical(['Goa', 'Pune', 'Goa', 'Delhi', 'Goa', None, 'Pune', 'Goa', 'Goa']),
+        'star_rating': [4, 5, 3, 5, 5, 4, 4, 2, 4],
+        'booking_channel': pd.Categorical(['App', 'Web', 'App', 'App', 'Web', 'App', 'App', 'App', 'Agent']),
+        'booking_month': [10, 11, 12, 1, 11, 10, 12, 10, 10],
+        'selling_price': np.arange(9) * 100.0,
+    })
+
+
+def test_conjunction_matches_boolean_filtering():
+    df = sample_frame()
+    index = BitmapIndex.from_frame(df)
+    query = where(city='Goa', star_rating=[4, 5], booking_month=[10, 11, 12])
+
+    expected = df['city'].eq('Goa') & df['star_rating'].isin([4, 5]) & df['booking_month'].isin([10, 11, 12])
+    assert index.select(query).tolist() == np.flatnonzero(expected).tolist()
+    assert index.count(query) == 3
+
+
+def test_or_and_not_respect_row_count():
+    index = BitmapIndex.from_frame(sample_frame())
+
+    query = (Q('city', 'Delhi') | Q('booking_channel', 'Web')) & ~Q('star_rating', 4)
+    assert index.select(query).tolist() == [1, 3, 4]
+    # Padding bits past the ninth row must not be counted after a NOT
+    assert index.count(~Q('city', 'Goa')) == 4
+
+
+def test_cli_filters_match_labels_by_text():
+    df = sample_frame()
+    query = parse_filter('star_rating=5|city=Delhi') & parse_filter('booking_channel=App')
+
+    subset, rows = filter_bookings(df, query)
+    assert rows.tolist() == [3]
+    assert subset['selling_price'].tolist() == [300.0]
+    assert BitmapIndex.from_frame(df).count(Q('city', 'Mumbai')) == 0
+
+
+def test_strict_filters_reject_unknown_columns_and_values():
+    df = sample_frame()
+    query = parse_filter('city=Goa,Pnue') & parse_filter('star_rating=4')
+    assert query.columns() == ['city', 'star_rating']
+
+    with pytest.raises(ValueError, match='Pnue'):
+        filter_bookings(df, query, strict=True)
+    with pytest.raises(ValueError, match='room_type'):
+        filter_bookings(df, Q('room_type', 'Suite'), strict=True)
+    with pytest.raises(ValueError):
+        parse_filter('city')
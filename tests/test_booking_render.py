@@ -0,0 +1,108 @@
+import matplotlib
+import matplotlib.pyplot as plt
+
+from booking_render import RenderCache, Renderer, preview_requested
+
+
+def line_figure(values):
+    fig, ax = plt.subplots()
+    ax.plot(values)
+    return fig
+
+
+def test_batch_mode_renders_the_queue_in_order_and_frees_figures(tmp_path):
+    renderer = Renderer(interactive=False, workers=1, cache=False)
+    assert matplotlib.get_backend().lower() == 'agg'
+
+    paths = [tmp_path / 'first.png', tmp_path / 'second.png']
+    for i, path in enumerate(paths):
+        renderer.submit(path, line_figure, [i, i + 1], dpi=50)
+    records = renderer.run()
+
+    assert [record.path for record in records] == paths
+    assert all(path.exists() for path in paths)
+    assert plt.get_fignums() == []
+    assert not renderer.queue
+    assert all(record.seconds >= 0 and record.peak_rss_mb > 0 for record in records)
+
+
+def test_finish_closes_a_drawn_figure(tmp_path):
+    renderer = Renderer(interactive=False, workers=1, cache=False)
+    fig = line_figure([1, 2, 3])
+    record = renderer.finish(fig, tmp_path / 'chart.png', dpi=50)
+
+    assert record in renderer.records
+    assert not plt.fignum_exists(fig.number)
+
+
+def test_worker_pool_renders_queued_and_drawn_figures(tmp_path):
+    renderer = Renderer(interactive=False, workers=2, cache=False)
+    drawn = line_figure([3, 2, 1])
+    assert renderer.finish(drawn, tmp_path / 'drawn.png', dpi=50) is None
+    assert not plt.fignum_exists(drawn.number)
+
+    paths = [tmp_path / f'queued{i}.png' for i in range(3)]
+    for i, path in enumerate(paths):
+        renderer.submit(path, line_figure, [i, i * 2], dpi=50)
+    records = renderer.run()
+
+    # Pickled figures and queued builders come back in submission order
+    assert [record.path for record in records] == [tmp_path / 'drawn.png'] + paths
+    assert all(record.path.exists() for record in records)
+    assert renderer.pool is None and renderer.records == records
+    assert plt.get_fignums() == []
+
+
+def test_render_cache_reuses_unchanged_figures(tmp_path, capsys):
+    path = tmp_path / 'chart.png'
+    first = Renderer(interactive=False, workers=1, cache=RenderCache(tmp_path / 'cache'))
+    first.submit(path, line_figure, [1, 2], dpi=50)
+    assert not first.run()[0].cached
+    path.unlink()
+
+    cache = RenderCache(tmp_path / 'cache')
+    second = Renderer(interactive=False, workers=1, cache=cache)
+    second.submit(path, line_figure, [1, 2], dpi=50)
+    second.submit(tmp_path / 'other.png', line_figure, [2, 1], dpi=50)
+    records = second.run()
+    assert [record.cached for record in records] == [True, False]
+    assert path.exists() and (cache.hits, cache.misses) == (1, 1)
+    # Different inputs or savefig options give a different key
+    assert cache.key('payload', {'dpi': 50}) != cache.key('payload', {'dpi': 100})
+    assert cache.key('payload', {'dpi': 50}) != cache.key('other', {'dpi': 50})
+
+    drawn = line_figure([1, 2])
+    assert second.finish(drawn, tmp_path / 'drawn.png', inputs=('digest', 'chart'), dpi=50).cached is False
+    assert second.finish(line_figure([1, 2]), tmp_path / 'drawn.png', inputs=('digest', 'chart'), dpi=50).cached
+    second.report()
+    assert 'Render cache: 2 hits, 2 misses' in capsys.readouterr().out
+
+
+def test_wall_time_covers_pool_rendering_only(tmp_path):
+    path = tmp_path / 'chart.png'
+    first = Renderer(interactive=False, workers=1, cache=RenderCache(tmp_path / 'cache'))
+    first.submit(path, line_figure, [1, 2], dpi=50)
+    first.run()
+
+    # Cache hits alone never start the pool, so no wall time is reported
+    renderer = Renderer(interactive=False, workers=2, cache=RenderCache(tmp_path / 'cache'))
+    renderer.submit(path, line_figure, [1, 2], dpi=50)
+    assert renderer.run()[0].cached
+    assert renderer.started is None and renderer.wall_seconds == 0
+
+    renderer.submit(tmp_path / 'other.png', line_figure, [2, 1], dpi=50)
+    renderer.run()
+    assert renderer.started is None and renderer.wall_seconds > 0
+
+
+def test_previews_render_in_this_process():
+    assert Renderer(interactive=False, workers=1).workers == 1
+    assert Renderer(interactive=True, workers=4).workers == 1
+
+
+def test_preview_is_requested_by_flag_or_environment(monkeypatch):
+    monkeypatch.delenv('BOOKING_PREVIEW', raising=False)
+    assert preview_requested(['--preview'])
+    assert not preview_requested([])
+    monkeypatch.setenv('BOOKING_PREVIEW', '1')
+    assert preview_requested([])
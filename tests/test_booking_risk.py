@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+from booking_risk import (CancellationModel, category_codes, fit_cancellation_model, open_reservations,
+                          roc_auc, score_open_reservations)
+
+
+def synthetic_bookings(rows=4000, seed=0):
+    """Bookings whose cancellations depend on lead time and channel"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'booking_lead_time': rng.integers(0, 120, rows).astype(float),
+        'stay_duration': rng.integers(1, 10, rows).astype(float),
+        'star_rating': rng.integers(1, 6, rows),
+        'booking_channel': pd.Categorical(rng.choice(['Web', 'App', 'Agent'], rows)),
+        'room_type': rng.choice(['Standard', 'Deluxe'], rows),
+        'payment_method': rng.choice(['UPI', 'Card'], rows),
+        'Coupon USed?': rng.choice(['Yes', 'No'], rows),
+    })
+    log_odds = -2 + df['booking_lead_time'] / 40 + 1.5 * (df['booking_channel'] == 'Agent')
+    cancelled = rng.random(rows) < 1 / (1 + np.exp(-log_odds.to_numpy()))
+    df['booking_status'] = np.where(cancelled, 'Cancelled', 'Completed')
+    df.loc[df.index[-500:], 'booking_status'] = 'Confirmed'
+    return df
+
+
+def test_model_recovers_the_risk_drivers():
+    df = synthetic_bookings()
+    model = fit_cancellation_model(df)
+
+    coefficients = model.coefficients()
+    assert coefficients['booking_lead_time'] > 0.5
+    assert coefficients['booking_channel=Agent'] > coefficients['booking_channel=Web']
+    settled = df.iloc[:-500]
+    assert roc_auc(settled['booking_status'] == 'Cancelled', model.predict_proba(settled)) > 0.75
+
+
+def test_open_reservations_are_scored_and_models_round_trip(tmp_path):
+    df = synthetic_bookings()
+    model = fit_cancellation_model(df)
+
+    risk = score_open_reservations(model, df)
+    assert risk.index.tolist() == df.index[-500:].tolist()
+    assert ((risk > 0) & (risk < 1)).all()
+
+    model.save(tmp_path / 'model.json')
+    loaded = CancellationModel.load(tmp_path / 'model.json')
+    np.testing.assert_allclose(loaded.predict_proba(df), model.predict_proba(df))
+    # Batches give the same scores as one pass
+    np.testing.assert_allclose(model.predict_proba(df, batch_size=333), model.predict_proba(df))
+
+
+def test_unseen_and_missing_categories_share_the_last_slot():
+    values = pd.Series(['Web', None, 'Fax', 'App'])
+    assert category_codes(values, ['App', 'Web']).tolist() == [1, 2, 2, 0]
+    assert category_codes(values.astype('category'), ['App', 'Web']).tolist() == [1, 2, 2, 0]
+    assert open_reservations(pd.Series(['Confirmed', 'Cancelled', 'Completed'])).tolist() == [True, False, False]
@@ -0,0 +1,48 @@
+import pandas as pd
+
+from booking_aggregates import BookingAggregates
+from booking_scorecards import ScorecardTable, build_scorecards
+
+
+def sample_frame():
+    return pd.DataFrame({
+        'property_id': [7, 3, 7, 3, 9],
+        'city': pd.Categorical(['Goa', 'Pune', 'Goa', 'Pune', 'Goa']),
+        'selling_price': [100.0, 200.0, 300.0, 400.0, 500.0],
+        'costprice': [80.0, 150.0, 240.0, 300.0, 450.0],
+        'booking_status': pd.Categorical(['Confirmed', 'Cancelled', 'Confirmed', 'Confirmed', 'Cancelled']),
+    })
+
+
+def test_table_is_sorted_and_looked_up_by_key():
+    table = ScorecardTable.from_frame(sample_frame(), 'property_id')
+
+    assert table.frame().index.tolist() == [3, 7, 9]
+    metrics = table.lookup(7)
+    assert metrics['bookings'] == 2
+    assert metrics['revenue'] == 400.0
+    assert metrics['avg_booking_value'] == 200.0
+    assert metrics['profit_margin'] == 20.0
+    assert metrics['cancellation_rate'] == 0.0
+    assert table.lookup(3)['cancellation_rate'] == 50.0
+    assert table.lookup(42) is None
+
+
+def test_incremental_update_matches_a_full_rebuild():
+    df = sample_frame()
+    table = ScorecardTable.from_frame(df.iloc[:2], 'city')
+    table.update(df.iloc[2:])
+
+    full = ScorecardTable.from_frame(df, 'city')
+    pd.testing.assert_frame_equal(table.frame(), full.frame())
+    assert table.lookup('Goa')['bookings'] == 3
+
+
+def test_scorecards_merge_through_aggregates():
+    df = sample_frame()
+    merged = BookingAggregates().update(df.iloc[:3]).merge(BookingAggregates().update(df.iloc[3:]))
+    expected = build_scorecards(df)
+
+    assert set(merged.scorecards) == {'property_id', 'city'}
+    for key, table in expected.items():
+        pd.testing.assert_frame_equal(merged.scorecards[key].frame(), table.frame())
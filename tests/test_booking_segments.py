@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from booking_segments import segment_customers
+
+
+def sample_bookings():
+    return pd.DataFrame({
+        'customer_id': [3, 1, 2, 1, 3, 1, 4, np.nan],
+        'selling_price': [500.0, 100.0, 50.0, 100.0, 600.0, np.nan, 10.0, 999.0],
+        'booking_date': pd.to_datetime(['2023-01-10', '2023-01-01', '2023-01-05', '2023-01-03',
+                                        '2023-01-20', '2023-01-04', None, '2023-01-31']),
+    })
+
+
+def test_rfm_matches_groupby():
+    df = sample_bookings()
+    rfm, _ = segment_customers(df)
+
+    expected = df.groupby('customer_id').agg(frequency=('selling_price', 'size'),
+                                             monetary=('selling_price', 'sum'))
+    expected.index = expected.index.astype('float64')
+    assert rfm.index.tolist() == expected.index.tolist()
+    assert rfm['frequency'].tolist() == expected['frequency'].tolist()
+    assert rfm['monetary'].tolist() == expected['monetary'].tolist()
+
+    # Recency counts back from the latest booking with a customer (2023-01-20)
+    assert rfm['recency'].tolist()[:3] == [16.0, 15.0, 0.0]
+    assert np.isnan(rfm.loc[4, 'recency'])
+
+
+def test_segments_follow_quantile_rule():
+    df = sample_bookings()
+    rfm, summary = segment_customers(df)
+
+    frequency, spend = rfm['frequency'], rfm['monetary']
+    expected = np.where((frequency >= frequency.quantile(0.75)) & (spend >= spend.quantile(0.75)), 'High Value',
+                        np.where((frequency >= frequency.quantile(0.5)) & (spend >= spend.quantile(0.5)),
+                                 'Medium Value', 'Low Value'))
+    assert rfm['segment'].astype(str).tolist() == expected.tolist()
+    assert summary['customers'].sum() == len(rfm)
+    assert summary.loc['Medium Value', 'avg_spent'] == 650.0
+    assert summary.loc['High Value', 'customers'] == 0
@@ -0,0 +1,34 @@
+import pickle
+
+import numpy as np
+
+from booking_sketches import QuantileSketch
+
+
+def test_small_sketch_is_exact():
+    sketch = QuantileSketch().update([5, 1, np.nan, 3, 2, 4])
+
+    assert sketch.count == 5
+    assert sketch.median() == 3
+    assert sketch.quantile(0) == 1 and sketch.quantile(1) == 5
+    assert np.isnan(QuantileSketch().median())
+
+
+def test_merged_sketches_stay_within_rank_error():
+    rng = np.random.default_rng(7)
+    values = rng.lognormal(10, 1, 400_000)
+
+    parts = [QuantileSketch(seed=i) for i in range(4)]
+    for i, chunk in enumerate(np.array_split(values, 40)):
+        parts[i % 4].update(chunk)
+    # Sketches must survive the trip to and from worker processes
+    sketch = pickle.loads(pickle.dumps(parts[0]))
+    for part in parts[1:]:
+        sketch.merge(part)
+
+    assert sketch.count == len(values)
+    assert sketch.size() < 1000
+
+    qs = [0.1, 0.5, 0.9, 0.99]
+    ranks = np.searchsorted(np.sort(values), sketch.quantile(qs)) / len(values)
+    assert np.all(np.abs(ranks - qs) < 0.017)
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+from booking_timeseries import DailySeries, build_time_series
+
+
+def sample_frame():
+    return pd.DataFrame({
+        'booking_date': pd.to_datetime(['2023-01-30', '2023-01-31', '2023-02-01', '2023-02-01',
+                                        '2024-01-15', None]),
+        'check_in_date': pd.to_datetime(['2023-02-05', None, '2023-02-10', '2023-02-11',
+                                         '2024-02-01', '2024-02-02']),
+        'selling_price': [100.0, 200.0, 300.0, np.nan, 500.0, 600.0],
+        'booking_status': pd.Categorical(['Confirmed', 'Cancelled', 'Confirmed', 'Cancelled',
+                                          'Confirmed', 'Confirmed']),
+    })
+
+
+def test_monthly_rollup_keeps_years_apart():
+    monthly = DailySeries.from_frame(sample_frame()).rollup('M')
+
+    assert len(monthly) == 13
+    assert monthly.index[0] == pd.Timestamp('2023-01-01')
+    assert monthly['bookings'].tolist()[:2] == [2, 2]
+    assert monthly.loc['2024-01-01', 'bookings'] == 1
+    assert monthly['revenue'].iloc[1] == 300.0
+    assert monthly['cancellation_rate'].tolist()[:2] == [50.0, 50.0]
+    assert monthly['bookings'].sum() == 5
+
+
+def test_weeks_start_on_monday():
+    weekly = DailySeries.from_frame(sample_frame()).rollup('W')
+
+    # 2023-01-30 is a Monday, so the first week holds every January/February 2023 booking
+    assert weekly.index[0] == pd.Timestamp('2023-01-30')
+    assert weekly['bookings'].iloc[0] == 4
+
+
+def test_rolling_and_year_over_year_match_direct_sums():
+    series = DailySeries.from_frame(sample_frame())
+
+    rolling = series.rolling('bookings', window=3)
+    assert rolling.loc['2023-02-01'] == 4
+    assert rolling.loc['2023-02-03'] == 2
+
+    yoy = series.year_over_year('revenue', freq='M')
+    assert np.isnan(yoy.iloc[0])
+    assert yoy.loc['2024-01-01'] == (500.0 / 300.0 - 1) * 100
+
+
+def test_merged_chunks_equal_the_whole():
+    df = sample_frame()
+    merged = DailySeries.from_frame(df.iloc[3:]).merge(DailySeries.from_frame(df.iloc[:3]))
+    whole = DailySeries.from_frame(df)
+
+    pd.testing.assert_frame_equal(merged.rollup('D'), whole.rollup('D'))
+
+
+def test_build_time_series_indexes_each_date_column():
+    series = build_time_series(sample_frame())
+
+    assert list(series) == ['booking_date', 'check_in_date']
+    assert series['check_in_date'].rollup('Y')['bookings'].tolist() == [3, 2]